@@ -1,8 +1,20 @@
+from typing import Any, Callable, Dict, Optional
 import logging
 from flask import Flask
-from app.models import db, Quiz, QuizQuestion, QuizOption  # noqa: F401
+from sqlalchemy import event
+from app.models import (db, Quiz, QuizQuestion, QuizOption,  # noqa: F401
+                        QuizSnapshot, QuizAttempt, QuizStatistic,
+                        QuizQuestionStatistic, QuizOptionStatistic,
+                        QuizLeaderboard, PlayerLeaderboard)
 import app.setup_test_db as setup_test_db
-import app.sql_functions as sql_functions  # noqa: F401
+import app.migrations as migrations
+import app.metrics as metrics
+import app.sql_functions as sql_functions
+import app.bulk_functions as bulk_functions  # noqa: F401
+import app.leaderboard_functions as leaderboard_functions  # noqa: F401
+import app.attempt_functions as attempt_functions
+import app.write_behind as write_behind
+import app.compaction as compaction  # noqa: F401
 # Import routes to access the Flask application routes
 from app import routes  # noqa: F401
 
@@ -11,30 +23,82 @@ logger = logging.getLogger()
 logger.setLevel(logging.DEBUG)
 
 
-def create_app(database_url: str, toggle_new_database: bool) -> None:
+def create_app(database_url: str, toggle_new_database: bool,
+               engine_options: Optional[Dict[str, Any]] = None,
+               sqlite_pragmas: Optional[Dict[str, Any]] = None,
+               attempt_write_behind: Optional[Dict[str, Any]] = None,
+               soft_delete: bool = False) -> None:
     """Create flask app object.
 
     Args:
         database_url (str): SQL database url to connect.
         toggle_new_database (bool): Will reset database with sample data when
             creating app if True.
+        engine_options (Optional[Dict[str, Any]]): Options passed to the
+            SQLAlchemy engine, such as the connection pool size.
+        sqlite_pragmas (Optional[Dict[str, Any]]): Pragma names and values
+            executed on every new SQLite connection.
+        attempt_write_behind (Optional[Dict[str, Any]]): Settings of the
+            queue writing graded attempts in batches in the background,
+            attempts are written during the request if None.
+        soft_delete (bool): Deleting quizzes only hides them until
+            compaction removes their rows if True.
     """
     # Initiate Flask
     app = Flask(__name__)
     app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options or {}
+    app.config['SOFT_DELETE_QUIZZES'] = soft_delete
     db.init_app(app)
 
     # Setup testing environment for application and database using sqlite
     with app.app_context():
+        metrics.instrument_engine(db.engine)
+
+        # Register before the first connection so every pooled connection
+        # gets the pragmas
+        if sqlite_pragmas and db.engine.dialect.name == 'sqlite':
+            event.listen(db.engine, 'connect',
+                         _get_pragma_listener(sqlite_pragmas))
+
         # Link ORM to database
         app.register_blueprint(routes.app)
 
         if toggle_new_database:
             db.drop_all()
+            migrations.reset_database(db)
             db.create_all()  # Create tables and views
 
             # Insert sample values to the database
             setup_test_db.insert_sample_data(db)
         else:
             db.create_all()
+
+        # Bring tables of an existing database up to the current schema
+        migrations.upgrade_database(db)
+
+    # Answer keys cached for another database are no longer valid
+    sql_functions.clear_answer_key_cache()
+    metrics.clear_metrics()
+
+    if attempt_write_behind:
+        app.extensions[write_behind.ATTEMPT_QUEUE] = \
+            write_behind.WriteBehindQueue(
+                app, write_behind.ATTEMPT_QUEUE,
+                attempt_functions.record_attempts, **attempt_write_behind)
     return app
+
+
+def _get_pragma_listener(sqlite_pragmas: Dict[str, Any]
+                         ) -> Callable[[Any, Any], None]:
+    """Get engine connect listener executing the pragmas on a connection."""
+    def set_sqlite_pragmas(dbapi_connection: Any,
+                           connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            # Pragma values cannot be bound parameters
+            for name, value in sqlite_pragmas.items():
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
+    return set_sqlite_pragmas
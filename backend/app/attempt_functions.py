@@ -0,0 +1,432 @@
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import DateTime, String, bindparam, delete, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app import (db, Quiz, QuizQuestion, QuizOption, QuizAttempt,
+                 QuizStatistic, QuizQuestionStatistic, QuizOptionStatistic,
+                 leaderboard_functions)
+
+# ------------------------------
+# Prebuilt statements
+# ------------------------------
+# Counters are increased with upserts, so recording an attempt costs the
+# same no matter how many attempts were recorded before. Question and option
+# counters are keyed by question number, so they stay with their question
+# when other questions are added, removed or reordered.
+
+
+def _get_upsert_statement(table: Any, key_list: Sequence[str],
+                          counter_list: Sequence[str]) -> Any:
+    """Get statement inserting counters or adding them to the saved ones."""
+    statement = sqlite_insert(table.__table__)
+    return statement.on_conflict_do_update(
+        index_elements=list(key_list),
+        set_={
+            counter: table.__table__.c[counter] + statement.excluded[counter]
+            for counter in counter_list
+        }
+    )
+
+
+_UPSERT_QUIZ_STATISTIC = _get_upsert_statement(
+    QuizStatistic, ['quiz_id'],
+    ['attempt_count', 'correct_count', 'answered_count'])
+_UPSERT_QUESTION_STATISTIC = _get_upsert_statement(
+    QuizQuestionStatistic, ['quiz_id', 'question_number'],
+    ['answered_count', 'correct_count'])
+_UPSERT_OPTION_STATISTIC = _get_upsert_statement(
+    QuizOptionStatistic, ['quiz_id', 'question_number', 'option_number'],
+    ['pick_count'])
+
+# Attempt of a quiz that is not deleted, executed with one set of attempt
+# values per attempt. Checking the quiz in the insert, which takes the write
+# lock, means no delete can commit between the check and the write.
+_INSERT_LIVE_ATTEMPT = insert(QuizAttempt.__table__).from_select(
+    ['quiz_id', 'correct_count', 'answered_count', 'result', 'selections',
+     'player', 'created_at'],
+    select(Quiz.quiz_id, bindparam('correct_count'),
+           bindparam('answered_count'), bindparam('result'),
+           bindparam('selections'), bindparam('player', type_=String),
+           bindparam('created_at', type_=DateTime))
+    .where(Quiz.quiz_id == bindparam('quiz_id'), Quiz.deleted_at.is_(None))
+)
+
+# Statistics of soft deleted quizzes are hidden until compaction removes them
+_LIVE_QUIZ = Quiz.deleted_at.is_(None)
+
+# IDs of quizzes that are not deleted, executed with the list 'quiz_id_list'
+_SELECT_LIVE_QUIZ_IDS = select(Quiz.quiz_id).where(
+    Quiz.quiz_id.in_(bindparam('quiz_id_list', expanding=True)), _LIVE_QUIZ)
+
+# Question number of every selection position of the quizzes, which has one
+# position per correct option in the order of the answer keys, executed with
+# the list 'quiz_id_list'
+_SELECT_POSITION_QUESTIONS = (
+    select(QuizQuestion.quiz_id, QuizQuestion.question_number)
+    .join(QuizOption, QuizOption.question_id == QuizQuestion.question_id)
+    .where(
+        QuizQuestion.quiz_id.in_(bindparam('quiz_id_list', expanding=True)),
+        QuizOption.correct_answer == True  # noqa: E712
+    )
+    .order_by(QuizQuestion.quiz_id, QuizQuestion.question_number,
+              QuizOption.option_number)
+)
+
+# Counters of removed questions, executed with 'quiz_id' and the list
+# 'question_number_list'
+_DELETE_QUESTION_ROWS = [
+    delete(table).where(
+        table.quiz_id == bindparam('quiz_id'),
+        table.question_number.in_(
+            bindparam('question_number_list', expanding=True)))
+    for table in (QuizQuestionStatistic, QuizOptionStatistic)
+]
+
+# Attempts and counters of deleted quizzes, executed with the list
+# 'quiz_id_list'
+_DELETE_QUIZ_ROWS = [
+    delete(table).where(
+        table.quiz_id.in_(bindparam('quiz_id_list', expanding=True)))
+    for table in (QuizAttempt, QuizStatistic, QuizQuestionStatistic,
+                  QuizOptionStatistic)
+]
+
+
+# ------------------------------
+# Record methods
+# ------------------------------
+
+def record_attempt(quiz_id: int, selection_list: List[Any],
+                   result_list: List[bool], player: Optional[str] = None
+                   ) -> int:
+    """Save a graded attempt and add it to the quiz statistics.
+
+    Parameters:
+        - quiz_id (int): Quiz ID of the attempt.
+        - selection_list (List[Any]): Selected option numbers of the attempt.
+        - result_list (List[bool]): Evaluation of the attempt.
+        - player (Optional[str]): Name of the player to rank the attempt for
+            or None to not rank it.
+
+    Returns:
+        int: Number of attempts saved, attempts without answered questions
+            are not saved.
+    """
+    return record_attempts([{
+        'quiz_id': quiz_id,
+        'selections': selection_list,
+        'result': result_list,
+        'player': player
+    }])
+
+
+def record_attempts(attempt_list: List[Dict[str, Any]]) -> int:
+    """Save graded attempts and add them to the quiz statistics and the
+    leaderboards in one transaction.
+
+    Counters of the same quiz, question or option are added up before
+    writing, so every table is written with one statement. Attempts of
+    quizzes that are deleted by the time they are written, such as queued
+    attempts or attempts graded with a cached answer key, are dropped.
+
+    Parameters:
+        - attempt_list (List[Dict[str, Any]]): Attempts in the format
+            {'quiz_id': int, 'selections': List[int], 'result': List[bool],
+            'player': Optional[str]}, the player is optional.
+
+    Returns:
+        int: Number of attempts saved, attempts without answered questions
+            and attempts of deleted quizzes are not saved.
+    """
+    attempt_value_list = []
+    # Evaluated selections and results of every attempt value
+    evaluation_list = []
+    created_at = datetime.utcnow()
+
+    for attempt in attempt_list:
+        result_list = attempt['result']
+        if not result_list:
+            continue
+        # Only selections compared with an answer are evaluated
+        selection_list = attempt['selections'][:len(result_list)]
+
+        attempt_value_list.append({
+            'quiz_id': int(attempt['quiz_id']),
+            'correct_count': result_list.count(True),
+            'answered_count': len(result_list),
+            'result': ''.join('1' if correct else '0'
+                              for correct in result_list),
+            'selections': ','.join(
+                str(selection) if _is_option_number(selection) else ''
+                for selection in selection_list),
+            'player': attempt.get('player'),
+            'created_at': created_at
+        })
+        evaluation_list.append((selection_list, result_list))
+
+    if not attempt_value_list:
+        return 0
+
+    session = db.session
+    try:
+        session.execute(_INSERT_LIVE_ATTEMPT, attempt_value_list)
+        # The insert holds the write lock, so these are the quizzes whose
+        # attempts were inserted
+        live_quiz_id_set = set(session.scalars(_SELECT_LIVE_QUIZ_IDS, {
+            'quiz_id_list': list({
+                value['quiz_id'] for value in attempt_value_list})
+        }))
+        live_index_list = [
+            index for index, value in enumerate(attempt_value_list)
+            if value['quiz_id'] in live_quiz_id_set
+        ]
+        if not live_index_list:
+            session.commit()
+            return 0
+        attempt_value_list = [attempt_value_list[index]
+                              for index in live_index_list]
+        evaluation_list = [evaluation_list[index]
+                           for index in live_index_list]
+
+        # Positions are mapped to the questions saved when the attempts are
+        # written
+        position_dict = _get_position_questions(
+            session, list(live_quiz_id_set))
+        _update_statistics(session, attempt_value_list, evaluation_list,
+                           position_dict)
+        leaderboard_functions.update_leaderboards(session, attempt_value_list)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    return len(attempt_value_list)
+
+
+def remove_quizzes(session: Session, quiz_id_list: List[int]) -> None:
+    """Remove the attempts and counters of deleted quizzes with one
+    statement per table.
+    """
+    if not quiz_id_list:
+        return
+    parameters = {'quiz_id_list': list(quiz_id_list)}
+    for statement in _DELETE_QUIZ_ROWS:
+        session.execute(statement, parameters)
+    leaderboard_functions.remove_quizzes(session, quiz_id_list)
+
+
+def remove_questions(session: Session, quiz_id: int,
+                     question_number_list: List[int]) -> None:
+    """Remove the counters of questions removed from a quiz, so a question
+    added later with the same number starts from zero.
+    """
+    if not question_number_list:
+        return
+    parameters = {'quiz_id': quiz_id,
+                  'question_number_list': list(question_number_list)}
+    for statement in _DELETE_QUESTION_ROWS:
+        session.execute(statement, parameters)
+
+
+# ------------------------------
+# Statistic methods
+# ------------------------------
+
+def get_quiz_statistics(quiz_id: int) -> Dict[str, Any]:
+    """Get attempt counters of a quiz and each of its questions.
+
+    Parameters:
+        - quiz_id (int): Quiz ID.
+
+    Returns:
+        Dict[str, Any]: Number of attempts, correct and answered questions
+            of the quiz and the statistics of every answered question in quiz
+            order.
+    """
+    quiz_id = int(quiz_id)
+    session = db.session
+    quiz_statistic = session.scalar(
+        select(QuizStatistic)
+        .join(Quiz, Quiz.quiz_id == QuizStatistic.quiz_id)
+        .where(QuizStatistic.quiz_id == quiz_id, _LIVE_QUIZ)
+    )
+    question_list = session.scalars(
+        select(QuizQuestionStatistic)
+        .join(Quiz, Quiz.quiz_id == QuizQuestionStatistic.quiz_id)
+        .where(QuizQuestionStatistic.quiz_id == quiz_id, _LIVE_QUIZ)
+        .order_by(QuizQuestionStatistic.question_number)
+    ).all()
+    pick_dict = _get_option_picks(quiz_id)
+
+    return {
+        'quiz_id': quiz_id,
+        'attempt_count':
+            quiz_statistic.attempt_count if quiz_statistic else 0,
+        'correct_count':
+            quiz_statistic.correct_count if quiz_statistic else 0,
+        'answered_count':
+            quiz_statistic.answered_count if quiz_statistic else 0,
+        'questions': [
+            _question_statistic_to_dict(
+                question, pick_dict.get(question.question_number, {}))
+            for question in question_list
+        ]
+    }
+
+
+def get_question_statistics(quiz_id: int, question_number: int
+                            ) -> Optional[Dict[str, Any]]:
+    """Get attempt counters of one question by primary key lookups.
+
+    Parameters:
+        - quiz_id (int): Quiz ID.
+        - question_number (int): Number of the question.
+
+    Returns:
+        Optional[Dict[str, Any]]: Statistics of the question or None if the
+            question was never answered.
+    """
+    quiz_id = int(quiz_id)
+    question_number = int(question_number)
+    question = db.session.scalar(
+        select(QuizQuestionStatistic)
+        .join(Quiz, Quiz.quiz_id == QuizQuestionStatistic.quiz_id)
+        .where(QuizQuestionStatistic.quiz_id == quiz_id,
+               QuizQuestionStatistic.question_number == question_number,
+               _LIVE_QUIZ)
+    )
+    if question is None:
+        return None
+    pick_dict = _get_option_picks(quiz_id, question_number)
+    return _question_statistic_to_dict(
+        question, pick_dict.get(question_number, {}))
+
+
+# ------------------------------
+# Helper methods
+# ------------------------------
+
+def _is_option_number(selection: Any) -> bool:
+    """Check if a selection is an option number that can be counted."""
+    # Booleans are integers in Python but not option numbers
+    return isinstance(selection, int) and not isinstance(selection, bool)
+
+
+def _get_position_questions(session: Session, quiz_id_list: List[int]
+                            ) -> Dict[int, List[int]]:
+    """Get the question number of every selection position by quiz ID."""
+    position_dict = defaultdict(list)
+    for quiz_id, question_number in session.execute(
+            _SELECT_POSITION_QUESTIONS, {'quiz_id_list': quiz_id_list}):
+        position_dict[quiz_id].append(question_number)
+    return position_dict
+
+
+def _update_statistics(session: Session,
+                       attempt_value_list: List[Dict[str, Any]],
+                       evaluation_list: List[Any],
+                       position_dict: Dict[int, List[int]]) -> None:
+    """Add saved attempts to the quiz, question and option counters.
+
+    Selections are grouped by the question of their position, a question
+    with several correct options counts as answered once and as correct only
+    if every one of its options was selected. Positions past the current
+    questions of the quiz, left by attempts graded before a save, only count
+    towards the quiz counters.
+    """
+    # Number of correct options of every question by quiz ID
+    answer_count_dict = {
+        quiz_id: Counter(question_number_list)
+        for quiz_id, question_number_list in position_dict.items()
+    }
+    # Counters by key, added up over all attempts
+    quiz_counter_dict = defaultdict(lambda: [0, 0, 0])
+    question_counter_dict = defaultdict(lambda: [0, 0])
+    option_counter_dict = defaultdict(int)
+    for attempt_value, (selection_list, result_list) in zip(
+            attempt_value_list, evaluation_list):
+        quiz_id = attempt_value['quiz_id']
+        quiz_counter = quiz_counter_dict[quiz_id]
+        quiz_counter[0] += 1
+        quiz_counter[1] += attempt_value['correct_count']
+        quiz_counter[2] += attempt_value['answered_count']
+
+        question_number_list = position_dict.get(quiz_id, [])
+        # Correct selections and selected options by question number
+        correct_dict = defaultdict(int)
+        pick_dict = defaultdict(set)
+        for question_number, selection, correct in zip(
+                question_number_list, selection_list, result_list):
+            correct_dict[question_number] += correct
+            if _is_option_number(selection):
+                pick_dict[question_number].add(selection)
+        for question_number, correct_count in correct_dict.items():
+            question_counter = question_counter_dict[
+                (quiz_id, question_number)]
+            question_counter[0] += 1
+            question_counter[1] += (
+                correct_count == answer_count_dict[quiz_id][question_number])
+            for option_number in pick_dict[question_number]:
+                option_counter_dict[
+                    (quiz_id, question_number, option_number)] += 1
+
+    session.execute(_UPSERT_QUIZ_STATISTIC, [
+        {'quiz_id': quiz_id, 'attempt_count': counter[0],
+         'correct_count': counter[1], 'answered_count': counter[2]}
+        for quiz_id, counter in quiz_counter_dict.items()
+    ])
+    if question_counter_dict:
+        session.execute(_UPSERT_QUESTION_STATISTIC, [
+            {'quiz_id': quiz_id, 'question_number': question_number,
+             'answered_count': counter[0], 'correct_count': counter[1]}
+            for (quiz_id, question_number), counter
+            in question_counter_dict.items()
+        ])
+    if option_counter_dict:
+        session.execute(_UPSERT_OPTION_STATISTIC, [
+            {'quiz_id': quiz_id, 'question_number': question_number,
+             'option_number': option_number, 'pick_count': pick_count}
+            for (quiz_id, question_number, option_number), pick_count
+            in option_counter_dict.items()
+        ])
+
+
+def _get_option_picks(quiz_id: int, question_number: Optional[int] = None
+                      ) -> Dict[int, Dict[int, int]]:
+    """Get pick counts by question number and option number."""
+    statement = (
+        select(QuizOptionStatistic.question_number,
+               QuizOptionStatistic.option_number,
+               QuizOptionStatistic.pick_count)
+        .join(Quiz, Quiz.quiz_id == QuizOptionStatistic.quiz_id)
+        .where(QuizOptionStatistic.quiz_id == quiz_id, _LIVE_QUIZ)
+        .order_by(QuizOptionStatistic.question_number,
+                  QuizOptionStatistic.option_number)
+    )
+    if question_number is not None:
+        statement = statement.where(
+            QuizOptionStatistic.question_number == question_number)
+
+    pick_dict = defaultdict(dict)
+    for number, option_number, pick_count in db.session.execute(statement):
+        pick_dict[number][option_number] = pick_count
+    return pick_dict
+
+
+def _question_statistic_to_dict(question: QuizQuestionStatistic,
+                                pick_dict: Dict[int, int]) -> Dict[str, Any]:
+    """Convert question counters to a dictionary with the correct rate."""
+    return {
+        'question_number': question.question_number,
+        'answered_count': question.answered_count,
+        'correct_count': question.correct_count,
+        'correct_rate': round(
+            question.correct_count / question.answered_count, 4)
+        if question.answered_count else None,
+        # JSON object keys are strings
+        'option_picks': {
+            str(option_number): pick_count
+            for option_number, pick_count in pick_dict.items()
+        }
+    }
@@ -0,0 +1,292 @@
+from datetime import datetime
+from typing import Any, Dict, Generator, Iterable, List, Optional, Union
+import json
+import logging
+import time
+import zlib
+from sqlalchemy import func, insert, select
+from app import db, Quiz, QuizQuestion, QuizOption, sql_functions
+import app.quiz_snapshot as quiz_snapshot
+import app.search_index as search_index
+
+# Number of quizzes inserted and committed per transaction when importing
+IMPORT_BATCH_SIZE = 500
+
+# Number of joined rows held in memory at a time when exporting
+EXPORT_BATCH_SIZE = 1000
+
+
+# ------------------------------
+# Import methods
+# ------------------------------
+
+def import_quizzes(line_iterable: Iterable[Union[str, bytes]],
+                   start_line: int = 0,
+                   batch_size: int = IMPORT_BATCH_SIZE) -> Dict[str, Any]:
+    """Import new quizzes from JSON lines in batched transactions.
+
+    Every line holds one quiz in the format accepted by 'save_quiz'. Quiz IDs
+    in the lines are ignored and every quiz is added as a new quiz. Import
+    stops at the first invalid line or failed batch, and everything before
+    'next_line' of the report is committed, so an import is resumed by
+    passing 'next_line' as the start line.
+
+    Parameters:
+        - line_iterable (Iterable[Union[str, bytes]]): JSON lines to import.
+        - start_line (int): Number of lines to skip from the start.
+        - batch_size (int): Number of quizzes inserted per transaction.
+
+    Returns:
+        Dict[str, Any]: Import report with the number of imported quizzes,
+            the line to resume from, the error if the import stopped early
+            and the import throughput.
+    """
+    start_time = time.perf_counter()
+    imported = 0
+    next_line = start_line  # First line that is not committed
+    end_line = start_line  # First line that is not read into the batch
+    error = None
+    quiz_data_batch = []
+
+    for line_number, line in enumerate(line_iterable):
+        if line_number < start_line:
+            continue
+
+        # Parse and validate line before adding it to the batch
+        if line.strip():
+            try:
+                quiz_data_batch.append(_parse_import_line(line))
+            except ValueError as e:
+                error = f'Line {line_number + 1}: {str(e)}'
+                break
+        end_line = line_number + 1
+
+        if len(quiz_data_batch) >= batch_size:
+            try:
+                _insert_quiz_batch(quiz_data_batch)
+            except Exception as e:
+                error = f'Batch starting at line {next_line + 1}: {str(e)}'
+                # Lines of the failed batch need to be imported again
+                end_line = next_line
+                quiz_data_batch = []
+                break
+            imported += len(quiz_data_batch)
+            quiz_data_batch = []
+            next_line = end_line
+
+    # Insert the remaining valid lines read before the end of the input or
+    # before an invalid line
+    if quiz_data_batch:
+        try:
+            _insert_quiz_batch(quiz_data_batch)
+            imported += len(quiz_data_batch)
+            next_line = end_line
+        except Exception as e:
+            error = f'Batch starting at line {next_line + 1}: {str(e)}'
+    else:
+        next_line = end_line
+
+    if error is not None:
+        logging.critical(f'Error: {error}')
+
+    elapsed_seconds = time.perf_counter() - start_time
+    return {
+        'imported': imported,
+        'next_line': next_line,
+        'completed': error is None,
+        'error': error,
+        'elapsed_seconds': round(elapsed_seconds, 3),
+        'quizzes_per_second':
+            round(imported / elapsed_seconds, 1) if elapsed_seconds else 0.0
+    }
+
+
+# ------------------------------
+# Export methods
+# ------------------------------
+
+def export_quizzes(quiz_id_list: Optional[List[int]] = None,
+                   updated_since: Optional[datetime] = None,
+                   batch_size: int = EXPORT_BATCH_SIZE
+                   ) -> Generator[str, None, None]:
+    """Export quizzes as JSON lines in the format accepted by 'save_quiz'.
+
+    All quizzes are read with one joined query ordered by quiz, question and
+    option number through a server side cursor, so only one batch of rows
+    and one quiz are held in memory at a time.
+
+    Parameters:
+        - quiz_id_list (Optional[List[int]]): Only export these quizzes.
+        - updated_since (Optional[datetime]): Only export quizzes updated at
+            or after this time.
+        - batch_size (int): Number of joined rows fetched at a time.
+
+    Yields:
+        str: JSON line of the next quiz ending with a new line.
+    """
+    statement = (
+        select(
+            Quiz.quiz_id,
+            Quiz.name,
+            QuizQuestion.question_number,
+            QuizQuestion.text.label('question_text'),
+            QuizOption.option_number,
+            QuizOption.text.label('option_text'),
+            QuizOption.correct_answer
+        )
+        .outerjoin(QuizQuestion, QuizQuestion.quiz_id == Quiz.quiz_id)
+        .outerjoin(QuizOption,
+                   QuizOption.question_id == QuizQuestion.question_id)
+        # Soft deleted quizzes are not exported
+        .where(Quiz.deleted_at.is_(None))
+        .order_by(Quiz.quiz_id, QuizQuestion.question_number,
+                  QuizOption.option_number)
+        .execution_options(yield_per=batch_size)
+    )
+    if quiz_id_list is not None:
+        statement = statement.where(Quiz.quiz_id.in_(quiz_id_list))
+    if updated_since is not None:
+        statement = statement.where(Quiz.updated_at >= updated_since)
+
+    quiz_data = None
+    question_data = None
+    for row in db.session.execute(statement):
+        if quiz_data is None or row.quiz_id != quiz_data['quiz_id']:
+            # Rows of the previous quiz are complete
+            if quiz_data is not None:
+                yield _to_json_line(quiz_data)
+            quiz_data = {
+                'quiz_id': row.quiz_id,
+                'name': row.name,
+                'quiz_question_data': []
+            }
+            question_data = None
+
+        # Quizzes without questions have a row with empty question columns
+        if row.question_number is None:
+            continue
+        if (question_data is None
+                or row.question_number != question_data['question_number']):
+            question_data = {
+                'question_number': row.question_number,
+                'text': row.question_text,
+                'quiz_option_data': []
+            }
+            quiz_data['quiz_question_data'].append(question_data)
+
+        # Questions without options have a row with empty option columns
+        if row.option_number is not None:
+            question_data['quiz_option_data'].append({
+                'option_number': row.option_number,
+                'text': row.option_text,
+                'correct_answer': row.correct_answer
+            })
+
+    if quiz_data is not None:
+        yield _to_json_line(quiz_data)
+
+
+def gzip_compress_stream(text_iterable: Iterable[str]
+                         ) -> Generator[bytes, None, None]:
+    """Gzip compress text incrementally, yielding compressed chunks as soon
+    as the compressor produces them.
+    """
+    # Window bits above 16 write a gzip header and trailer
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for text in text_iterable:
+        chunk = compressor.compress(text.encode())
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+
+
+# ------------------------------
+# Helper methods
+# ------------------------------
+
+
+def _parse_import_line(line: Union[str, bytes]) -> Dict[str, Any]:
+    """Parse JSON line and return validated quiz data."""
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f'Invalid JSON ({str(e)})') from e
+    if not isinstance(data, dict) or not isinstance(data.get('quiz_data'),
+                                                    dict):
+        raise ValueError('Line requires key "quiz_data"')
+
+    quiz_data = data['quiz_data']
+    sql_functions.validate_quiz_data(quiz_data)
+    return quiz_data
+
+
+def _to_json_line(quiz_data: Dict[str, Any]) -> str:
+    """Convert quiz data to an import line in the 'save_quiz' format."""
+    return f'{json.dumps({"quiz_data": quiz_data})}\n'
+
+
+def _insert_quiz_batch(quiz_data_list: List[Dict[str, Any]]) -> None:
+    """Insert new quizzes with their questions and options in one
+    transaction using one bulk insert per table.
+    """
+    session = db.session
+    try:
+        # Insert quizzes in one statement, RETURNING would run once per row
+        session.execute(
+            insert(Quiz.__table__),
+            [{'name': quiz_data['name']} for quiz_data in quiz_data_list])
+
+        # Inserting the quizzes holds the database write lock until commit.
+        # New rows get the ID after the highest ID, so the new quizzes have
+        # the highest IDs in data order and question IDs following the
+        # highest saved question ID are free.
+        last_quiz_id, last_question_id = session.execute(select(
+            select(func.max(Quiz.quiz_id)).scalar_subquery(),
+            select(func.coalesce(func.max(QuizQuestion.question_id), 0))
+            .scalar_subquery()
+        )).one()
+        first_quiz_id = last_quiz_id - len(quiz_data_list) + 1
+        quiz_id_list = list(range(first_quiz_id, last_quiz_id + 1))
+        next_question_id = last_question_id + 1
+
+        # Plain column name keys as reading model attributes in a loop over
+        # every row is slow
+        question_value_list = []
+        option_value_list = []
+        for quiz_id, quiz_data in zip(quiz_id_list, quiz_data_list):
+            for question_data in quiz_data['quiz_question_data']:
+                question_id = next_question_id
+                next_question_id += 1
+                question_value_list.append({
+                    'question_id': question_id,
+                    'quiz_id': quiz_id,
+                    'question_number': question_data['question_number'],
+                    'text': question_data['text']
+                })
+                option_value_list.extend(
+                    {
+                        'question_id': question_id,
+                        'option_number': option_data['option_number'],
+                        'text': option_data['text'],
+                        'correct_answer': option_data['correct_answer']
+                    }
+                    for option_data in question_data['quiz_option_data']
+                )
+
+        # Insert questions and options with their assigned IDs through the
+        # tables directly, skipping the ORM bulk insert bookkeeping per row
+        if question_value_list:
+            session.execute(insert(QuizQuestion.__table__),
+                            question_value_list)
+        if option_value_list:
+            session.execute(insert(QuizOption.__table__), option_value_list)
+        search_index.index_new_quizzes(session, first_quiz_id, last_quiz_id)
+        quiz_snapshot.refresh_snapshots(session, quiz_id_list)
+
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    # New quiz IDs may have been cached as quizzes without answers
+    sql_functions.invalidate_answer_keys(quiz_id_list)
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional
+import time
+
+
+class LRUCache:
+    """Thread safe least recently used cache with hit and miss counters.
+
+    Every invalidation moves the cache to a new generation. Values read from
+    the database before an invalidation are not stored afterwards so a slow
+    reader cannot put back a value that a writer has just invalidated.
+
+    Invalidations only reach the cache of the current process, so processes
+    sharing a database bound how long a value stays cached with a time to
+    live.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None) -> None:
+        """Create an empty cache.
+
+        Parameters:
+            - maxsize (int): Maximum number of entries before the least
+                recently used entry is evicted.
+            - ttl (Optional[float]): Seconds a value stays cached or None to
+                keep values until they are evicted or invalidated.
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def generation(self) -> int:
+        """Current generation to pass to 'set' after reading a value."""
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get cached value and mark it as recently used or None if missing.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return None
+            value, expires_at = self._entries[key]
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: int) -> None:
+        """Store value unless the cache was invalidated since 'generation'."""
+        with self._lock:
+            if generation != self._generation or self._maxsize <= 0:
+                return
+            expires_at = None
+            if self._ttl is not None:
+                expires_at = time.monotonic() + self._ttl
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            # Evict least recently used entries above the size limit
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove cached value of the key."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all cached values and reset the counters."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and counters."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self._maxsize,
+                'ttl': self._ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions
+            }
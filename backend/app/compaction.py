@@ -0,0 +1,176 @@
+from datetime import datetime, timedelta
+from threading import Event, Thread
+from typing import Any, Dict, Optional, Tuple
+import logging
+import time
+from flask import Flask
+from sqlalchemy import bindparam, select
+from sqlalchemy.engine import Connection
+from app import db, Quiz, sql_functions
+
+# Number of soft deleted quizzes removed per transaction
+COMPACTION_BATCH_SIZE = 100
+
+# Seconds a quiz stays soft deleted before compaction removes it
+COMPACTION_MIN_AGE = 60.0
+
+# Seconds between compactions run in the background
+COMPACTION_INTERVAL = 3600.0
+
+# Names of the 'PRAGMA auto_vacuum' values
+AUTO_VACUUM_MODES = ('none', 'full', 'incremental')
+
+# Oldest soft deleted quizzes first through the partial deleted date index,
+# executed with 'deleted_before' and 'limit'
+_SELECT_TOMBSTONED_QUIZZES = (
+    select(Quiz.quiz_id)
+    .where(Quiz.deleted_at.is_not(None),
+           Quiz.deleted_at <= bindparam('deleted_before'))
+    .order_by(Quiz.deleted_at)
+    .limit(bindparam('limit'))
+)
+
+
+# ------------------------------
+# Compaction methods
+# ------------------------------
+
+def compact_database(batch_size: int = COMPACTION_BATCH_SIZE,
+                     min_age: float = COMPACTION_MIN_AGE,
+                     max_batches: Optional[int] = None,
+                     vacuum: bool = False) -> Dict[str, Any]:
+    """Remove the rows of soft deleted quizzes and return the freed space of
+    the database file to the file system.
+
+    Quizzes are purged in batches of one transaction each, so writers only
+    wait for one batch at a time. Afterwards the free pages are released with
+    'PRAGMA incremental_vacuum', which only shrinks files created with
+    'auto_vacuum' set to incremental, and the query planner statistics are
+    refreshed with 'ANALYZE' and 'PRAGMA optimize'.
+
+    Parameters:
+        - batch_size (int): Number of quizzes purged per transaction.
+        - min_age (float): Seconds a quiz has to be soft deleted for before
+            it is purged.
+        - max_batches (Optional[int]): Maximum number of batches purged or
+            None to purge every soft deleted quiz old enough.
+        - vacuum (bool): Rebuild the whole file with 'VACUUM' instead, which
+            also applies a changed 'auto_vacuum' mode to an existing file but
+            blocks every writer until it ends.
+
+    Returns:
+        Dict[str, Any]: Compaction report with the number of purged quizzes,
+            whether every quiz old enough was purged, the file size before
+            and after in pages, the reclaimed pages and bytes and the free
+            pages left in the file.
+    """
+    start_time = time.perf_counter()
+    with db.engine.connect() as connection:
+        page_count_before, page_size, _ = _get_page_stats(connection)
+
+    deleted_before = datetime.utcnow() - timedelta(seconds=min_age)
+    purged = 0
+    batches = 0
+    completed = False
+    while max_batches is None or batches < max_batches:
+        quiz_id_list = list(db.session.scalars(_SELECT_TOMBSTONED_QUIZZES, {
+            'deleted_before': deleted_before,
+            'limit': batch_size
+        }))
+        db.session.commit()
+        if quiz_id_list:
+            purged += sql_functions.purge_quizzes(quiz_id_list)
+            batches += 1
+        if len(quiz_id_list) < batch_size:
+            completed = True
+            break
+
+    with db.engine.connect() as connection:
+        # The sqlite3 module steps a pragma once per execute, which frees a
+        # single page, while a script runs every statement to completion
+        script = 'VACUUM;' if vacuum else 'PRAGMA incremental_vacuum;'
+        connection.connection.dbapi_connection.executescript(
+            f'{script} ANALYZE; PRAGMA optimize; '
+            'PRAGMA wal_checkpoint(TRUNCATE);')
+        page_count_after, page_size, freelist_count = \
+            _get_page_stats(connection)
+        auto_vacuum = connection.exec_driver_sql(
+            'PRAGMA auto_vacuum').scalar()
+
+    pages_reclaimed = max(page_count_before - page_count_after, 0)
+    report = {
+        'purged': purged,
+        'batches': batches,
+        'completed': completed,
+        'auto_vacuum': AUTO_VACUUM_MODES[auto_vacuum],
+        'pages_before': page_count_before,
+        'pages_after': page_count_after,
+        'pages_reclaimed': pages_reclaimed,
+        'bytes_reclaimed': pages_reclaimed * page_size,
+        'free_pages': freelist_count,
+        'elapsed_seconds': round(time.perf_counter() - start_time, 3)
+    }
+    logging.info(f'Compacted database: {report}')
+    return report
+
+
+def run_periodically(app: Flask, interval: float, stop_event: Event,
+                     batch_size: int = COMPACTION_BATCH_SIZE,
+                     min_age: float = COMPACTION_MIN_AGE) -> None:
+    """Compact the database every 'interval' seconds until the stop event
+    is set.
+
+    A failed compaction is logged and the next one still runs on schedule,
+    purging what the failed one left behind.
+
+    Parameters:
+        - app (Flask): Flask app whose database is compacted.
+        - interval (float): Seconds between compactions.
+        - stop_event (Event): Event ending the loop once set.
+        - batch_size (int): Number of quizzes purged per transaction.
+        - min_age (float): Seconds a quiz has to be soft deleted for before
+            it is purged.
+    """
+    while not stop_event.wait(interval):
+        try:
+            with app.app_context():
+                compact_database(batch_size, min_age)
+        except Exception as e:
+            logging.critical(f'Error: {str(e)}')
+
+
+def start_background_compaction(app: Flask,
+                                interval: float = COMPACTION_INTERVAL,
+                                batch_size: int = COMPACTION_BATCH_SIZE,
+                                min_age: float = COMPACTION_MIN_AGE
+                                ) -> Event:
+    """Start a daemon thread compacting the database every 'interval'
+    seconds.
+
+    Only one process per database should run it, such as the gunicorn
+    master process, since compactions of several processes only wait for
+    each other.
+
+    Returns:
+        Event: Event stopping the thread once set.
+    """
+    stop_event = Event()
+    Thread(target=run_periodically,
+           args=(app, interval, stop_event, batch_size, min_age),
+           name='compaction', daemon=True).start()
+    return stop_event
+
+
+# ------------------------------
+# Helper methods
+# ------------------------------
+
+def _get_page_stats(connection: Connection) -> Tuple[int, int, int]:
+    """Get the page count, page size and free page count of the database
+    file.
+    """
+    page_count, page_size, freelist_count = [
+        connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+        for name in ('page_count', 'page_size', 'freelist_count')
+    ]
+    return page_count, page_size, freelist_count
@@ -0,0 +1,289 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import json
+from sqlalchemy import and_, bindparam, delete, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app import db, QuizLeaderboard, PlayerLeaderboard
+
+# Maximum length of a player name
+PLAYER_MAX_LENGTH = 50
+
+# ------------------------------
+# Prebuilt statements
+# ------------------------------
+# Every player keeps one entry per quiz with their best attempt and one global
+# entry with the sum of their best attempts. Both tables are indexed in rank
+# order, so they are the sorted leaderboards and are updated as attempts are
+# recorded instead of sorting attempts on every read.
+
+_SELECT_QUIZ_ENTRIES = (
+    select(QuizLeaderboard.quiz_id, QuizLeaderboard.player,
+           QuizLeaderboard.correct_count)
+    .where(QuizLeaderboard.quiz_id.in_(bindparam('quiz_id_list',
+                                                 expanding=True)))
+    .where(QuizLeaderboard.player.in_(bindparam('player_list',
+                                                expanding=True)))
+)
+
+_insert_quiz_entry = sqlite_insert(QuizLeaderboard.__table__)
+_UPSERT_QUIZ_ENTRY = _insert_quiz_entry.on_conflict_do_update(
+    index_elements=['quiz_id', 'player'],
+    set_={
+        'correct_count': _insert_quiz_entry.excluded.correct_count,
+        'answered_count': _insert_quiz_entry.excluded.answered_count,
+        'achieved_at': _insert_quiz_entry.excluded.achieved_at,
+    },
+    # Only better attempts replace the saved entry
+    where=(_insert_quiz_entry.excluded.correct_count
+           > QuizLeaderboard.__table__.c.correct_count)
+)
+
+_insert_player_entry = sqlite_insert(PlayerLeaderboard.__table__)
+_UPSERT_PLAYER_ENTRY = _insert_player_entry.on_conflict_do_update(
+    index_elements=['player'],
+    set_={
+        'total_correct_count':
+            PlayerLeaderboard.__table__.c.total_correct_count
+            + _insert_player_entry.excluded.total_correct_count,
+        'quiz_count': PlayerLeaderboard.__table__.c.quiz_count
+        + _insert_player_entry.excluded.quiz_count,
+        'achieved_at': _insert_player_entry.excluded.achieved_at,
+    }
+)
+
+# Entries of deleted quizzes, executed with the list 'quiz_id_list'
+_deleted_entries = QuizLeaderboard.quiz_id.in_(
+    bindparam('quiz_id_list', expanding=True))
+
+# Subtract the entries of deleted quizzes from the totals of their players
+_SUBTRACT_DELETED_ENTRIES = (
+    update(PlayerLeaderboard)
+    .where(PlayerLeaderboard.player.in_(
+        select(QuizLeaderboard.player).where(_deleted_entries)))
+    .values(
+        total_correct_count=PlayerLeaderboard.total_correct_count - (
+            select(func.sum(QuizLeaderboard.correct_count))
+            .where(QuizLeaderboard.player == PlayerLeaderboard.player,
+                   _deleted_entries)
+            .scalar_subquery()),
+        quiz_count=PlayerLeaderboard.quiz_count - (
+            select(func.count())
+            .where(QuizLeaderboard.player == PlayerLeaderboard.player,
+                   _deleted_entries)
+            .scalar_subquery())
+    )
+)
+
+# Remove players left without ranked quizzes
+_DELETE_EMPTY_PLAYERS = delete(PlayerLeaderboard).where(
+    PlayerLeaderboard.player.in_(
+        select(QuizLeaderboard.player).where(_deleted_entries)),
+    PlayerLeaderboard.quiz_count <= 0)
+
+_DELETE_DELETED_ENTRIES = delete(QuizLeaderboard).where(_deleted_entries)
+
+
+# ------------------------------
+# Update methods
+# ------------------------------
+
+def update_leaderboards(session: Session,
+                        attempt_value_list: List[Dict[str, Any]]) -> None:
+    """Rank the best new attempt of every player in the quiz and global
+    leaderboards.
+
+    Must run in the transaction that inserted the attempts, after the insert
+    took the SQLite write lock, so no other writer changes the entries between
+    reading and updating them.
+
+    Parameters:
+        - session (Session): Session of the recording transaction.
+        - attempt_value_list (List[Dict[str, Any]]): Inserted attempt rows in
+            submission order, rows without a player are skipped.
+    """
+    # Best attempt by quiz and player, the first attempt wins ties
+    best_dict: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    for attempt in attempt_value_list:
+        player = attempt.get('player')
+        if player is None:
+            continue
+        key = (attempt['quiz_id'], player)
+        best = best_dict.get(key)
+        if best is None or attempt['correct_count'] > best['correct_count']:
+            best_dict[key] = attempt
+    if not best_dict:
+        return
+
+    saved_dict = {
+        (row.quiz_id, row.player): row.correct_count
+        for row in session.execute(_SELECT_QUIZ_ENTRIES, {
+            'quiz_id_list': list({key[0] for key in best_dict}),
+            'player_list': list({key[1] for key in best_dict})
+        })
+    }
+
+    quiz_entry_list = []
+    # Change of the total and the quiz count by player
+    player_change_dict: Dict[str, List[Any]] = {}
+    for key, attempt in best_dict.items():
+        saved_count = saved_dict.get(key)
+        if saved_count is not None \
+                and attempt['correct_count'] <= saved_count:
+            continue
+        quiz_entry_list.append({
+            'quiz_id': key[0],
+            'player': key[1],
+            'correct_count': attempt['correct_count'],
+            'answered_count': attempt['answered_count'],
+            'achieved_at': attempt['created_at']
+        })
+        change = player_change_dict.setdefault(
+            key[1], [0, 0, attempt['created_at']])
+        change[0] += attempt['correct_count'] - (saved_count or 0)
+        change[1] += saved_count is None
+
+    if not quiz_entry_list:
+        return
+    session.execute(_UPSERT_QUIZ_ENTRY, quiz_entry_list)
+    session.execute(_UPSERT_PLAYER_ENTRY, [
+        {'player': player, 'total_correct_count': change[0],
+         'quiz_count': change[1], 'achieved_at': change[2]}
+        for player, change in player_change_dict.items()
+    ])
+
+
+def remove_quizzes(session: Session, quiz_id_list: List[int]) -> None:
+    """Remove the entries of deleted quizzes and subtract them from the
+    global leaderboard with three set based statements.
+    """
+    if not quiz_id_list:
+        return
+    parameters = {'quiz_id_list': list(quiz_id_list)}
+    session.execute(_SUBTRACT_DELETED_ENTRIES, parameters)
+    session.execute(_DELETE_EMPTY_PLAYERS, parameters)
+    session.execute(_DELETE_DELETED_ENTRIES, parameters)
+
+
+# ------------------------------
+# Read methods
+# ------------------------------
+
+def get_quiz_leaderboard(quiz_id: int, limit: int,
+                         cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Get one page of the best attempt of every player of a quiz in rank
+    order.
+
+    Players are ranked by correct answers, the player reaching the score
+    first ranks higher. Each page continues from the last entry of the
+    previous page through the rank index, so every page costs the same.
+
+    Parameters:
+        - quiz_id (int): Quiz ID.
+        - limit (int): Page size.
+        - cursor (Optional[str]): 'next_cursor' of the previous page or None
+            for the first page.
+
+    Returns:
+        Dict[str, Any]: Entries of the page with their rank and the cursor of
+            the next page or None if this is the last page.
+    """
+    quiz_id = int(quiz_id)
+    statement = (
+        select(QuizLeaderboard.player, QuizLeaderboard.correct_count,
+               QuizLeaderboard.answered_count, QuizLeaderboard.achieved_at)
+        .where(QuizLeaderboard.quiz_id == quiz_id)
+        .order_by(QuizLeaderboard.correct_count.desc(),
+                  QuizLeaderboard.achieved_at, QuizLeaderboard.player)
+    )
+    page = _get_page(statement, QuizLeaderboard, 'correct_count',
+                     f'quiz-{quiz_id}', limit, cursor)
+    return {'quiz_id': quiz_id, **page}
+
+
+def get_player_leaderboard(limit: int, cursor: Optional[str] = None
+                           ) -> Dict[str, Any]:
+    """Get one page of the players ranked by the sum of their best attempts
+    over all quizzes.
+
+    Parameters:
+        - limit (int): Page size.
+        - cursor (Optional[str]): 'next_cursor' of the previous page or None
+            for the first page.
+
+    Returns:
+        Dict[str, Any]: Entries of the page with their rank and the cursor of
+            the next page or None if this is the last page.
+    """
+    statement = (
+        select(PlayerLeaderboard.player,
+               PlayerLeaderboard.total_correct_count,
+               PlayerLeaderboard.quiz_count, PlayerLeaderboard.achieved_at)
+        .order_by(PlayerLeaderboard.total_correct_count.desc(),
+                  PlayerLeaderboard.achieved_at, PlayerLeaderboard.player)
+    )
+    return _get_page(statement, PlayerLeaderboard, 'total_correct_count',
+                     'player', limit, cursor)
+
+
+# ------------------------------
+# Helper methods
+# ------------------------------
+
+def _get_page(statement: Any, table: Any, score_name: str, board: str,
+              limit: int, cursor: Optional[str]) -> Dict[str, Any]:
+    """Read the page after the cursor of a leaderboard statement selecting
+    the player, the score, one more counter and the achieved date.
+    """
+    score_column = getattr(table, score_name)
+
+    # Decode the cursor before querying so an invalid cursor raises an error
+    rank = 0
+    if cursor is not None:
+        rank, score, achieved_at, player = _decode_cursor(cursor, board)
+        # The score bound lets the rank index skip every higher score
+        statement = statement.where(score_column <= score).where(or_(
+            score_column < score,
+            table.achieved_at > achieved_at,
+            and_(table.achieved_at == achieved_at, table.player > player)
+        ))
+
+    # Read one extra row to know if there is a next page
+    row_list = db.session.execute(statement.limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(row_list) > limit:
+        row_list = row_list[:limit]
+        last_row = row_list[-1]
+        next_cursor = _encode_cursor(board, [
+            rank + limit, last_row[1], last_row[3].isoformat(), last_row[0]])
+
+    entry_list = []
+    for position, row in enumerate(row_list, start=rank + 1):
+        entry = {'rank': position, **row._asdict()}
+        entry['achieved_at'] = row.achieved_at.isoformat()
+        entry_list.append(entry)
+    return {'entries': entry_list, 'next_cursor': next_cursor}
+
+
+def _encode_cursor(board: str, values: List[Any]) -> str:
+    """Encode the rank and sort key of the last entry of a page as an
+    opaque cursor.
+    """
+    data = json.dumps({'board': board, 'values': values})
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def _decode_cursor(cursor: str, board: str) -> List[Any]:
+    """Decode cursor to the rank and sort key of the last entry of a page."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        rank, score, achieved_at, player = data['values']
+        values = [int(rank), int(score), datetime.fromisoformat(achieved_at),
+                  str(player)]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError('Invalid cursor') from e
+    if data.get('board') != board:
+        raise ValueError('Cursor belongs to a different leaderboard')
+    return values
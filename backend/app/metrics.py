@@ -0,0 +1,292 @@
+from bisect import bisect_left
+from threading import Lock
+from typing import Any, Dict, List, Sequence, Tuple
+import time
+from flask import g, has_request_context, request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper bounds of the SQL statements per request histogram buckets
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250)
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[Any]
+                   ) -> str:
+    """Format label names and values in the Prometheus text format."""
+    label_list = []
+    for name, value in zip(label_names, label_values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"') \
+            .replace('\n', '\\n')
+        label_list.append(f'{name}="{value}"')
+    return ','.join(label_list)
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, without a fraction for whole numbers."""
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """Thread safe counter with one value per label combination."""
+
+    def __init__(self, name: str, help_text: str,
+                 label_names: Sequence[str]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[Any, ...], float] = {}
+        self._lock = Lock()
+
+    def inc(self, label_values: Sequence[Any], amount: float = 1) -> None:
+        """Increase the counter of the label values."""
+        key = tuple(label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, label_values: Sequence[Any]) -> float:
+        """Get the counter of the label values."""
+        with self._lock:
+            return self._values.get(tuple(label_values), 0)
+
+    def clear(self) -> None:
+        """Remove all counters."""
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        """Get the counter lines in the Prometheus text format."""
+        line_list = [f'# HELP {self.name} {self.help_text}',
+                     f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            labels = _format_labels(self.label_names, label_values)
+            line_list.append(f'{self.name}{{{labels}}} {_format_value(value)}')
+        return line_list
+
+
+class Gauge:
+    """Thread safe gauge holding the last set value per label combination.
+    """
+
+    def __init__(self, name: str, help_text: str,
+                 label_names: Sequence[str]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[Any, ...], float] = {}
+        self._lock = Lock()
+
+    def set(self, label_values: Sequence[Any], value: float) -> None:
+        """Set the gauge of the label values."""
+        with self._lock:
+            self._values[tuple(label_values)] = value
+
+    def get(self, label_values: Sequence[Any]) -> float:
+        """Get the gauge of the label values."""
+        with self._lock:
+            return self._values.get(tuple(label_values), 0)
+
+    def clear(self) -> None:
+        """Remove all gauges."""
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        """Get the gauge lines in the Prometheus text format."""
+        line_list = [f'# HELP {self.name} {self.help_text}',
+                     f'# TYPE {self.name} gauge']
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            labels = _format_labels(self.label_names, label_values)
+            line_list.append(f'{self.name}{{{labels}}} {_format_value(value)}')
+        return line_list
+
+
+class Histogram:
+    """Thread safe histogram with fixed buckets per label combination.
+
+    Only the bucket counts, the sum and the count are kept, so memory does not
+    grow with the number of observations.
+    """
+
+    def __init__(self, name: str, help_text: str,
+                 label_names: Sequence[str], buckets: Sequence[float]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # Bucket counts, with a last bucket above the highest bound, the sum
+        # and the count by label values
+        self._values: Dict[Tuple[Any, ...], List[Any]] = {}
+        self._lock = Lock()
+
+    def observe(self, label_values: Sequence[Any], value: float) -> None:
+        """Add an observation to the histogram of the label values."""
+        key = tuple(label_values)
+        bucket_index = bisect_left(self.buckets, value)
+        with self._lock:
+            values = self._values.get(key)
+            if values is None:
+                values = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._values[key] = values
+            values[0][bucket_index] += 1
+            values[1] += value
+            values[2] += 1
+
+    def get_count(self, label_values: Sequence[Any]) -> int:
+        """Get the number of observations of the label values."""
+        with self._lock:
+            values = self._values.get(tuple(label_values))
+            return values[2] if values is not None else 0
+
+    def clear(self) -> None:
+        """Remove all observations."""
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        """Get the histogram lines in the Prometheus text format with
+        cumulative buckets.
+        """
+        line_list = [f'# HELP {self.name} {self.help_text}',
+                     f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted(
+                (key, [list(values[0]), values[1], values[2]])
+                for key, values in self._values.items())
+        bound_list = [_format_value(bound) for bound in self.buckets]
+        bound_list.append('+Inf')
+        for label_values, (bucket_counts, total, count) in items:
+            labels = _format_labels(self.label_names, label_values)
+            cumulative = 0
+            for bound, bucket_count in zip(bound_list, bucket_counts):
+                cumulative += bucket_count
+                line_list.append(
+                    f'{self.name}_bucket{{{labels},le="{bound}"}} '
+                    f'{cumulative}')
+            line_list.append(
+                f'{self.name}_sum{{{labels}}} {_format_value(total)}')
+            line_list.append(f'{self.name}_count{{{labels}}} {count}')
+        return line_list
+
+
+# ------------------------------
+# Application metrics
+# ------------------------------
+# Metrics are kept per process, every worker of a multi-process server
+# reports its own values.
+
+REQUEST_DURATION = Histogram(
+    'quizzer_request_duration_seconds',
+    'Time to handle a request until the response headers are ready.',
+    ('endpoint',), LATENCY_BUCKETS)
+REQUESTS_TOTAL = Counter(
+    'quizzer_requests_total', 'Number of handled requests.',
+    ('endpoint', 'method', 'status'))
+SQL_DURATION = Histogram(
+    'quizzer_sql_duration_seconds',
+    'Time spent executing SQL statements per request.',
+    ('endpoint',), LATENCY_BUCKETS)
+SQL_STATEMENTS = Histogram(
+    'quizzer_sql_statements', 'Number of SQL statements per request.',
+    ('endpoint',), STATEMENT_COUNT_BUCKETS)
+SQL_STATEMENTS_TOTAL = Counter(
+    'quizzer_sql_statements_total', 'Number of executed SQL statements.',
+    ('endpoint',))
+
+WRITE_BEHIND_DEPTH = Gauge(
+    'quizzer_write_behind_queue_depth',
+    'Number of writes waiting in the write behind queue.', ('queue',))
+WRITE_BEHIND_FLUSH_DURATION = Histogram(
+    'quizzer_write_behind_flush_duration_seconds',
+    'Time to write one batch of the write behind queue.',
+    ('queue',), LATENCY_BUCKETS)
+WRITE_BEHIND_ITEMS_TOTAL = Counter(
+    'quizzer_write_behind_items_total',
+    'Number of writes flushed from the write behind queue by outcome.',
+    ('queue', 'outcome'))
+WRITE_BEHIND_FULL_TOTAL = Counter(
+    'quizzer_write_behind_full_total',
+    'Number of writes that waited too long for space in the write behind '
+    'queue.', ('queue',))
+
+METRICS = (REQUEST_DURATION, REQUESTS_TOTAL, SQL_DURATION, SQL_STATEMENTS,
+           SQL_STATEMENTS_TOTAL, WRITE_BEHIND_DEPTH,
+           WRITE_BEHIND_FLUSH_DURATION, WRITE_BEHIND_ITEMS_TOTAL,
+           WRITE_BEHIND_FULL_TOTAL)
+
+
+def render_metrics() -> str:
+    """Get all metrics in the Prometheus text exposition format."""
+    line_list = []
+    for metric in METRICS:
+        line_list.extend(metric.render())
+    return '\n'.join(line_list) + '\n'
+
+
+def clear_metrics() -> None:
+    """Remove all recorded metrics."""
+    for metric in METRICS:
+        metric.clear()
+
+
+# ------------------------------
+# Request instrumentation
+# ------------------------------
+
+def start_request() -> None:
+    """Start timing the current request and counting its statements."""
+    g.metrics_start_time = time.perf_counter()
+    g.metrics_sql_statements = 0
+    g.metrics_sql_seconds = 0.0
+
+
+def end_request(response: Response) -> Response:
+    """Record the latency, status and database use of the current request.
+
+    Streamed response bodies are generated after this, so only the time to
+    the response headers is recorded for them.
+    """
+    start_time = g.pop('metrics_start_time', None)
+    if start_time is None:
+        return response
+    duration = time.perf_counter() - start_time
+    endpoint = request.endpoint or 'unknown'
+
+    REQUEST_DURATION.observe((endpoint,), duration)
+    REQUESTS_TOTAL.inc((endpoint, request.method, response.status_code))
+    SQL_DURATION.observe((endpoint,), g.metrics_sql_seconds)
+    SQL_STATEMENTS.observe((endpoint,), g.metrics_sql_statements)
+    SQL_STATEMENTS_TOTAL.inc((endpoint,), g.metrics_sql_statements)
+    return response
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements and time spent in the database of every request."""
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _before_cursor_execute(connection: Any, cursor: Any, statement: str,
+                           parameters: Any, context: Any,
+                           executemany: bool) -> None:
+    """Remember when the statement started on its execution context."""
+    context.metrics_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(connection: Any, cursor: Any, statement: str,
+                          parameters: Any, context: Any,
+                          executemany: bool) -> None:
+    """Add the statement to the metrics of the current request."""
+    if not has_request_context() or 'metrics_start_time' not in g:
+        return
+    g.metrics_sql_statements += 1
+    g.metrics_sql_seconds += time.perf_counter() - context.metrics_start_time
@@ -0,0 +1,215 @@
+from typing import Callable, List, Optional
+import logging
+from flask_sqlalchemy.extension import SQLAlchemy
+from flask_sqlalchemy.model import DefaultMeta
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateTable
+from app.models import Quiz, QuizQuestion, QuizOption, QuizAttempt
+import app.search_index as search_index
+
+# ------------------------------
+# Migration steps
+# ------------------------------
+# 'db.create_all' only creates missing tables, so changes to tables that
+# already exist in a database file are applied by the steps below. Every step
+# must be safe to run on a freshly created database as well.
+
+
+def _create_missing_indexes(connection: Connection, table: DefaultMeta,
+                            name_list: Optional[List[str]] = None) -> None:
+    """Create the indexes declared on the model that the table is missing,
+    or only the named ones for indexes on columns added by later steps.
+    """
+    for index in table.__table__.indexes:
+        if name_list is None or index.name in name_list:
+            index.create(connection, checkfirst=True)
+
+
+def _add_quiz_hierarchy_indexes(connection: Connection) -> None:
+    """Remove duplicate question and option numbers then add the composite
+    unique indexes and the correct answer index.
+
+    The first row saved for a number is kept as it is the row the save path
+    has always updated.
+    """
+    duplicate_questions = (
+        'SELECT question_id FROM QuizQuestion WHERE question_id NOT IN '
+        '(SELECT MIN(question_id) FROM QuizQuestion '
+        'GROUP BY quiz_id, question_number)'
+    )
+    result = connection.exec_driver_sql(
+        f'DELETE FROM QuizOption WHERE question_id IN ({duplicate_questions})')
+    options_deleted = result.rowcount
+    result = connection.exec_driver_sql(
+        f'DELETE FROM QuizQuestion WHERE question_id IN '
+        f'({duplicate_questions})')
+    questions_deleted = result.rowcount
+    result = connection.exec_driver_sql(
+        'DELETE FROM QuizOption WHERE option_id NOT IN '
+        '(SELECT MIN(option_id) FROM QuizOption '
+        'GROUP BY question_id, option_number)')
+    options_deleted += result.rowcount
+    if questions_deleted or options_deleted:
+        logging.warning(f'Removed {questions_deleted} duplicate questions and '
+                        f'{options_deleted} duplicate options')
+
+    _create_missing_indexes(connection, QuizQuestion)
+    _create_missing_indexes(connection, QuizOption)
+
+
+def _add_quiz_updated_at_index(connection: Connection) -> None:
+    """Fill in missing updated dates then add the quiz pagination index.
+
+    Quizzes are paged by updated date, which needs every quiz to have one.
+    """
+    connection.exec_driver_sql(
+        "UPDATE Quiz SET updated_at = "
+        "COALESCE(created_at, '1970-01-01 00:00:00.000000') "
+        "WHERE updated_at IS NULL")
+    _create_missing_indexes(connection, Quiz, ['ix_quiz_updated_at_quiz_id'])
+
+
+def _add_quiz_search_index(connection: Connection) -> None:
+    """Add the full text index of quizzes and index every saved quiz."""
+    search_index.rebuild_index(connection)
+
+
+def _add_quiz_attempt_player(connection: Connection) -> None:
+    """Add the player column to attempt tables created without it.
+
+    Attempts recorded before have no player and are not ranked.
+    """
+    table_name = QuizAttempt.__tablename__
+    column_list = connection.exec_driver_sql(
+        f'PRAGMA table_info({table_name})').all()
+    if 'player' not in {column[1] for column in column_list}:
+        connection.exec_driver_sql(
+            f'ALTER TABLE {table_name} ADD COLUMN player VARCHAR')
+
+
+def _remove_deleted_quiz_rows(connection: Connection) -> None:
+    """Remove the rows left behind by quizzes deleted before deleting
+    cascaded to every table, then rebuild the global leaderboard from the
+    remaining quiz entries.
+    """
+    orphan_filter = 'quiz_id NOT IN (SELECT quiz_id FROM Quiz)'
+    result = connection.exec_driver_sql(
+        'DELETE FROM QuizOption WHERE question_id NOT IN '
+        f'(SELECT question_id FROM QuizQuestion WHERE NOT {orphan_filter})')
+    row_count = result.rowcount
+    for table_name in ('QuizQuestion', 'QuizSnapshot', 'QuizAttempt',
+                       'QuizStatistic', 'QuizQuestionStatistic',
+                       'QuizOptionStatistic', 'QuizLeaderboard'):
+        result = connection.exec_driver_sql(
+            f'DELETE FROM {table_name} WHERE {orphan_filter}')
+        row_count += result.rowcount
+    connection.execute(search_index.CREATE_SEARCH_TABLE)
+    connection.exec_driver_sql(
+        f'DELETE FROM {search_index.SEARCH_TABLE} '
+        'WHERE rowid NOT IN (SELECT quiz_id FROM Quiz)')
+    if row_count:
+        logging.warning(f'Removed {row_count} rows of deleted quizzes')
+
+    connection.exec_driver_sql('DELETE FROM PlayerLeaderboard')
+    connection.exec_driver_sql(
+        'INSERT INTO PlayerLeaderboard '
+        '(player, total_correct_count, quiz_count, achieved_at) '
+        'SELECT player, SUM(correct_count), COUNT(*), MAX(achieved_at) '
+        'FROM QuizLeaderboard GROUP BY player')
+
+
+def _add_quiz_deleted_at(connection: Connection) -> None:
+    """Add the soft delete column and its index to quiz tables created
+    without them.
+    """
+    table_name = Quiz.__tablename__
+    column_list = connection.exec_driver_sql(
+        f'PRAGMA table_info({table_name})').all()
+    if 'deleted_at' not in {column[1] for column in column_list}:
+        connection.exec_driver_sql(
+            f'ALTER TABLE {table_name} ADD COLUMN deleted_at DATETIME')
+    _create_missing_indexes(connection, Quiz)
+
+
+def _add_quiz_autoincrement(connection: Connection) -> None:
+    """Rebuild quiz tables created without AUTOINCREMENT, so IDs of deleted
+    quizzes are not given to new quizzes.
+
+    SQLite cannot change the key of an existing table, so the rows are
+    copied to a new table that then replaces the old one.
+    """
+    table_name = Quiz.__tablename__
+    table_sql = connection.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (table_name,)).scalar()
+    if 'AUTOINCREMENT' in table_sql.upper():
+        return
+
+    # Child tables reference the quiz table by name, which is valid again
+    # once the new table is renamed before the commit
+    connection.exec_driver_sql('PRAGMA defer_foreign_keys = ON')
+    new_table_name = f'{table_name}_new'
+    create_sql = str(CreateTable(Quiz.__table__).compile(
+        dialect=connection.dialect))
+    connection.exec_driver_sql(create_sql.replace(
+        f'CREATE TABLE "{table_name}"', f'CREATE TABLE "{new_table_name}"',
+        1))
+    column_names = ', '.join(column.name for column in Quiz.__table__.columns)
+    connection.exec_driver_sql(
+        f'INSERT INTO {new_table_name} ({column_names}) '
+        f'SELECT {column_names} FROM {table_name}')
+    connection.exec_driver_sql(f'DROP TABLE {table_name}')
+    connection.exec_driver_sql(
+        f'ALTER TABLE {new_table_name} RENAME TO {table_name}')
+    _create_missing_indexes(connection, Quiz)
+
+
+# Ordered list of migrations, the position of a step is its schema version
+MIGRATIONS: List[Callable[[Connection], None]] = [
+    _add_quiz_hierarchy_indexes,
+    _add_quiz_updated_at_index,
+    _add_quiz_search_index,
+    _add_quiz_attempt_player,
+    _remove_deleted_quiz_rows,
+    _add_quiz_deleted_at,
+    _add_quiz_autoincrement,
+]
+
+# ------------------------------
+# Migration methods
+# ------------------------------
+
+
+def get_schema_version(connection: Connection) -> int:
+    """Get the schema version stored in the SQLite database file."""
+    return connection.exec_driver_sql('PRAGMA user_version').scalar()
+
+
+def reset_database(db: SQLAlchemy) -> None:
+    """Drop the tables created by migrations and reset the schema version,
+    so a database recreated with 'db.drop_all' is migrated again.
+    """
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(
+            f'DROP TABLE IF EXISTS {search_index.SEARCH_TABLE}')
+        connection.exec_driver_sql('PRAGMA user_version = 0')
+
+
+def upgrade_database(db: SQLAlchemy) -> int:
+    """Apply all migrations newer than the database schema version.
+
+    Parameters:
+        - db (SQLAlchemy): Database with all tables already created.
+
+    Returns:
+        int: Schema version of the database after the upgrade.
+    """
+    with db.engine.begin() as connection:
+        version = get_schema_version(connection)
+        for number in range(version, len(MIGRATIONS)):
+            logging.info(f'Applying database migration {number + 1}')
+            MIGRATIONS[number](connection)
+            # Pragma values cannot be bound parameters
+            connection.exec_driver_sql(f'PRAGMA user_version = {number + 1}')
+            version = number + 1
+    return version
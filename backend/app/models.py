@@ -8,6 +8,16 @@ db = SQLAlchemy()
 
 class Quiz(db.Model):
     __tablename__ = 'Quiz'
+    __table_args__ = (
+        # Keyset pagination of quizzes ordered by most recently updated
+        db.Index('ix_quiz_updated_at_quiz_id', 'updated_at', 'quiz_id'),
+        # Partial index only holding soft deleted quizzes for compaction
+        db.Index('ix_quiz_deleted_at', 'deleted_at',
+                 sqlite_where=db.text('deleted_at IS NOT NULL')),
+        # IDs of deleted quizzes are never given to new quizzes, so rows
+        # written for a quiz after it was deleted never belong to another
+        {'sqlite_autoincrement': True},
+    )
 
     # Auto-incremented quiz id
     quiz_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -21,9 +31,24 @@ class Quiz(db.Model):
     # Cascading updated
     updated_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Soft deleted date, the quiz is hidden from every read until compaction
+    # removes its rows. None for quizzes that are not deleted.
+    deleted_at = db.Column(db.DateTime, nullable=True)
+
+    # Questions of the quiz in question number order for reading full quizzes
+    questions = db.relationship(
+        'QuizQuestion', order_by='QuizQuestion.question_number',
+        viewonly=True)
+
 
 class QuizQuestion(db.Model):
     __tablename__ = 'QuizQuestion'
+    __table_args__ = (
+        # A question number is unique within its quiz and is the key used to
+        # look up questions when saving or reading a quiz
+        db.Index('ix_quiz_question_quiz_id_question_number', 'quiz_id',
+                 'question_number', unique=True),
+    )
 
     # Auto-incremented quiz question id
     question_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -38,9 +63,23 @@ class QuizQuestion(db.Model):
     # Text representation of question
     text = db.Column(db.String(100), nullable=False)
 
+    # Options of the question in option number order for reading full quizzes
+    options = db.relationship(
+        'QuizOption', order_by='QuizOption.option_number', viewonly=True)
+
 
 class QuizOption(db.Model):
     __tablename__ = 'QuizOption'
+    __table_args__ = (
+        # An option number is unique within its question and is the key used
+        # to look up options when saving or reading a quiz
+        db.Index('ix_quiz_option_question_id_option_number', 'question_id',
+                 'option_number', unique=True),
+        # Partial index only holding the correct options for answer lookups
+        db.Index('ix_quiz_option_correct_answer', 'question_id',
+                 'option_number',
+                 sqlite_where=db.text('correct_answer = 1')),
+    )
 
     # Auto-incremented quiz option id
     option_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -57,3 +96,159 @@ class QuizOption(db.Model):
 
     # Boolean to signify if the option is current to the question
     correct_answer = db.Column(db.Boolean, nullable=False)
+
+
+class QuizSnapshot(db.Model):
+    __tablename__ = 'QuizSnapshot'
+
+    # Quiz the snapshot was rendered from
+    quiz_id = db.Column(db.Integer, db.ForeignKey('Quiz.quiz_id'),
+                        primary_key=True, autoincrement=False)
+
+    # Response format of the full quiz, 'flat' or 'nested'
+    response_format = db.Column(db.String, primary_key=True)
+
+    # Updated date of the quiz when the snapshot was rendered
+    revision = db.Column(db.DateTime, nullable=True)
+
+    # Content encoding of the body, 'gzip' or 'identity'
+    encoding = db.Column(db.String, nullable=False)
+
+    # Full quiz response body as rendered by the read route
+    body = db.Column(db.LargeBinary, nullable=False)
+
+
+class QuizAttempt(db.Model):
+    __tablename__ = 'QuizAttempt'
+    __table_args__ = (
+        # Attempt history of a quiz in submission order
+        db.Index('ix_quiz_attempt_quiz_id_attempt_id', 'quiz_id',
+                 'attempt_id'),
+    )
+
+    # Auto-incremented attempt id
+    attempt_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    # Foreign key to quiz table
+    quiz_id = db.Column(
+        db.Integer, db.ForeignKey('Quiz.quiz_id'), nullable=False)
+
+    # Number of correct answers
+    correct_count = db.Column(db.Integer, nullable=False)
+
+    # Number of answered questions
+    answered_count = db.Column(db.Integer, nullable=False)
+
+    # Correctness of every answered question in quiz order as '1' or '0'
+    result = db.Column(db.String, nullable=False)
+
+    # Selected option numbers in quiz order separated by commas
+    selections = db.Column(db.String, nullable=False)
+
+    # Name of the submitting player, attempts without one are not ranked
+    player = db.Column(db.String, nullable=True)
+
+    # Submitted date
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class QuizStatistic(db.Model):
+    __tablename__ = 'QuizStatistic'
+
+    # Quiz the counters belong to
+    quiz_id = db.Column(db.Integer, db.ForeignKey('Quiz.quiz_id'),
+                        primary_key=True, autoincrement=False)
+
+    # Number of recorded attempts
+    attempt_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Total correct answers of all attempts
+    correct_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Total answered questions of all attempts
+    answered_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class QuizQuestionStatistic(db.Model):
+    __tablename__ = 'QuizQuestionStatistic'
+
+    # Quiz the counters belong to
+    quiz_id = db.Column(db.Integer, db.ForeignKey('Quiz.quiz_id'),
+                        primary_key=True, autoincrement=False)
+
+    # Number of the question, so the counters stay with the question when
+    # other questions are added, removed or reordered
+    question_number = db.Column(db.Integer, primary_key=True,
+                                autoincrement=False)
+
+    # Number of attempts answering the question
+    answered_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Number of attempts selecting every correct option of the question
+    correct_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class QuizOptionStatistic(db.Model):
+    __tablename__ = 'QuizOptionStatistic'
+
+    # Quiz the counter belongs to
+    quiz_id = db.Column(db.Integer, db.ForeignKey('Quiz.quiz_id'),
+                        primary_key=True, autoincrement=False)
+
+    # Number of the question the option belongs to
+    question_number = db.Column(db.Integer, primary_key=True,
+                                autoincrement=False)
+
+    # Selected option number
+    option_number = db.Column(db.Integer, primary_key=True,
+                              autoincrement=False)
+
+    # Number of attempts selecting the option
+    pick_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class QuizLeaderboard(db.Model):
+    __tablename__ = 'QuizLeaderboard'
+    __table_args__ = (
+        # Leaderboard of a quiz in rank order, a page is one index range
+        db.Index('ix_quiz_leaderboard_rank', 'quiz_id',
+                 db.text('correct_count DESC'), 'achieved_at', 'player'),
+    )
+
+    # Quiz the entry is ranked in
+    quiz_id = db.Column(db.Integer, db.ForeignKey('Quiz.quiz_id'),
+                        primary_key=True, autoincrement=False)
+
+    # Ranked player
+    player = db.Column(db.String, primary_key=True)
+
+    # Correct answers of the best attempt of the player
+    correct_count = db.Column(db.Integer, nullable=False)
+
+    # Answered questions of the best attempt of the player
+    answered_count = db.Column(db.Integer, nullable=False)
+
+    # Submitted date of the best attempt, earlier attempts win ties
+    achieved_at = db.Column(db.DateTime, nullable=False)
+
+
+class PlayerLeaderboard(db.Model):
+    __tablename__ = 'PlayerLeaderboard'
+    __table_args__ = (
+        # Global leaderboard in rank order, a page is one index range
+        db.Index('ix_player_leaderboard_rank',
+                 db.text('total_correct_count DESC'), 'achieved_at',
+                 'player'),
+    )
+
+    # Ranked player
+    player = db.Column(db.String, primary_key=True)
+
+    # Sum of the best correct answers of the player over all quizzes
+    total_correct_count = db.Column(db.Integer, nullable=False)
+
+    # Number of quizzes the player is ranked in
+    quiz_count = db.Column(db.Integer, nullable=False)
+
+    # Date the total was reached, earlier totals win ties
+    achieved_at = db.Column(db.DateTime, nullable=False)
@@ -0,0 +1,160 @@
+from typing import Any, Dict, List, Optional, Union
+import gzip
+from flask import current_app
+from sqlalchemy import bindparam, delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.orm import Session
+from app.models import Quiz, QuizQuestion, QuizOption, QuizSnapshot
+
+# Response formats of the full quiz route stored as snapshots
+SNAPSHOT_FORMATS = ('flat', 'nested')
+
+# Bodies of at least this many bytes are stored gzip compressed
+SNAPSHOT_COMPRESS_MIN_SIZE = 1024
+
+# ------------------------------
+# Prebuilt statements
+# ------------------------------
+# Every quiz keeps its full quiz response bodies already rendered, so reading
+# a quiz is one primary key lookup instead of joining and serializing its
+# questions and options.
+
+_SELECT_SNAPSHOT = (
+    select(QuizSnapshot.revision, QuizSnapshot.encoding, QuizSnapshot.body)
+    .where(QuizSnapshot.quiz_id == bindparam('quiz_id'),
+           QuizSnapshot.response_format == bindparam('response_format'))
+)
+
+# Quiz rows with one row per option, including questions without options and
+# quizzes without questions for the nested format
+_SELECT_QUIZ_ROWS = (
+    select(
+        Quiz.quiz_id,
+        Quiz.name,
+        Quiz.created_at,
+        Quiz.updated_at,
+        QuizQuestion.question_id,
+        QuizQuestion.question_number,
+        QuizQuestion.text.label('question_text'),
+        QuizOption.option_id,
+        QuizOption.option_number,
+        QuizOption.text.label('option_text'),
+        QuizOption.correct_answer
+    )
+    .outerjoin(QuizQuestion, QuizQuestion.quiz_id == Quiz.quiz_id)
+    .outerjoin(QuizOption, QuizOption.question_id == QuizQuestion.question_id)
+    .where(Quiz.quiz_id.in_(bindparam('quiz_id_list', expanding=True)))
+    .order_by(Quiz.quiz_id, QuizQuestion.question_number,
+              QuizOption.option_number)
+)
+
+_insert_snapshot = sqlite_insert(QuizSnapshot.__table__)
+_UPSERT_SNAPSHOT = _insert_snapshot.on_conflict_do_update(
+    index_elements=['quiz_id', 'response_format'],
+    set_={
+        'revision': _insert_snapshot.excluded.revision,
+        'encoding': _insert_snapshot.excluded.encoding,
+        'body': _insert_snapshot.excluded.body,
+    }
+)
+
+_DELETE_SNAPSHOTS = delete(QuizSnapshot).where(
+    QuizSnapshot.quiz_id.in_(bindparam('quiz_id_list', expanding=True)))
+
+
+def get_snapshot(session: Session, quiz_id: Union[int, str],
+                 response_format: str) -> Optional[Row]:
+    """Get the revision, encoding and body of a stored full quiz response.
+
+    Returns:
+        Optional[Row]: Snapshot or None if the quiz has no snapshot.
+    """
+    return session.execute(_SELECT_SNAPSHOT, {
+        'quiz_id': quiz_id, 'response_format': response_format}).first()
+
+
+def refresh_snapshots(session: Union[Session, Connection],
+                      quiz_id_list: List[int]) -> None:
+    """Render the full quiz responses of the quizzes from their saved rows.
+
+    Runs in the transaction of the session, so the snapshots change together
+    with the quizzes. Needs an application context to render the bodies like
+    the read route does.
+    """
+    if not quiz_id_list:
+        return
+    quiz_dict: Dict[int, Dict[str, Any]] = {}
+    for row in session.execute(
+            _SELECT_QUIZ_ROWS, {'quiz_id_list': list(quiz_id_list)}):
+        _add_row(quiz_dict, row)
+
+    snapshot_list = []
+    for quiz_id, quiz in quiz_dict.items():
+        for response_format in SNAPSHOT_FORMATS:
+            data = quiz[response_format]
+            if response_format == 'nested':
+                data = {**data, 'quiz_question_data':
+                        list(data['quiz_question_data'].values())}
+            body = current_app.json.response({'full_quiz': data}).get_data()
+            encoding = 'identity'
+            if len(body) >= SNAPSHOT_COMPRESS_MIN_SIZE:
+                body = gzip.compress(body)
+                encoding = 'gzip'
+            snapshot_list.append({
+                'quiz_id': quiz_id, 'response_format': response_format,
+                'revision': quiz['revision'], 'encoding': encoding,
+                'body': body
+            })
+    if snapshot_list:
+        session.execute(_UPSERT_SNAPSHOT, snapshot_list)
+
+
+def remove_snapshots(session: Union[Session, Connection],
+                     quiz_id_list: List[int]) -> None:
+    """Remove the snapshots of deleted quizzes."""
+    if not quiz_id_list:
+        return
+    session.execute(_DELETE_SNAPSHOTS, {'quiz_id_list': list(quiz_id_list)})
+
+
+def _add_row(quiz_dict: Dict[int, Dict[str, Any]], row: Row) -> None:
+    """Add a quiz row to the flat and nested data of its quiz."""
+    quiz = quiz_dict.get(row.quiz_id)
+    if quiz is None:
+        quiz = {
+            'revision': row.updated_at,
+            'flat': [],
+            'nested': {
+                'quiz_id': row.quiz_id,
+                'name': row.name,
+                'created_at': row.created_at,
+                'updated_at': row.updated_at,
+                # Questions by question ID in question number order
+                'quiz_question_data': {}
+            }
+        }
+        quiz_dict[row.quiz_id] = quiz
+    if row.question_id is None:
+        return
+
+    question_dict = quiz['nested']['quiz_question_data']
+    question = question_dict.get(row.question_id)
+    if question is None:
+        question = {
+            'question_id': row.question_id,
+            'question_number': row.question_number,
+            'text': row.question_text,
+            'quiz_option_data': []
+        }
+        question_dict[row.question_id] = question
+    if row.option_id is None:
+        return
+
+    quiz['flat'].append(dict(row._mapping))
+    question['quiz_option_data'].append({
+        'option_id': row.option_id,
+        'option_number': row.option_number,
+        'text': row.option_text,
+        'correct_answer': row.correct_answer
+    })
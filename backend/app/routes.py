@@ -1,19 +1,94 @@
+from datetime import datetime, timezone
+import gzip
 import logging
-from typing import Optional
-from flask import Blueprint, jsonify, Response, request
-from app import Quiz, QuizQuestion, QuizOption, sql_functions
+from typing import Any, Dict, Generator, List, Optional, Tuple
+from flask import (Blueprint, current_app, jsonify, Response, request,
+                   stream_with_context)
+from flask_sqlalchemy.model import DefaultMeta
+from sqlalchemy.engine import Row
+from app import (Quiz, QuizQuestion, QuizOption, attempt_functions,
+                 bulk_functions, leaderboard_functions, metrics,
+                 sql_functions, write_behind)
 
 app = Blueprint('app', __name__)
 
+# Default and maximum page size of quiz list pages
+QUIZ_PAGE_DEFAULT_LIMIT = 50
+QUIZ_PAGE_MAX_LIMIT = 1000
+
+# Default and maximum page size of quiz search results
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+# Default and maximum page size of leaderboards
+LEADERBOARD_DEFAULT_LIMIT = 10
+LEADERBOARD_MAX_LIMIT = 100
+
+# Maximum number of operations applied in one quiz patch request
+PATCH_MAX_OPERATIONS = 100
+
+# Maximum number of quizzes deleted in one bulk delete request
+DELETE_MAX_QUIZZES = 1000
+
+# Maximum number of submissions evaluated in one batch request
+EVALUATE_BATCH_MAX_SUBMISSIONS = 1000
+
+# ------------------------------
+# Metrics methods
+# ------------------------------
+
+
+@app.before_request
+def _start_request_metrics() -> None:
+    """Start recording metrics of every route request."""
+    metrics.start_request()
+
+
+@app.after_request
+def _end_request_metrics(response: Response) -> Response:
+    """Record latency, status and database use of every route request."""
+    return metrics.end_request(response)
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics() -> Response:
+    """Get request and database metrics in the Prometheus text format."""
+    try:
+        return Response(metrics.render_metrics(),
+                        mimetype='text/plain; version=0.0.4')
+    except Exception as e:
+        logging.critical(f'Error: {str(e)}')
+        return jsonify({'error': 'An error occurred'}), 500
+
+
 # ------------------------------
 # Debug methods
 # ------------------------------
 
 
+def _stream_table_response(table: DefaultMeta) -> Response:
+    """Stream all table rows as newline delimited JSON in chunked batches."""
+    def generate() -> Generator[str, None, None]:
+        try:
+            for batch in sql_functions.stream_table_data(table):
+                yield ''.join(
+                    f'{current_app.json.dumps(row)}\n' for row in batch)
+        except Exception as e:
+            # Headers are already sent so the stream can only be cut short
+            logging.critical(f'Error: {str(e)}')
+
+    return Response(stream_with_context(generate()),
+                    mimetype='application/x-ndjson')
+
+
 @app.route('/debug-quiz', methods=['GET'])
 def debug_get_quizzes() -> Response:
-    """Get all quiz data."""
+    """Get all quiz data or stream it as newline delimited JSON with
+    'format=ndjson'.
+    """
     try:
+        if request.args.get('format') == 'ndjson':
+            return _stream_table_response(Quiz)
         response = sql_functions.fetch_table_data(Quiz)
         return jsonify({'quizzes': response})
     except Exception as e:
@@ -23,8 +98,12 @@ def debug_get_quizzes() -> Response:
 
 @app.route('/debug-quiz-question', methods=['GET'])
 def debug_get_quiz_questions() -> Response:
-    """Get all quiz question data."""
+    """Get all quiz question data or stream it as newline delimited JSON with
+    'format=ndjson'.
+    """
     try:
+        if request.args.get('format') == 'ndjson':
+            return _stream_table_response(QuizQuestion)
         response = sql_functions.fetch_table_data(QuizQuestion)
         return jsonify({'quiz_questions': response})
     except Exception as e:
@@ -34,8 +113,12 @@ def debug_get_quiz_questions() -> Response:
 
 @app.route('/debug-quiz-option', methods=['GET'])
 def debug_get_quiz_options() -> Response:
-    """Get all quiz option data."""
+    """Get all quiz option data or stream it as newline delimited JSON with
+    'format=ndjson'.
+    """
     try:
+        if request.args.get('format') == 'ndjson':
+            return _stream_table_response(QuizOption)
         response = sql_functions.fetch_table_data(QuizOption)
         return jsonify({'quiz_options': response})
     except Exception as e:
@@ -43,17 +126,146 @@ def debug_get_quiz_options() -> Response:
         return jsonify({'error': 'An error occurred'}), 500
 
 
+@app.route('/debug-answer-cache', methods=['GET'])
+def debug_get_answer_cache() -> Response:
+    """Get answer key cache size, hit and miss counters."""
+    try:
+        response = sql_functions.get_answer_key_cache_stats()
+        return jsonify({'answer_key_cache': response})
+    except Exception as e:
+        logging.critical(f'Error: {str(e)}')
+        return jsonify({'error': 'An error occurred'}), 500
+
+
 # ------------------------------
 # Route methods
 # ------------------------------
 
 
+def _is_not_modified(etag: str, last_modified: datetime) -> bool:
+    """Check if the conditional request headers match the quiz revision."""
+    # If-None-Match takes precedence over If-Modified-Since
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since is not None:
+        # HTTP dates only have second precision
+        return last_modified.replace(microsecond=0) \
+            <= request.if_modified_since
+    return False
+
+
+def _is_valid_player(player: Any) -> bool:
+    """Check if a submitted player is missing or a name that can be ranked.
+    """
+    return player is None or (
+        isinstance(player, str)
+        and 0 < len(player) <= leaderboard_functions.PLAYER_MAX_LENGTH)
+
+
+def _is_quiz_id(quiz_id: Any) -> bool:
+    """Check if a submitted quiz ID is an integer."""
+    # Booleans are integers in Python but not quiz IDs
+    return isinstance(quiz_id, int) and not isinstance(quiz_id, bool)
+
+
+def _record_attempts(attempt_list: List[Dict[str, Any]]) -> None:
+    """Record graded attempts without failing the grading response.
+
+    Attempts are queued when the app has a write behind queue and written
+    now only if the queue stays full.
+    """
+    queue = current_app.extensions.get(write_behind.ATTEMPT_QUEUE)
+    if queue is not None:
+        attempt_list = queue.put(attempt_list)
+        if not attempt_list:
+            return
+    try:
+        attempt_functions.record_attempts(attempt_list)
+    except Exception as e:
+        logging.critical(f'Error: {str(e)}')
+
+
+def _get_revision_headers(quiz_id: str, response_format: str,
+                          revision: datetime) -> Tuple[str, datetime]:
+    """Get the ETag and Last-Modified values of a quiz revision."""
+    etag = f'{quiz_id}-{revision:%Y%m%d%H%M%S%f}-{response_format}'
+    return etag, revision.replace(tzinfo=timezone.utc)
+
+
+def _get_snapshot_response(quiz_id: str, response_format: str,
+                           snapshot: Row) -> Response:
+    """Get the full quiz response of a snapshot without parsing its body.
+
+    Compressed bodies are sent as they are stored to clients accepting gzip.
+    """
+    if snapshot.revision is not None:
+        etag, last_modified = _get_revision_headers(
+            quiz_id, response_format, snapshot.revision)
+        if _is_not_modified(etag, last_modified):
+            response = Response(status=304)
+            _set_revision_headers(response, etag, last_modified)
+            return response
+
+    body = snapshot.body
+    response = Response(mimetype='application/json')
+    if snapshot.encoding == 'gzip':
+        response.vary.add('Accept-Encoding')
+        if request.accept_encodings['gzip']:
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            body = gzip.decompress(body)
+    response.set_data(body)
+    if snapshot.revision is not None:
+        _set_revision_headers(response, etag, last_modified)
+    return response
+
+
+def _set_revision_headers(response: Response, etag: str,
+                          last_modified: datetime) -> None:
+    """Set quiz revision headers and require clients to revalidate."""
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+
+
 @app.route('/get-full-quiz/<quiz_id>', methods=['GET'])
 def get_full_quiz(quiz_id: str) -> Response:
-    """Get all full quiz data with quiz id filter."""
+    """Get all full quiz data with quiz id filter.
+
+    The 'format' query parameter selects 'flat' rows with one row per option
+    (default) or a 'nested' quiz containing its questions and options.
+    Responses carry the quiz revision as ETag and Last-Modified headers, and
+    requests with matching If-None-Match or If-Modified-Since headers get an
+    empty 304 response without reading the quiz. Quizzes with a stored
+    snapshot are answered from it alone.
+    """
     try:
-        data = sql_functions.select_full_quiz(quiz_id)
-        return jsonify({'full_quiz': data})
+        response_format = request.args.get('format', 'flat')
+        if response_format not in ('flat', 'nested'):
+            return jsonify({'message': 'format needs to be flat or nested'})
+
+        snapshot = sql_functions.get_quiz_snapshot(quiz_id, response_format)
+        if snapshot is not None:
+            return _get_snapshot_response(quiz_id, response_format, snapshot)
+
+        # Answer conditional requests from the quiz revision alone
+        revision = sql_functions.get_quiz_revision(quiz_id)
+        if revision is not None:
+            etag, last_modified = _get_revision_headers(
+                quiz_id, response_format, revision)
+            if _is_not_modified(etag, last_modified):
+                response = Response(status=304)
+                _set_revision_headers(response, etag, last_modified)
+                return response
+
+        if response_format == 'flat':
+            data = sql_functions.select_full_quiz(quiz_id)
+        else:
+            data = sql_functions.select_full_quiz_nested(quiz_id)
+        response = jsonify({'full_quiz': data})
+        if revision is not None:
+            _set_revision_headers(response, etag, last_modified)
+        return response
     except Exception as e:
         logging.critical(f'Error: {str(e)}')
         return jsonify({'error': 'An error occurred'}), 500
@@ -63,7 +275,10 @@ def get_full_quiz(quiz_id: str) -> Response:
 def save_quiz() -> Response:
     try:
         data = request.get_json()
-        result = sql_functions.save_quiz(data)
+        try:
+            result = sql_functions.save_quiz(data)
+        except ValueError as e:
+            return jsonify({'message': str(e)})
         if result:
             message = 'Quiz saved successfully'
         else:
@@ -74,6 +289,38 @@ def save_quiz() -> Response:
         return jsonify({'error': 'An error occurred'}), 500
 
 
+@app.route('/patch-quiz', methods=['POST'])
+def patch_quiz() -> Response:
+    """Apply a list of targeted operations to a saved quiz, such as changing
+    the text of one question or the answer of one option, without sending the
+    whole quiz.
+    """
+    try:
+        data = request.get_json()
+        quiz_id = data.get('quiz_id')
+        operations = data.get('operations')
+        if not _is_quiz_id(quiz_id) or not isinstance(operations, list):
+            message = ('Data requires keys "quiz_id" and "operations" with '
+                       'a list of operations')
+            return jsonify({'message': message})
+        if len(operations) > PATCH_MAX_OPERATIONS:
+            message = ('operations needs to contain at most '
+                       f'{PATCH_MAX_OPERATIONS} operations')
+            return jsonify({'message': message})
+        try:
+            result = sql_functions.patch_quiz(quiz_id, operations)
+        except ValueError as e:
+            return jsonify({'message': str(e)})
+        if result:
+            message = 'Quiz patched successfully'
+        else:
+            message = 'Failed to patch quiz'
+        return jsonify({'message': message})
+    except Exception as e:
+        logging.critical(f'Error: {str(e)}')
+        return jsonify({'error': 'An error occurred'}), 500
+
+
 @app.route('/delete-quiz', methods=['POST'])
 def delete_quiz() -> Response:
     try:
@@ -89,24 +336,112 @@ def delete_quiz() -> Response:
         return jsonify({'error': 'An error occurred'}), 500
 
 
+@app.route('/delete-quizzes', methods=['POST'])
+def delete_quizzes() -> Response:
+    """Delete many quizzes in one transaction, only hiding them until
+    compaction when soft delete is on.
+    """
+    try:
+        data = request.get_json()
+        quiz_ids = data.get('quiz_ids')
+        if not isinstance(quiz_ids, list) or not all(
+            isinstance(quiz_id, int) and not isinstance(quiz_id, bool)
+            for quiz_id in quiz_ids
+        ):
+            message = 'Data requires key "quiz_ids" with a list of quiz IDs'
+            return jsonify({'message': message})
+        if len(quiz_ids) > DELETE_MAX_QUIZZES:
+            message = ('quiz_ids needs to contain at most '
+                       f'{DELETE_MAX_QUIZZES} quiz IDs')
+            return jsonify({'message': message})
+        deleted = sql_functions.delete_quizzes(quiz_ids)
+        return jsonify({'deleted': deleted})
+    except Exception as e:
+        logging.critical(f'Error: {str(e)}')
+        return jsonify({'error': 'An error occurred'}), 500
+
+
 @app.route('/get-quiz/<limit>', methods=['GET'])
 @app.route('/get-quiz', methods=['GET'])
 def get_quizzes(limit: Optional[str] = '0') -> Response:
     """Get a list of quizzes from the database with amount up to the limit or
-    0 for all.
+    0 for all. Optional fields are requested as a comma separated list with
+    'fields=question_count,updated_at'.
     """
     try:
         try:
-            int(limit)
+            limit = int(limit)
         except ValueError:
             return jsonify({'message': 'limit needs to be an integer'})
-        quiz_list = sql_functions.get_quiz_list(limit)
+        field_list = [field for field in
+                      request.args.get('fields', '').split(',') if field]
+        if not set(field_list) <= set(sql_functions.QUIZ_LIST_FIELDS):
+            fields = ', '.join(sql_functions.QUIZ_LIST_FIELDS)
+            return jsonify({'message': f'fields needs to be in {fields}'})
+        quiz_list = sql_functions.get_quiz_list(limit, field_list)
         return jsonify({'quiz_list': quiz_list})
     except Exception as e:
         logging.critical(f'Error: {str(e)}')
         return jsonify({'error': 'An error occurred'}), 500
 
 
+@app.route('/get-quiz-page', methods=['GET'])
+def get_quiz_page() -> Response:
+    """Get a page of quizzes from the database using the 'limit', 'cursor'
+    and 'order' query parameters. The 'next_cursor' of a response requests
+    the following page.
+    """
+    try:
+        try:
+            limit = int(request.args.get('limit', QUIZ_PAGE_DEFAULT_LIMIT))
+        except ValueError:
+            return jsonify({'message': 'limit needs to be an integer'})
+        if limit < 1 or limit > QUIZ_PAGE_MAX_LIMIT:
+            message = f'limit needs to be between 1 and {QUIZ_PAGE_MAX_LIMIT}'
+            return jsonify({'message': message})
+        cursor = request.args.get('cursor')
+        order_by = request.args.get('order', 'quiz_id')
+        if order_by not in sql_functions.QUIZ_PAGE_ORDERS:
+            return jsonify({'message': 'order needs to be quiz_id or '
+                                       'updated_at'})
+        try:
+            quiz_page = sql_functions.get_quiz_page(limit, cursor, order_by)
+        except ValueError:
+            return jsonify({'message': 'cursor is invalid'})
+        return jsonify(quiz_page)
+    except Exception as e:
+        logging.critical(f'Error: {str(e)}')
+        return jsonify({'error': 'An error occurred'}), 500
+
+
+@app.route('/search-quiz', methods=['GET'])
+def search_quiz() -> Response:
+    """Search quizzes by name, question and option text using the 'q',
+    'limit' and 'offset' query parameters. The 'next_offset' of a response
+    requests the following page.
+    """
+    try:
+        query = request.args.get('q', '')
+        try:
+            limit = int(request.args.get('limit', SEARCH_DEFAULT_LIMIT))
+            offset = int(request.args.get('offset', 0))
+        except ValueError:
+            return jsonify({'message': 'limit and offset need to be integers'})
+        if limit < 1 or limit > SEARCH_MAX_LIMIT:
+            message = f'limit needs to be between 1 and {SEARCH_MAX_LIMIT}'
+            return jsonify({'message': message})
+        if offset < 0:
+            return jsonify({'message': 'offset needs to be at least 0'})
+        try:
+            search_result = sql_functions.search_quizzes(query, limit, offset)
+        except ValueError:
+            return jsonify({'message': 'q needs to contain a word'})
+        return jsonify(search_result)
+    except Exception as e:
+        logging.critical(f'Error: {str(e)}')
+        return jsonify({'error': 'An error occurred'}), 500
+
+
 @app.route('/evaluate_quiz', methods=['POST'])
 def evaluate_quiz() -> Response:
     """Get a list of boolean representing incorrect or correct selected
@@ -116,11 +451,207 @@ def evaluate_quiz() -> Response:
         data = request.get_json()
         quiz_id = data.get('quiz_id')
         selections = data.get('selections')
+        player = data.get('player')
         if quiz_id is None or selections is None:
             message = 'Data requires keys "quiz_id" and "selections"'
             return jsonify({'message': message})
+        if not _is_quiz_id(quiz_id):
+            return jsonify({'message': 'quiz_id needs to be an integer'})
+        if not _is_valid_player(player):
+            message = ('player needs to be a name of at most '
+                       f'{leaderboard_functions.PLAYER_MAX_LENGTH} characters')
+            return jsonify({'message': message})
         result = sql_functions.evaluate_quiz(quiz_id, selections)
+        _record_attempts([{'quiz_id': quiz_id, 'selections': selections,
+                           'result': result, 'player': player}])
         return jsonify({'result': result})
     except Exception as e:
         logging.critical(f'Error: {str(e)}')
         return jsonify({'error': 'An error occurred'}), 500
+
+
+@app.route('/evaluate_quiz_batch', methods=['POST'])
+def evaluate_quiz_batch() -> Response:
+    """Evaluate many submissions in one request and get the evaluation of
+    each submission along with the totals.
+    """
+    try:
+        data = request.get_json()
+        submissions = data.get('submissions')
+        if not isinstance(submissions, list) or not all(
+            isinstance(submission, dict)
+            and _is_quiz_id(submission.get('quiz_id'))
+            and isinstance(submission.get('selections'), list)
+            and _is_valid_player(submission.get('player'))
+            for submission in submissions
+        ):
+            message = ('Data requires key "submissions" with a list of '
+                       'submissions with keys "quiz_id" and "selections"')
+            return jsonify({'message': message})
+        if len(submissions) > EVALUATE_BATCH_MAX_SUBMISSIONS:
+            message = ('submissions needs to contain at most '
+                       f'{EVALUATE_BATCH_MAX_SUBMISSIONS} submissions')
+            return jsonify({'message': message})
+        result = sql_functions.evaluate_quiz_batch(submissions)
+        _record_attempts([
+            {'quiz_id': evaluation['quiz_id'],
+             'selections': submission['selections'],
+             'result': evaluation['result'],
+             'player': submission.get('player')}
+            for submission, evaluation in zip(submissions, result['results'])
+        ])
+        return jsonify(result)
+    except Exception as e:
+        logging.critical(f'Error: {str(e)}')
+        return jsonify({'error': 'An error occurred'}), 500
+
+
+@app.route('/quiz-statistics/<quiz_id>', methods=['GET'])
+def get_quiz_statistics(quiz_id: str) -> Response:
+    """Get attempt statistics of a quiz and its questions, or of the single
+    question with the number given by 'question'.
+    """
+    try:
+        try:
+            quiz_id = int(quiz_id)
+            question = request.args.get('question')
+            question_number = int(question) if question else None
+        except ValueError:
+            return jsonify(
+                {'message': 'quiz_id and question need to be integers'})
+        if question_number is None:
+            statistics = attempt_functions.get_quiz_statistics(quiz_id)
+            return jsonify({'statistics': statistics})
+        statistics = attempt_functions.get_question_statistics(
+            quiz_id, question_number)
+        return jsonify({'statistics': statistics})
+    except Exception as e:
+        logging.critical(f'Error: {str(e)}')
+        return jsonify({'error': 'An error occurred'}), 500
+
+
+def _get_leaderboard_page_args(
+) -> Tuple[Optional[Tuple[int, Optional[str]]], Optional[str]]:
+    """Get the 'limit' and 'cursor' query parameters of a leaderboard page or
+    the message explaining why they are invalid.
+    """
+    try:
+        limit = int(request.args.get('limit', LEADERBOARD_DEFAULT_LIMIT))
+    except ValueError:
+        return None, 'limit needs to be an integer'
+    if limit < 1 or limit > LEADERBOARD_MAX_LIMIT:
+        return None, f'limit needs to be between 1 and {LEADERBOARD_MAX_LIMIT}'
+    return (limit, request.args.get('cursor')), None
+
+
+@app.route('/leaderboard/<quiz_id>', methods=['GET'])
+def get_quiz_leaderboard(quiz_id: str) -> Response:
+    """Get a page of the best attempt of every player of a quiz in rank order
+    using the 'limit' and 'cursor' query parameters. The 'next_cursor' of a
+    response requests the following ranks.
+    """
+    try:
+        try:
+            quiz_id = int(quiz_id)
+        except ValueError:
+            return jsonify({'message': 'quiz_id needs to be an integer'})
+        page_args, message = _get_leaderboard_page_args()
+        if message is not None:
+            return jsonify({'message': message})
+        try:
+            leaderboard = leaderboard_functions.get_quiz_leaderboard(
+                quiz_id, *page_args)
+        except ValueError:
+            return jsonify({'message': 'cursor is invalid'})
+        return jsonify(leaderboard)
+    except Exception as e:
+        logging.critical(f'Error: {str(e)}')
+        return jsonify({'error': 'An error occurred'}), 500
+
+
+@app.route('/leaderboard', methods=['GET'])
+def get_player_leaderboard() -> Response:
+    """Get a page of the players ranked by their best attempts over all
+    quizzes using the 'limit' and 'cursor' query parameters.
+    """
+    try:
+        page_args, message = _get_leaderboard_page_args()
+        if message is not None:
+            return jsonify({'message': message})
+        try:
+            leaderboard = leaderboard_functions.get_player_leaderboard(
+                *page_args)
+        except ValueError:
+            return jsonify({'message': 'cursor is invalid'})
+        return jsonify(leaderboard)
+    except Exception as e:
+        logging.critical(f'Error: {str(e)}')
+        return jsonify({'error': 'An error occurred'}), 500
+
+
+@app.route('/import-quizzes', methods=['POST'])
+def import_quizzes() -> Response:
+    """Import new quizzes from a JSON lines request body with one quiz in the
+    'save_quiz' format per line. The body may be gzip compressed and the
+    'start_line' query parameter resumes a failed import.
+    """
+    try:
+        try:
+            start_line = int(request.args.get('start_line', 0))
+        except ValueError:
+            return jsonify({'message': 'start_line needs to be an integer'})
+        line_stream = request.stream
+        if request.content_encoding == 'gzip':
+            line_stream = gzip.GzipFile(fileobj=line_stream)
+        report = bulk_functions.import_quizzes(line_stream, start_line)
+        return jsonify(report)
+    except Exception as e:
+        logging.critical(f'Error: {str(e)}')
+        return jsonify({'error': 'An error occurred'}), 500
+
+
+@app.route('/export-quizzes', methods=['GET'])
+def export_quizzes() -> Response:
+    """Stream quizzes as JSON lines in the 'save_quiz' format. Quizzes are
+    filtered by repeated 'quiz_id' query parameters and 'updated_since', and
+    'compress=gzip' downloads a gzip compressed file.
+    """
+    try:
+        try:
+            quiz_id_list = [
+                int(quiz_id) for quiz_id in request.args.getlist('quiz_id')]
+        except ValueError:
+            return jsonify({'message': 'quiz_id needs to be an integer'})
+        updated_since = request.args.get('updated_since')
+        if updated_since is not None:
+            try:
+                updated_since = datetime.fromisoformat(updated_since)
+            except ValueError:
+                return jsonify({'message': 'updated_since needs to be an '
+                                           'ISO 8601 date'})
+
+        def generate() -> Generator[str, None, None]:
+            try:
+                yield from bulk_functions.export_quizzes(
+                    quiz_id_list or None, updated_since)
+            except Exception as e:
+                # Headers are already sent, so the error aborts the transfer
+                # and the client sees an incomplete export instead of a
+                # complete looking file
+                logging.critical(f'Error: {str(e)}')
+                raise
+
+        line_generator = generate()
+        if request.args.get('compress') == 'gzip':
+            return Response(
+                stream_with_context(
+                    bulk_functions.gzip_compress_stream(line_generator)),
+                mimetype='application/gzip',
+                headers={'Content-Disposition':
+                         'attachment; filename=quizzes.jsonl.gz'}
+            )
+        return Response(stream_with_context(line_generator),
+                        mimetype='application/x-ndjson')
+    except Exception as e:
+        logging.critical(f'Error: {str(e)}')
+        return jsonify({'error': 'An error occurred'}), 500
@@ -0,0 +1,77 @@
+from typing import List, Union
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+# Full text index with one document per quiz, the rowid is the quiz ID.
+# Prefix indexes make search as you type queries fast.
+SEARCH_TABLE = 'QuizSearch'
+
+CREATE_SEARCH_TABLE = text(
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+    'name, question_text, option_text, '
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+
+# Quiz documents built from the saved rows of the selected quizzes
+_SELECT_DOCUMENTS = (
+    'SELECT Quiz.quiz_id, Quiz.name, '
+    '(SELECT group_concat(text, \' \') FROM QuizQuestion '
+    'WHERE QuizQuestion.quiz_id = Quiz.quiz_id), '
+    '(SELECT group_concat(QuizOption.text, \' \') FROM QuizOption '
+    'JOIN QuizQuestion '
+    'ON QuizOption.question_id = QuizQuestion.question_id '
+    'WHERE QuizQuestion.quiz_id = Quiz.quiz_id) '
+    'FROM Quiz'
+)
+_INSERT_DOCUMENTS = (
+    f'INSERT INTO {SEARCH_TABLE} (rowid, name, question_text, option_text) '
+    f'{_SELECT_DOCUMENTS}'
+)
+
+_DELETE_QUIZZES = text(
+    f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN :quiz_id_list'
+).bindparams(bindparam('quiz_id_list', expanding=True))
+_INDEX_QUIZZES = text(
+    f'{_INSERT_DOCUMENTS} WHERE Quiz.quiz_id IN :quiz_id_list'
+).bindparams(bindparam('quiz_id_list', expanding=True))
+_INDEX_QUIZ_RANGE = text(
+    f'{_INSERT_DOCUMENTS} '
+    'WHERE Quiz.quiz_id BETWEEN :first_quiz_id AND :last_quiz_id'
+)
+
+
+def index_quizzes(session: Union[Session, Connection],
+                  quiz_id_list: List[int]) -> None:
+    """Replace the documents of the quizzes with their saved rows.
+
+    Runs in the transaction of the session, so the index changes together
+    with the quizzes.
+    """
+    if not quiz_id_list:
+        return
+    parameters = {'quiz_id_list': list(quiz_id_list)}
+    session.execute(_DELETE_QUIZZES, parameters)
+    session.execute(_INDEX_QUIZZES, parameters)
+
+
+def index_new_quizzes(session: Union[Session, Connection],
+                      first_quiz_id: int, last_quiz_id: int) -> None:
+    """Add documents of new quizzes with consecutive IDs in one statement."""
+    session.execute(_INDEX_QUIZ_RANGE, {'first_quiz_id': first_quiz_id,
+                                        'last_quiz_id': last_quiz_id})
+
+
+def remove_quizzes(session: Union[Session, Connection],
+                   quiz_id_list: List[int]) -> None:
+    """Remove the documents of deleted quizzes."""
+    if not quiz_id_list:
+        return
+    session.execute(_DELETE_QUIZZES, {'quiz_id_list': list(quiz_id_list)})
+
+
+def rebuild_index(connection: Connection) -> None:
+    """Create the index if missing and index every saved quiz again."""
+    connection.execute(CREATE_SEARCH_TABLE)
+    connection.execute(text(f'DELETE FROM {SEARCH_TABLE}'))
+    connection.execute(text(_INSERT_DOCUMENTS))
@@ -1,5 +1,19 @@
+from typing import Dict
+import random
 from flask_sqlalchemy.extension import SQLAlchemy
+from sqlalchemy import func, insert, select, text
 from app.models import Quiz, QuizQuestion, QuizOption
+import app.search_index as search_index
+
+# Number of quizzes inserted per transaction when generating data
+GENERATE_BATCH_SIZE = 1000
+
+# Words used to build generated names and texts
+_WORDS = (
+    'alpha', 'atom', 'cell', 'delta', 'earth', 'force', 'gamma', 'heat',
+    'ion', 'joule', 'kelvin', 'light', 'mass', 'node', 'orbit', 'prime',
+    'quark', 'root', 'sine', 'tide', 'unit', 'volt', 'wave', 'zero'
+)
 
 
 def insert_sample_data(db: SQLAlchemy) -> None:
@@ -61,3 +75,89 @@ def _insert_sample_options(db: SQLAlchemy) -> None:
         row = QuizOption(**data)
         db.session.add(row)
     db.session.commit()
+
+
+def insert_generated_data(db: SQLAlchemy, quiz_count: int,
+                          questions_per_quiz: int, options_per_question: int,
+                          seed: int = 0,
+                          batch_size: int = GENERATE_BATCH_SIZE
+                          ) -> Dict[str, int]:
+    """Insert generated quizzes for benchmarking at scale.
+
+    The same seed and sizes generate the same quizzes. Every question has
+    exactly one correct option. Rows are inserted with one bulk insert per
+    table and batch, so millions of rows can be generated.
+
+    Parameters:
+        - db (SQLAlchemy): Database to insert into.
+        - quiz_count (int): Number of quizzes to add.
+        - questions_per_quiz (int): Number of questions of every quiz.
+        - options_per_question (int): Number of options of every question.
+        - seed (int): Seed of the random names and correct answers.
+        - batch_size (int): Number of quizzes inserted per transaction.
+
+    Returns:
+        Dict[str, int]: Number of quizzes, questions and options inserted.
+    """
+    generator = random.Random(seed)
+    session = db.session
+    # Continue after the highest ID ever used so deleted IDs are not reused
+    next_quiz_id = max(
+        session.scalar(select(func.coalesce(func.max(Quiz.quiz_id), 0))),
+        session.scalar(text(
+            "SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence "
+            f"WHERE name = '{Quiz.__tablename__}'"))
+    ) + 1
+    next_question_id = session.scalar(
+        select(func.coalesce(func.max(QuizQuestion.question_id), 0))) + 1
+
+    for batch_start in range(0, quiz_count, batch_size):
+        first_quiz_id = next_quiz_id
+        quiz_value_list = []
+        question_value_list = []
+        option_value_list = []
+        for _ in range(min(batch_size, quiz_count - batch_start)):
+            quiz_value_list.append({
+                'quiz_id': next_quiz_id,
+                'name': _generate_text(generator, 2)[:20]
+            })
+            for question_number in range(1, questions_per_quiz + 1):
+                question_value_list.append({
+                    'question_id': next_question_id,
+                    'quiz_id': next_quiz_id,
+                    'question_number': question_number,
+                    'text': _generate_text(generator, 8)
+                })
+                correct_option = generator.randint(1, options_per_question)
+                for option_number in range(1, options_per_question + 1):
+                    option_value_list.append({
+                        'question_id': next_question_id,
+                        'option_number': option_number,
+                        'text': _generate_text(generator, 2)[:20],
+                        'correct_answer': option_number == correct_option
+                    })
+                next_question_id += 1
+            next_quiz_id += 1
+
+        # Insert through the tables directly as the IDs are already known
+        session.execute(insert(Quiz.__table__), quiz_value_list)
+        if question_value_list:
+            session.execute(insert(QuizQuestion.__table__),
+                            question_value_list)
+        if option_value_list:
+            session.execute(insert(QuizOption.__table__), option_value_list)
+        search_index.index_new_quizzes(session, first_quiz_id,
+                                       next_quiz_id - 1)
+        session.commit()
+
+    question_count = quiz_count * questions_per_quiz
+    return {
+        'quizzes': quiz_count,
+        'questions': question_count,
+        'options': question_count * options_per_question
+    }
+
+
+def _generate_text(generator: random.Random, word_count: int) -> str:
+    """Generate text of random words."""
+    return ' '.join(generator.choices(_WORDS, k=word_count))
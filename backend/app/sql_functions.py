@@ -1,12 +1,144 @@
-from datetime import datetime
-from typing import Any, Dict, Generator, List, Optional
+from datetime import datetime, timedelta
+from typing import Any, Dict, Generator, List, Optional, Sequence, Tuple
 from contextlib import contextmanager
+import base64
+import json
 import logging
+import operator
+import re
+from flask import current_app
 from flask_sqlalchemy.model import DefaultMeta
-from sqlalchemy import and_
+from sqlalchemy import (bindparam, delete, func, insert, select, text, tuple_,
+                        update)
 from sqlalchemy.engine.row import Row
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app import db, Quiz, QuizQuestion, QuizOption
+from app.cache import LRUCache
+import app.attempt_functions as attempt_functions
+import app.leaderboard_functions as leaderboard_functions
+import app.quiz_snapshot as quiz_snapshot
+import app.search_index as search_index
+
+# Maximum number of quiz answer keys kept in memory
+ANSWER_KEY_CACHE_SIZE = 1024
+
+# Seconds an answer key stays cached. Saving a quiz only invalidates the
+# cache of the worker process handling the save, so other workers may grade
+# with the previous answers for up to this long.
+ANSWER_KEY_CACHE_TTL = 5.0
+
+# Answer keys by quiz ID, invalidated when a quiz is saved or deleted
+_answer_key_cache = LRUCache(ANSWER_KEY_CACHE_SIZE, ANSWER_KEY_CACHE_TTL)
+
+# Number of rows held in memory at a time when streaming a table
+TABLE_STREAM_BATCH_SIZE = 1000
+
+# Optional fields of quiz list entries besides the quiz ID and name
+QUIZ_LIST_FIELDS = ('created_at', 'updated_at', 'question_count')
+
+# Maximum number of words of a search query
+SEARCH_MAX_WORDS = 10
+
+# Supported sort orders of quiz list pages
+QUIZ_PAGE_ORDERS = ('quiz_id', 'updated_at')
+
+# Required fields of every quiz patch operation
+PATCH_OPERATIONS = {
+    'rename_quiz': ('name',),
+    'update_question': ('question_number', 'text'),
+    'add_option': ('question_number', 'option_number', 'text',
+                   'correct_answer'),
+    'update_option': ('question_number', 'option_number'),
+    'remove_option': ('question_number', 'option_number'),
+}
+
+
+# ------------------------------
+# Prebuilt statements
+# ------------------------------
+# Hot read statements are built once with bound parameters instead of on
+# every call, so each call skips statement construction and the compiled
+# form is reused from the engine compiled cache.
+
+# Soft deleted quizzes are hidden from every read until compaction removes
+# them
+_LIVE_QUIZ = Quiz.deleted_at.is_(None)
+
+# Full quiz rows with one row per option, executed with 'quiz_id'
+_FULL_QUIZ_STATEMENT = (
+    select(
+        Quiz.quiz_id,
+        Quiz.name,
+        Quiz.created_at,
+        Quiz.updated_at,
+        QuizQuestion.question_id,
+        QuizQuestion.question_number,
+        QuizQuestion.text.label('question_text'),
+        QuizOption.option_id,
+        QuizOption.option_number,
+        QuizOption.text.label('option_text'),
+        QuizOption.correct_answer
+    )
+    .join(QuizQuestion, QuizQuestion.quiz_id == Quiz.quiz_id)
+    .join(QuizOption, QuizOption.question_id == QuizQuestion.question_id)
+    .where(Quiz.quiz_id == bindparam('quiz_id'), _LIVE_QUIZ)
+)
+
+# Updated date of a quiz, executed with 'quiz_id'
+_QUIZ_REVISION_STATEMENT = (
+    select(Quiz.updated_at)
+    .where(Quiz.quiz_id == bindparam('quiz_id'), _LIVE_QUIZ)
+)
+
+# Correct option numbers of quizzes in question order, executed with the
+# list 'quiz_id_list'
+_QUIZ_ANSWERS_STATEMENT = (
+    select(QuizQuestion.quiz_id, QuizOption.option_number)
+    .join(QuizQuestion, QuizOption.question_id == QuizQuestion.question_id)
+    .join(Quiz, Quiz.quiz_id == QuizQuestion.quiz_id)
+    .where(
+        QuizQuestion.quiz_id.in_(bindparam('quiz_id_list', expanding=True)),
+        QuizOption.correct_answer == True,  # noqa: E712
+        _LIVE_QUIZ
+    )
+    .order_by(QuizQuestion.quiz_id, QuizQuestion.question_number,
+              QuizOption.option_number)
+)
+
+# Quizzes matching a full text query ranked by BM25 relevance, where a match
+# in the quiz name counts most and a match in an option least. Executed with
+# 'match', 'limit' and 'offset'.
+_SEARCH_QUIZ_STATEMENT = text(
+    'SELECT Quiz.quiz_id, Quiz.name, '
+    f'bm25({search_index.SEARCH_TABLE}, 10.0, 4.0, 1.0) AS score, '
+    f"snippet({search_index.SEARCH_TABLE}, -1, '[', ']', '...', 12) "
+    'AS snippet '
+    f'FROM {search_index.SEARCH_TABLE} '
+    f'JOIN Quiz ON Quiz.quiz_id = {search_index.SEARCH_TABLE}.rowid '
+    f'WHERE {search_index.SEARCH_TABLE} MATCH :match '
+    'AND Quiz.deleted_at IS NULL '
+    'ORDER BY score LIMIT :limit OFFSET :offset'
+)
+
+# Deletes of quizzes and their questions and options, executed with the list
+# 'quiz_id_list'. Children are deleted first by quiz ID through the
+# question index, so deleting many quizzes costs one statement per table.
+_deleted_quiz_ids = bindparam('quiz_id_list', expanding=True)
+_DELETE_QUIZ_STATEMENTS = (
+    delete(QuizOption).where(QuizOption.question_id.in_(
+        select(QuizQuestion.question_id)
+        .where(QuizQuestion.quiz_id.in_(_deleted_quiz_ids)))),
+    delete(QuizQuestion).where(QuizQuestion.quiz_id.in_(_deleted_quiz_ids)),
+)
+_DELETE_QUIZZES = delete(Quiz).where(Quiz.quiz_id.in_(_deleted_quiz_ids))
+
+# Soft delete of quizzes, executed with the list 'quiz_id_list' and
+# 'deleted_at'
+_TOMBSTONE_QUIZZES = (
+    update(Quiz)
+    .where(Quiz.quiz_id.in_(_deleted_quiz_ids), _LIVE_QUIZ)
+    .values(deleted_at=bindparam('deleted_at'))
+)
 
 
 # ------------------------------
@@ -37,6 +169,49 @@ def fetch_table_data(table: DefaultMeta) -> List[Dict[str, Any]]:
     return response
 
 
+def stream_table_data(table: DefaultMeta,
+                      batch_size: int = TABLE_STREAM_BATCH_SIZE
+                      ) -> Generator[List[Dict[str, Any]], None, None]:
+    """Dynamically fetch all of table data from SQL in batches.
+
+    Rows are read from a server side cursor so only one batch is held in
+    memory at a time regardless of the table size.
+
+    Parameters:
+        - table (DefaultMeta): Table to query all.
+        - batch_size (int): Number of rows fetched and yielded at a time.
+
+    Yields:
+        List[Dict[str, Any]]: Dictionary list representation of the next
+            batch of table rows.
+    """
+    # Select table columns without building ORM objects
+    statement = (
+        select(table.__table__)
+        .execution_options(yield_per=batch_size)
+    )
+    result = db.session.execute(statement)
+    for partition in result.partitions():
+        yield _sql_row_to_dict_list(partition)
+
+
+def get_answer_key_cache_stats() -> Dict[str, int]:
+    """Get size, hit and miss counters of the answer key cache."""
+    return _answer_key_cache.stats()
+
+
+def invalidate_answer_keys(quiz_id_list: List[int]) -> None:
+    """Remove cached answer keys of quizzes changed outside of this module.
+    """
+    for quiz_id in quiz_id_list:
+        _answer_key_cache.invalidate(quiz_id)
+
+
+def clear_answer_key_cache() -> None:
+    """Remove all cached answer keys and reset the cache counters."""
+    _answer_key_cache.clear()
+
+
 # ------------------------------
 # Context manager
 # ------------------------------
@@ -74,30 +249,83 @@ def select_full_quiz(quiz_id: str) -> List[Dict[str, Any]]:
             full quiz.
     """
     with _get_session(False, False) as session:
-        query = (
-            session.query(
-                Quiz.quiz_id,
-                Quiz.name,
-                Quiz.created_at,
-                Quiz.updated_at,
-                QuizQuestion.question_id,
-                QuizQuestion.question_number,
-                QuizQuestion.text.label('question_text'),
-                QuizOption.option_id,
-                QuizOption.option_number,
-                QuizOption.text.label('option_text'),
-                QuizOption.correct_answer
+        query_result = session.execute(
+            _FULL_QUIZ_STATEMENT, {'quiz_id': quiz_id}).all()
+
+    json_dict_list = _sql_row_to_dict_list(query_result)
+    return json_dict_list
+
+
+def select_full_quiz_nested(quiz_id: str) -> Optional[Dict[str, Any]]:
+    """Select full quiz as a nested dictionary of the quiz, its questions and
+    their options.
+
+    The quiz, questions and options are loaded with one query each instead
+    of one joined row per option, so quiz and question values are not
+    repeated.
+
+    Parameters:
+        - quiz_id (str): Quiz ID to filter results to grab specific quiz.
+
+    Returns:
+        Optional[Dict[str, Any]]: Returns nested dictionary in the format
+            accepted by 'save_quiz' or None if the quiz does not exist.
+    """
+    nested_quiz = None  # Default return value if error occurs
+    with _get_session(False, False) as session:
+        quiz = (
+            session.query(Quiz)
+            .options(
+                selectinload(Quiz.questions)
+                .selectinload(QuizQuestion.options)
             )
-            .join(QuizQuestion, QuizQuestion.quiz_id == Quiz.quiz_id)
-            .join(QuizOption,
-                  QuizOption.question_id == QuizQuestion.question_id)
-            .filter(Quiz.quiz_id == quiz_id)
+            .filter(Quiz.quiz_id == quiz_id, _LIVE_QUIZ)
+            .one_or_none()
         )
 
-        query_result = query.all()
+        if quiz is not None:
+            nested_quiz = _quiz_to_nested_dict(quiz)
+
+    return nested_quiz
+
+
+def get_quiz_revision(quiz_id: str) -> Optional[datetime]:
+    """Get the updated date of the quiz, which changes whenever the quiz,
+    its questions or its options are saved with changes.
+
+    Parameters:
+        - quiz_id (str): Quiz ID of the quiz.
+
+    Returns:
+        Optional[datetime]: Updated date of the quiz or None if the quiz does
+            not exist.
+    """
+    updated_at = None  # Default return value if error occurs
+    with _get_session(False, False) as session:
+        # Primary key lookup of a single column
+        updated_at = session.scalar(
+            _QUIZ_REVISION_STATEMENT, {'quiz_id': quiz_id})
+    return updated_at
 
-    json_dict_list = _sql_row_to_dict_list(query_result)
-    return json_dict_list
+
+def get_quiz_snapshot(quiz_id: str, response_format: str) -> Optional[Row]:
+    """Get the stored full quiz response of a quiz with one primary key
+    lookup.
+
+    Parameters:
+        - quiz_id (str): Quiz ID of the quiz.
+        - response_format (str): 'flat' or 'nested'.
+
+    Returns:
+        Optional[Row]: Revision, content encoding and body of the response or
+            None if the quiz has no snapshot. Soft deleting a quiz removes
+            its snapshots.
+    """
+    snapshot = None  # Default return value if error occurs
+    with _get_session(False, False) as session:
+        snapshot = quiz_snapshot.get_snapshot(
+            session, quiz_id, response_format)
+    return snapshot
 
 
 def delete_quiz(delete_quiz_data: Dict[str, str]) -> bool:
@@ -112,24 +340,105 @@ def delete_quiz(delete_quiz_data: Dict[str, str]) -> bool:
         bool: True if a quiz got deleted else False.
     """
     quiz_id = int(delete_quiz_data['quiz_id'])
+    return delete_quizzes([quiz_id]) > 0
+
+
+def delete_quizzes(quiz_id_list: List[int]) -> int:
+    """Delete quizzes, as soft deletes when 'SOFT_DELETE_QUIZZES' is set in
+    the app config and with all of their rows otherwise.
+
+    Parameters:
+        - quiz_id_list (List[int]): IDs of the quizzes to delete, unknown
+            and already deleted IDs are skipped.
+
+    Returns:
+        int: Number of deleted quizzes.
+    """
+    if current_app.config.get('SOFT_DELETE_QUIZZES'):
+        return tombstone_quizzes(quiz_id_list)
+    return purge_quizzes(quiz_id_list)
+
+
+def tombstone_quizzes(quiz_id_list: List[int]) -> int:
+    """Soft delete quizzes by setting their deleted date.
+
+    The quizzes disappear from every read at once, while their questions,
+    options, attempts and statistics stay until compaction purges them. Only
+    the quiz rows, search documents, snapshots and leaderboard entries are
+    written, so the cost does not depend on the size of the quizzes. The
+    leaderboard entries are removed right away so the player totals stop
+    counting the deleted quizzes.
+
+    Parameters:
+        - quiz_id_list (List[int]): IDs of the quizzes to delete, unknown
+            and already deleted IDs are skipped.
+
+    Returns:
+        int: Number of deleted quizzes.
+    """
+    quiz_id_list = list({int(quiz_id) for quiz_id in quiz_id_list})
+    if not quiz_id_list:
+        return 0
 
     with _get_session(True, True) as session:
-        # Filter by condition and delete
-        rows_deleted = session.query(Quiz).filter(quiz_id == quiz_id).delete()
+        rows_deleted = session.execute(_TOMBSTONE_QUIZZES, {
+            'quiz_id_list': quiz_id_list,
+            'deleted_at': datetime.utcnow()
+        }).rowcount
+        search_index.remove_quizzes(session, quiz_id_list)
+        quiz_snapshot.remove_snapshots(session, quiz_id_list)
+        leaderboard_functions.remove_quizzes(session, quiz_id_list)
 
         # Commit session
         session.commit()
 
-    # Return False if no rows deleted
-    if rows_deleted == 0:
-        return False
-    return True
+    invalidate_answer_keys(quiz_id_list)
+    return rows_deleted
+
+
+def purge_quizzes(quiz_id_list: List[int]) -> int:
+    """Delete quizzes with all of their rows in one transaction.
+
+    Questions, options, search documents, snapshots, attempts, statistics
+    and leaderboard entries are deleted with one statement per table for all
+    quizzes at once, so the number of statements does not grow with the
+    number of quizzes or their size.
+
+    Parameters:
+        - quiz_id_list (List[int]): IDs of the quizzes to delete, soft
+            deleted or not, unknown IDs are skipped.
+
+    Returns:
+        int: Number of deleted quizzes.
+    """
+    quiz_id_list = list({int(quiz_id) for quiz_id in quiz_id_list})
+    if not quiz_id_list:
+        return 0
+    parameters = {'quiz_id_list': quiz_id_list}
+
+    with _get_session(True, True) as session:
+        for statement in _DELETE_QUIZ_STATEMENTS:
+            session.execute(statement, parameters)
+        rows_deleted = session.execute(_DELETE_QUIZZES, parameters).rowcount
+        search_index.remove_quizzes(session, quiz_id_list)
+        quiz_snapshot.remove_snapshots(session, quiz_id_list)
+        attempt_functions.remove_quizzes(session, quiz_id_list)
+
+        # Commit session
+        session.commit()
+
+    invalidate_answer_keys(quiz_id_list)
+    return rows_deleted
 
 
 def save_quiz(question_data: Dict[str, Any]) -> bool:
     """
     Update quiz details, questions, and options.
 
+    The saved quiz is loaded with one query and only the rows that differ
+    from the data are inserted, updated or deleted in bulk. All changes are
+    committed in a single transaction.
+
     Args:
         data (Dict[str, Any]): Nested dictionary containing data for quiz,
             quiz questions and quiz question optinos.
@@ -153,93 +462,378 @@ def save_quiz(question_data: Dict[str, Any]) -> bool:
                     ]
                 }
             }
+
+    Raises:
+        ValueError: A field has the wrong type or a question or option number
+            is repeated, nothing is changed.
     """
+    # Check the data before writing so repeated numbers do not reach the
+    # unique indexes
+    validate_quiz_data(question_data['quiz_data'])
+
     # Use session to make changes in the database
     successfully_commited = False
     with _get_session(True, True) as session:
         # Get quiz data
         quiz_data = question_data['quiz_data']
 
-        # Save quiz details
-        quiz_id = _save_quiz_row(session, quiz_data)
+        # Get saved quiz or add new quiz
+        quiz = _save_quiz_row(session, quiz_data)
 
-        if quiz_id == 0:
-            # Return early if no quiz was updated
+        if quiz is None:
+            # Return early if the quiz does not exist
             return False
+        quiz_id = quiz.quiz_id
+        quiz_created = quiz_data.get('quiz_id', 0) == 0
 
         # Extract question data
         question_data_list = quiz_data['quiz_question_data']
 
-        for question_data in question_data_list:
-            # Save quiz question details
-            question_id = _save_question_row(session, question_data, quiz_id)
+        # Compare the saved questions and options with the new data and only
+        # write the rows that differ
+        saved_question_dict = _load_saved_questions(session, quiz_id)
+        questions_changed = _save_question_rows(
+            session, quiz_id, saved_question_dict, question_data_list)
+        # Saved questions left in the dictionary were removed, their
+        # statistics go with them
+        attempt_functions.remove_questions(
+            session, quiz_id, list(saved_question_dict))
+
+        # Update quiz name and move the quiz to a new revision if the quiz is
+        # new or anything in the quiz changed, so every new quiz is indexed
+        # even without questions
+        if (quiz_created or questions_changed
+                or quiz.name != quiz_data['name']):
+            quiz.name = quiz_data['name']
+            quiz.updated_at = _get_next_revision(quiz.updated_at)
+            # Write the changes before indexing the saved rows
+            session.flush()
+            search_index.index_quizzes(session, [quiz_id])
+            quiz_snapshot.refresh_snapshots(session, [quiz_id])
+
+        # Commit all changes at once so a failed save changes nothing
+        session.commit()
+        _answer_key_cache.invalidate(quiz_id)
 
-            # Extract option data
-            option_data_list = question_data['quiz_option_data']
+        # Flag commits were successful
+        successfully_commited = True
 
-            for option_data in option_data_list:
-                # Save quiz option details
-                _save_option_rows(session, option_data, question_id)
+    return successfully_commited
 
-            # Get highest option number and delete all the options with higher
-            # option numbers
-            threshold = _get_max_quiz_number_threshold(option_data_list,
-                                                       'option_number')
-            _delete_rest_of_rows(session, QuizOption, 'question_id',
-                                 question_id, 'option_number', threshold)
 
-        # Get highest question number and delete all the questions with higher
-        # question numbers
-        threshold = _get_max_quiz_number_threshold(question_data_list,
-                                                   'question_number')
-        _delete_rest_of_rows(session, QuizQuestion, 'quiz_id', quiz_id,
-                             'question_number', threshold)
+def validate_quiz_data(quiz_data: Any) -> None:
+    """Check quiz data in the 'save_quiz' format has fields of the right
+    types and unique question and option numbers.
 
-        # Flag commits were successful
-        successfully_commited = True
+    Raises:
+        ValueError: The data is invalid, the message names the problem.
+    """
+    if not isinstance(quiz_data, dict):
+        raise ValueError('Data requires key "quiz_data"')
+    _validate_field(quiz_data, 'name', str, 'quiz')
+    _validate_numbered_list(quiz_data, 'quiz_question_data',
+                            'question_number', 'quiz', 'question')
+    for question_data in quiz_data['quiz_question_data']:
+        _validate_field(question_data, 'text', str, 'question')
+        _validate_numbered_list(question_data, 'quiz_option_data',
+                                'option_number', 'question', 'option')
+        for option_data in question_data['quiz_option_data']:
+            _validate_field(option_data, 'text', str, 'option')
+            _validate_field(option_data, 'correct_answer', bool, 'option')
+
+
+def patch_quiz(quiz_id: int, operation_list: List[Dict[str, Any]]) -> bool:
+    """Apply targeted changes to a saved quiz.
+
+    Only the questions named by the operations are loaded and only the rows
+    that change are written, so the cost depends on the size of the change
+    instead of the size of the quiz. All operations are committed in a single
+    transaction, in the formats:
+        {'op': 'rename_quiz', 'name': str}
+        {'op': 'update_question', 'question_number': int, 'text': str}
+        {'op': 'add_option', 'question_number': int, 'option_number': int,
+         'text': str, 'correct_answer': bool}
+        {'op': 'update_option', 'question_number': int,
+         'option_number': int, 'text': str, 'correct_answer': bool}, where
+         'text' and 'correct_answer' are optional
+        {'op': 'remove_option', 'question_number': int, 'option_number': int}
 
-    return successfully_commited
+    Parameters:
+        - quiz_id (int): Quiz ID of the saved quiz.
+        - operation_list (List[Dict[str, Any]]): Operations applied in order.
+
+    Returns:
+        bool: True if the changes were committed, False if the quiz does not
+            exist.
+
+    Raises:
+        ValueError: An operation is invalid or names a missing question or
+            option, nothing is changed.
+    """
+    for operation in operation_list:
+        _check_patch_operation(operation)
+
+    question_number_list = list({
+        operation['question_number'] for operation in operation_list
+        if 'question_number' in operation
+    })
+    with _get_session(True, True) as session:
+        quiz = session.get(Quiz, quiz_id)
+        if quiz is None or quiz.deleted_at is not None:
+            return False
+
+        saved_question_dict = {}
+        if question_number_list:
+            saved_question_dict = _load_saved_questions(
+                session, quiz_id, question_number_list)
+        name = quiz.name
+        patched_question_dict = {
+            question_number: {**question, 'options': {
+                option_number: dict(option)
+                for option_number, option in question['options'].items()
+            }}
+            for question_number, question in saved_question_dict.items()
+        }
+        for operation in operation_list:
+            if operation['op'] == 'rename_quiz':
+                name = operation['name']
+            else:
+                _apply_patch_operation(patched_question_dict, operation)
+
+        text_changed, answers_changed = _patch_question_rows(
+            session, saved_question_dict, patched_question_dict)
+        text_changed = text_changed or quiz.name != name
+
+        # Move the quiz to a new revision if anything in the quiz changed
+        if text_changed or answers_changed:
+            quiz.name = name
+            quiz.updated_at = _get_next_revision(quiz.updated_at)
+            # Write the changes before reading the saved rows
+            session.flush()
+            if text_changed:
+                search_index.index_quizzes(session, [quiz_id])
+            quiz_snapshot.refresh_snapshots(session, [quiz_id])
+
+        session.commit()
+
+    if answers_changed:
+        _answer_key_cache.invalidate(quiz_id)
+    return True
 
 
-def get_quiz_list(limit: int) -> List[Dict[str, str]]:
+def get_quiz_list(limit: int, fields: Sequence[str] = ()
+                  ) -> List[Dict[str, Any]]:
     """Extract a list of quiz with list size up to the limit.
 
+    Only the quiz ID, name and requested columns are selected and rows are
+    converted to dictionaries directly without loading quiz objects.
+
     Parameters:
         limit (int): Quiz list size limit or 0 for all.
+        fields (Sequence[str]): Optional fields from 'QUIZ_LIST_FIELDS' to
+            add to every quiz.
 
     Returns:
-        List[Quiz]: List of quizzess from the database.
+        List[Dict[str, Any]]: List of quizzes from the database in quiz ID
+            order.
     """
-    with _get_session(False, False) as session:
-        if limit == 0:
-            quiz_list = session.query(Quiz).all()
+    limit = int(limit)
+    unknown_fields = [field for field in fields
+                      if field not in QUIZ_LIST_FIELDS]
+    if unknown_fields:
+        raise ValueError(f'Unknown fields: {", ".join(unknown_fields)}')
+
+    column_list = [Quiz.quiz_id, Quiz.name]
+    for field in QUIZ_LIST_FIELDS:
+        if field not in fields:
+            continue
+        if field == 'question_count':
+            # Counted from the question number index of each quiz
+            column_list.append(
+                select(func.count(QuizQuestion.question_id))
+                .where(QuizQuestion.quiz_id == Quiz.quiz_id)
+                .scalar_subquery()
+                .label('question_count'))
         else:
-            quiz_list = session.query(Quiz).limit(limit).all()
+            column_list.append(getattr(Quiz, field))
+    statement = select(*column_list).where(_LIVE_QUIZ).order_by(Quiz.quiz_id)
+    if limit != 0:
+        statement = statement.limit(limit)
 
-    # Convert quiz list to list of dictionaries
     json_quiz_list = []
-    for quiz in quiz_list:
-        data = {
-            'quiz_id': quiz.quiz_id,
-            'name': quiz.name
-        }
-        json_quiz_list.append(data)
+    with _get_session(False, False) as session:
+        result = session.execute(statement)
+        key_list = list(result.keys())
+        json_quiz_list = [dict(zip(key_list, row)) for row in result]
 
     return json_quiz_list
 
 
+def get_quiz_page(limit: int, cursor: Optional[str] = None,
+                  order_by: str = 'quiz_id') -> Dict[str, Any]:
+    """Extract one page of the quiz list using keyset pagination.
+
+    Each page continues from the last quiz of the previous page through an
+    index, so every page costs the same as the first page.
+
+    Parameters:
+        limit (int): Page size.
+        cursor (Optional[str]): 'next_cursor' of the previous page or None
+            for the first page.
+        order_by (str): 'quiz_id' for ascending quiz IDs or 'updated_at' for
+            most recently updated quizzes first.
+
+    Returns:
+        Dict[str, Any]: Quiz list of the page and the cursor of the next page
+            or None if this is the last page.
+    """
+    if order_by not in QUIZ_PAGE_ORDERS:
+        raise ValueError(f'Unknown quiz page order "{order_by}"')
+
+    # Columns of the sort key stored in the cursor
+    if order_by == 'quiz_id':
+        sort_columns = [Quiz.quiz_id]
+        order_columns = [Quiz.quiz_id]
+    else:
+        sort_columns = [Quiz.updated_at, Quiz.quiz_id]
+        order_columns = [Quiz.updated_at.desc(), Quiz.quiz_id.desc()]
+
+    # Decode the cursor before querying so an invalid cursor raises an error
+    last_values = None
+    if cursor is not None:
+        last_values = _decode_cursor(cursor, order_by, len(sort_columns))
+
+    query_result = []  # Default return value if error occurs
+    with _get_session(False, False) as session:
+        # Select only the columns needed for the response and the cursor
+        query = (
+            session.query(Quiz.quiz_id, Quiz.name, Quiz.updated_at)
+            .filter(_LIVE_QUIZ)
+        )
+        if last_values is not None:
+            if order_by == 'quiz_id':
+                query = query.filter(Quiz.quiz_id > last_values[0])
+            else:
+                query = query.filter(
+                    tuple_(*sort_columns) < tuple_(*last_values))
+        query = query.order_by(*order_columns)
+
+        # Read one extra row to know if there is a next page
+        query_result = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(query_result) > limit:
+        query_result = query_result[:limit]
+        last_row = query_result[-1]
+        if order_by == 'quiz_id':
+            next_cursor = _encode_cursor(order_by, [last_row.quiz_id])
+        else:
+            next_cursor = _encode_cursor(
+                order_by,
+                [last_row.updated_at.isoformat(), last_row.quiz_id]
+            )
+
+    json_quiz_list = [
+        {'quiz_id': row.quiz_id, 'name': row.name} for row in query_result
+    ]
+    return {'quiz_list': json_quiz_list, 'next_cursor': next_cursor}
+
+
+def search_quizzes(query: str, limit: int, offset: int = 0
+                   ) -> Dict[str, Any]:
+    """Search quiz names, questions and options with the full text index.
+
+    Every word of the query must match the start of a word in the quiz, so
+    partially typed words find results.
+
+    Parameters:
+        query (str): Words to search for.
+        limit (int): Page size.
+        offset (int): Number of results of the previous pages.
+
+    Returns:
+        Dict[str, Any]: Most relevant quizzes first with their relevance
+            score and matching text, and the offset of the next page or None
+            if this is the last page.
+    """
+    match = _to_match_query(query)
+
+    query_result = []  # Default return value if error occurs
+    with _get_session(False, False) as session:
+        # Read one extra row to know if there is a next page
+        query_result = session.execute(
+            _SEARCH_QUIZ_STATEMENT,
+            {'match': match, 'limit': limit + 1, 'offset': offset}
+        ).all()
+
+    next_offset = None
+    if len(query_result) > limit:
+        query_result = query_result[:limit]
+        next_offset = offset + limit
+
+    # BM25 scores are negative with the best match lowest
+    json_result_list = [
+        {
+            'quiz_id': row.quiz_id,
+            'name': row.name,
+            'score': round(-row.score, 6),
+            'snippet': row.snippet
+        }
+        for row in query_result
+    ]
+    return {'results': json_result_list, 'next_offset': next_offset}
+
+
 def evaluate_quiz(quiz_id: int, user_selection_list: List[int]) -> List[bool]:
     """Evaluate the user input quiz comparing the input answers with the
     answers in the database.
     """
-    evaluation = []
     answer_list = _get_quiz_answers(quiz_id)
-    for user_choice, answer in zip(user_selection_list, answer_list):
-        if user_choice == answer:
-            evaluation.append(True)
-        else:
-            evaluation.append(False)
-    return evaluation
+    return _compare_selections(user_selection_list, answer_list)
+
+
+def evaluate_quiz_batch(submission_list: List[Dict[str, Any]]
+                        ) -> Dict[str, Any]:
+    """Evaluate many user input quizzes at once.
+
+    Answer keys of all quizzes missing from the answer key cache are read
+    with a single query.
+
+    Parameters:
+        submission_list (List[Dict[str, Any]]): Submissions in the format
+            {'quiz_id': int, 'selections': List[int]}.
+
+    Returns:
+        Dict[str, Any]: Evaluation, number of correct answers and number of
+            questions of each submission in submission order, along with the
+            totals of all submissions.
+    """
+    quiz_id_list = [int(submission['quiz_id'])
+                    for submission in submission_list]
+    answer_dict = _get_quiz_answers_bulk(quiz_id_list)
+
+    result_list = []
+    total_correct = 0
+    total_questions = 0
+    for quiz_id, submission in zip(quiz_id_list, submission_list):
+        answer_list = answer_dict[quiz_id]
+        evaluation = _compare_selections(submission['selections'],
+                                         answer_list)
+        correct = evaluation.count(True)
+        result_list.append({
+            'quiz_id': quiz_id,
+            'result': evaluation,
+            'correct': correct,
+            'questions': len(answer_list)
+        })
+        total_correct += correct
+        total_questions += len(answer_list)
+
+    return {
+        'results': result_list,
+        'total_correct': total_correct,
+        'total_questions': total_questions
+    }
 
 # ------------------------------
 # Helper methods
@@ -257,15 +851,69 @@ def _sql_row_to_dict_list(query_result: List[Row]) -> List[Dict[str, Any]]:
     return json_dict_list
 
 
-def _row_exist(session: Session, table: DefaultMeta, filters: Dict[str, Any]
-               ) -> Optional[Row]:
-    """Check if data exists after filtering a table."""
-    data = session.query(table).filter_by(**filters).first()
-    if data:
-        # Return data if at least one row found
-        return data
-    # Return None if no rows found
-    return None
+def _encode_cursor(order_by: str, values: List[Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    data = json.dumps({'order_by': order_by, 'values': values})
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def _decode_cursor(cursor: str, order_by: str, value_count: int
+                   ) -> List[Any]:
+    """Decode cursor to the sort key values of the last row of a page."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        values = data['values']
+        if not isinstance(values, list) or len(values) != value_count:
+            raise ValueError('Cursor needs one value per sort column')
+        # The quiz ID is the last sort column of every order
+        if type(values[-1]) is not int:
+            raise ValueError('Cursor quiz ID needs to be an integer')
+        if order_by == 'updated_at':
+            values[0] = datetime.fromisoformat(values[0])
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError('Invalid cursor') from e
+    if data.get('order_by') != order_by:
+        raise ValueError('Cursor belongs to a different order')
+    return values
+
+
+def _to_match_query(query: str) -> str:
+    """Convert search text to a full text query matching word prefixes.
+
+    Words are quoted so characters of the full text query syntax in the
+    search text are searched for instead of raising syntax errors.
+    """
+    word_list = re.findall(r'\w+', query)[:SEARCH_MAX_WORDS]
+    if not word_list:
+        raise ValueError('Search query needs at least one word')
+    return ' '.join(f'"{word}"*' for word in word_list)
+
+
+def _quiz_to_nested_dict(quiz: Quiz) -> Dict[str, Any]:
+    """Convert quiz with loaded questions and options to nested dictionary."""
+    return {
+        'quiz_id': quiz.quiz_id,
+        'name': quiz.name,
+        'created_at': quiz.created_at,
+        'updated_at': quiz.updated_at,
+        'quiz_question_data': [
+            {
+                'question_id': question.question_id,
+                'question_number': question.question_number,
+                'text': question.text,
+                'quiz_option_data': [
+                    {
+                        'option_id': option.option_id,
+                        'option_number': option.option_number,
+                        'text': option.text,
+                        'correct_answer': option.correct_answer
+                    }
+                    for option in question.options
+                ]
+            }
+            for question in quiz.questions
+        ]
+    }
 
 
 def _insert_row(session: Session, table: DefaultMeta, values: Dict[str, Any]
@@ -279,163 +927,425 @@ def _insert_row(session: Session, table: DefaultMeta, values: Dict[str, Any]
     return new_row
 
 
-def _update_row(session: Session, table: DefaultMeta, filters: Dict[str, Any],
-                values: Dict[str, Any]) -> bool:
-    """Update row in SQL with filters and new values."""
-    updated_rows = session.query(table).filter_by(**filters).update(values)
-    # Return False if no rows updated
-    if updated_rows == 0:
-        return False
-    return True
-
+def _save_quiz_row(session: Session, quiz_data: Dict[str, Any]
+                   ) -> Optional[Quiz]:
+    """Get saved quiz by quiz ID or add a new quiz if the quiz ID is 0.
 
-def _save_quiz_row(session: Session, quiz_data: Dict[str, Any]) -> int:
-    """Save quiz row and return quiz ID."""
+    Returns:
+        Optional[Quiz]: Quiz row or None if the quiz ID does not exist or the
+            quiz is soft deleted.
+    """
     quiz_id = quiz_data.get('quiz_id', 0)
-    quiz_name = quiz_data['name']
-    if quiz_id == 0:
-        # If the given quiz ID is 0, create new quiz
-        values = {Quiz.name.name: quiz_name}
-        quiz = _insert_row(session, Quiz, values)
-    else:
-        # Update quiz for given quiz ID
-        filters = {Quiz.quiz_id.name: quiz_id}
-        values = {
-            Quiz.name.name: quiz_name,
-            Quiz.updated_at.name: datetime.now()
-        }
-        updated = _update_row(session, Quiz, filters, values)
-        if updated == 0:
-            # Return 0 if no quiz was updated
-            return 0
-
-    # Commit and get quiz ID
-    session.commit()
-    if quiz_id == 0:
-        quiz_id = quiz.quiz_id
-    return quiz_id
+    if quiz_id != 0:
+        quiz = session.get(Quiz, quiz_id)
+        if quiz is None or quiz.deleted_at is not None:
+            return None
+        return quiz
 
+    # If the given quiz ID is 0, create new quiz
+    values = {Quiz.name.name: quiz_data['name']}
+    quiz = _insert_row(session, Quiz, values)
 
-def _save_question_row(session: Session, question_data: Dict[str, Any],
-                       quiz_id: int) -> int:
-    """Save question row and return question ID dictionary."""
-    # Extract data from dictionary
-    question_number = question_data['question_number']
-    text = question_data['text']
+    # Flush to get the quiz ID without committing
+    session.flush()
+    return quiz
 
-    # Check if question number index already has a question
-    exist_filters = {
-        QuizQuestion.quiz_id.name: quiz_id,
-        QuizQuestion.question_number.name: question_number
-    }
-    question = _row_exist(session, QuizQuestion, exist_filters)
 
-    # Add new SQL row if the question number does not exist
+def _get_next_revision(updated_at: Optional[datetime]) -> datetime:
+    """Get the updated date of a changed quiz, which is always later than
+    the previous updated date so every change is a new revision.
+    """
+    now = datetime.utcnow()
+    if updated_at is not None and now <= updated_at:
+        return updated_at + timedelta(microseconds=1)
+    return now
+
+
+def _load_saved_questions(session: Session, quiz_id: int,
+                          question_number_list: Optional[List[int]] = None
+                          ) -> Dict[int, Dict[str, Any]]:
+    """Load all questions and options of a quiz, or only the questions with
+    the given numbers, with a single query.
+
+    Returns:
+        Dict[int, Dict[str, Any]]: Questions keyed by question number with
+            their options keyed by option number.
+    """
+    query = (
+        session.query(
+            QuizQuestion.question_id,
+            QuizQuestion.question_number,
+            QuizQuestion.text.label('question_text'),
+            QuizOption.option_id,
+            QuizOption.option_number,
+            QuizOption.text.label('option_text'),
+            QuizOption.correct_answer
+        )
+        .outerjoin(QuizOption,
+                   QuizOption.question_id == QuizQuestion.question_id)
+        .filter(QuizQuestion.quiz_id == quiz_id)
+    )
+    if question_number_list is not None:
+        query = query.filter(
+            QuizQuestion.question_number.in_(question_number_list))
+
+    saved_question_dict = {}
+    for row in query.all():
+        question = saved_question_dict.setdefault(row.question_number, {
+            'question_id': row.question_id,
+            'text': row.question_text,
+            'options': {}
+        })
+        # Questions without options have a row with empty option columns
+        if row.option_id is not None:
+            question['options'][row.option_number] = {
+                'option_id': row.option_id,
+                'text': row.option_text,
+                'correct_answer': row.correct_answer
+            }
+    return saved_question_dict
+
+
+def _save_question_rows(session: Session, quiz_id: int,
+                        saved_question_dict: Dict[int, Dict[str, Any]],
+                        question_data_list: List[Dict[str, Any]]) -> bool:
+    """Insert, update and delete question and option rows so the saved quiz
+    matches the question data list, using one bulk statement per change type.
+
+    Questions found in the question data are popped from the saved question
+    dictionary, which is left with the removed questions.
+
+    Returns:
+        bool: True if any question or option row changed.
+    """
+    question_insert_list = []
+    question_update_list = []
+    option_insert_list = []
+    option_update_list = []
+    option_delete_list = []
+
+    # Options of new questions are inserted after their question ID is known
+    new_option_data_dict = {}
+
+    for question_data in question_data_list:
+        question_number = question_data['question_number']
+        text = question_data['text']
+        option_data_list = question_data['quiz_option_data']
+        saved_question = saved_question_dict.pop(question_number, None)
+
+        if saved_question is None:
+            # Add new question
+            question_insert_list.append({
+                QuizQuestion.quiz_id.name: quiz_id,
+                QuizQuestion.question_number.name: question_number,
+                QuizQuestion.text.name: text
+            })
+            new_option_data_dict[question_number] = option_data_list
+            continue
+
+        question_id = saved_question['question_id']
+        if saved_question['text'] != text:
+            # Update quiz question text
+            question_update_list.append({
+                QuizQuestion.question_id.name: question_id,
+                QuizQuestion.text.name: text
+            })
+
+        saved_option_dict = saved_question['options']
+        for option_data in option_data_list:
+            option_number = option_data['option_number']
+            values = {
+                QuizOption.text.name: option_data['text'],
+                QuizOption.correct_answer.name: option_data['correct_answer']
+            }
+            saved_option = saved_option_dict.pop(option_number, None)
+
+            if saved_option is None:
+                # Add new option
+                values[QuizOption.question_id.name] = question_id
+                values[QuizOption.option_number.name] = option_number
+                option_insert_list.append(values)
+            elif any(saved_option[key] != value
+                     for key, value in values.items()):
+                # Update quiz option text and answer
+                values[QuizOption.option_id.name] = saved_option['option_id']
+                option_update_list.append(values)
+
+        # Saved options missing from the option data are removed
+        option_delete_list.extend(
+            option['option_id'] for option in saved_option_dict.values())
+
+    # Saved questions missing from the question data are removed along with
+    # their options
+    question_delete_list = []
+    for saved_question in saved_question_dict.values():
+        question_delete_list.append(saved_question['question_id'])
+        saved_option_dict = saved_question['options']
+        option_delete_list.extend(
+            option['option_id'] for option in saved_option_dict.values())
+
+    # Delete rows first so removed numbers are free before inserting
+    if option_delete_list:
+        session.execute(
+            delete(QuizOption)
+            .where(QuizOption.option_id.in_(option_delete_list))
+        )
+    if question_delete_list:
+        session.execute(
+            delete(QuizQuestion)
+            .where(QuizQuestion.question_id.in_(question_delete_list))
+        )
+
+    # Bulk update rows by primary key
+    if question_update_list:
+        session.execute(update(QuizQuestion), question_update_list)
+    if option_update_list:
+        session.execute(update(QuizOption), option_update_list)
+
+    # Bulk insert new questions and get their generated question IDs
+    if question_insert_list:
+        inserted_rows = session.execute(
+            insert(QuizQuestion).returning(QuizQuestion.question_id,
+                                           QuizQuestion.question_number),
+            question_insert_list
+        )
+        for question_id, question_number in inserted_rows:
+            for option_data in new_option_data_dict[question_number]:
+                option_insert_list.append({
+                    QuizOption.question_id.name: question_id,
+                    QuizOption.option_number.name:
+                        option_data['option_number'],
+                    QuizOption.text.name: option_data['text'],
+                    QuizOption.correct_answer.name:
+                        option_data['correct_answer']
+                })
+
+    # Bulk insert new options
+    if option_insert_list:
+        session.execute(insert(QuizOption), option_insert_list)
+
+    return any([question_insert_list, question_update_list,
+                question_delete_list, option_insert_list, option_update_list,
+                option_delete_list])
+
+
+def _validate_field(data: Dict[str, Any], key: str, value_type: type,
+                    name: str) -> None:
+    """Check the dictionary has a value of the given type for the key."""
+    value = data.get(key)
+    # Booleans are integers in Python but not valid numbers
+    if not isinstance(value, value_type) or (
+            value_type is int and isinstance(value, bool)):
+        raise ValueError(f'Each {name} requires "{key}" of type '
+                         f'{value_type.__name__}')
+
+
+def _validate_numbered_list(data: Dict[str, Any], key: str, number_key: str,
+                            name: str, item_name: str) -> None:
+    """Check the dictionary has a list of dictionaries with unique numbers."""
+    data_list = data.get(key)
+    if not isinstance(data_list, list) or not all(
+            isinstance(item, dict) for item in data_list):
+        raise ValueError(f'Each {name} requires "{key}" of type list')
+    for item in data_list:
+        _validate_field(item, number_key, int, item_name)
+    number_list = [item[number_key] for item in data_list]
+    if len(set(number_list)) != len(number_list):
+        raise ValueError(f'Each {name} requires unique "{number_key}"')
+
+
+def _check_patch_operation(operation: Any) -> None:
+    """Check a patch operation has a known type and valid fields."""
+    if not isinstance(operation, dict) \
+            or operation.get('op') not in PATCH_OPERATIONS:
+        operations = ', '.join(PATCH_OPERATIONS)
+        raise ValueError(f'op needs to be one of {operations}')
+    op = operation['op']
+    missing_list = [field for field in PATCH_OPERATIONS[op]
+                    if field not in operation]
+    if missing_list:
+        raise ValueError(f'{op} requires {", ".join(missing_list)}')
+    for field in ('question_number', 'option_number'):
+        if field in operation and (
+                not isinstance(operation[field], int)
+                or isinstance(operation[field], bool)):
+            raise ValueError(f'{field} needs to be an integer')
+    for field in ('name', 'text'):
+        if field in operation and not isinstance(operation[field], str):
+            raise ValueError(f'{field} needs to be a string')
+    if 'correct_answer' in operation \
+            and not isinstance(operation['correct_answer'], bool):
+        raise ValueError('correct_answer needs to be a boolean')
+    if op == 'update_option' and 'text' not in operation \
+            and 'correct_answer' not in operation:
+        raise ValueError('update_option requires text or correct_answer')
+
+
+def _apply_patch_operation(question_dict: Dict[int, Dict[str, Any]],
+                           operation: Dict[str, Any]) -> None:
+    """Apply a question or option operation to loaded questions."""
+    op = operation['op']
+    question_number = operation['question_number']
+    question = question_dict.get(question_number)
     if question is None:
-        # Add new question
-        values = {
-            QuizQuestion.quiz_id.name: quiz_id,
-            QuizQuestion.question_number.name: question_number,
-            QuizQuestion.text.name: text
+        raise ValueError(f'Question {question_number} does not exist')
+    if op == 'update_question':
+        question['text'] = operation['text']
+        return
+
+    option_dict = question['options']
+    option_number = operation['option_number']
+    if op == 'add_option':
+        if option_number in option_dict:
+            raise ValueError(f'Option {option_number} of question '
+                             f'{question_number} already exists')
+        option_dict[option_number] = {
+            'option_id': None,
+            'text': operation['text'],
+            'correct_answer': operation['correct_answer']
         }
-        question = _insert_row(session, QuizQuestion, values)
-    else:
-        # Update quiz question for given quiz ID
-        filters = {
-            QuizQuestion.quiz_id.name: quiz_id,
-            QuizQuestion.question_number.name: question_number
-        }
-        values = {QuizQuestion.text.name: text}
-        _update_row(session, QuizQuestion, filters, values)
-
-    # Commit and get question ID
-    session.commit()
-    question_id = question.question_id
-    return question_id
-
-
-def _save_option_rows(session: Session, option_data: Dict[str, Any],
-                      question_id: int) -> None:
-    """Save option row."""
-    # Extract data from dictionary
-    option_number = option_data['option_number']
-    text = option_data['text']
-    correct_answer = option_data['correct_answer']
-
-    # Check if question number index already has a question
-    filters = {
-        QuizOption.question_id.name: question_id,
-        QuizOption.option_number.name: option_number
-    }
-    option = _row_exist(session, QuizOption, filters)
+        return
 
-    # Add new SQL row if the option number does not exist
+    option = option_dict.get(option_number)
     if option is None:
-        # Add new option
-        values = {
-            QuizOption.question_id.name: question_id,
-            QuizOption.option_number.name: option_number,
-            QuizOption.text.name: text,
-            QuizOption.correct_answer.name: correct_answer
-        }
-        option = _insert_row(session, QuizOption, values)
+        raise ValueError(f'Option {option_number} of question '
+                         f'{question_number} does not exist')
+    if op == 'remove_option':
+        del option_dict[option_number]
     else:
-        # Update quiz question for given quiz ID
-        filters = {
-            QuizOption.question_id.name: question_id,
-            QuizOption.option_number.name: option_number,
-            QuizOption.correct_answer.name: correct_answer
-        }
-        values = {QuizOption.text.name: text}
-        _update_row(session, QuizOption, filters, values)
+        for field in ('text', 'correct_answer'):
+            if field in operation:
+                option[field] = operation[field]
 
-    # Commit and get question ID
-    session.commit()
-    question_id = option.question_id
-    return question_id
 
+def _patch_question_rows(session: Session,
+                         saved_question_dict: Dict[int, Dict[str, Any]],
+                         patched_question_dict: Dict[int, Dict[str, Any]]
+                         ) -> Tuple[bool, bool]:
+    """Write the differences between loaded and patched questions with one
+    bulk statement per change type.
 
-def _get_max_quiz_number_threshold(data_list: Dict[str, Any], index_key: str
-                                   ) -> int:
-    """Get highest index number of given data list."""
-    threshold = 0
-    if data_list != []:
-        threshold = data_list[-1][index_key]
+    Returns:
+        Tuple[bool, bool]: If any searchable text changed and if any answer
+            changed, answers changing alone leave the search index as is.
+    """
+    question_update_list = []
+    option_insert_list = []
+    option_update_list = []
+    option_delete_list = []
+    text_changed = False
+    answers_changed = False
+
+    for question_number, patched_question in patched_question_dict.items():
+        saved_question = saved_question_dict[question_number]
+        question_id = saved_question['question_id']
+        if patched_question['text'] != saved_question['text']:
+            question_update_list.append({
+                QuizQuestion.question_id.name: question_id,
+                QuizQuestion.text.name: patched_question['text']
+            })
+
+        saved_option_dict = saved_question['options']
+        patched_option_dict = patched_question['options']
+        for option_number, saved_option in saved_option_dict.items():
+            if option_number not in patched_option_dict:
+                option_delete_list.append(saved_option['option_id'])
+                answers_changed |= saved_option['correct_answer']
+        for option_number, option in patched_option_dict.items():
+            values = {
+                QuizOption.text.name: option['text'],
+                QuizOption.correct_answer.name: option['correct_answer']
+            }
+            saved_option = saved_option_dict.get(option_number)
+            if saved_option is None:
+                values[QuizOption.question_id.name] = question_id
+                values[QuizOption.option_number.name] = option_number
+                option_insert_list.append(values)
+                answers_changed |= option['correct_answer']
+            elif any(saved_option[key] != value
+                     for key, value in values.items()):
+                values[QuizOption.option_id.name] = saved_option['option_id']
+                option_update_list.append(values)
+                answers_changed |= \
+                    saved_option['correct_answer'] != option['correct_answer']
+                text_changed |= saved_option['text'] != option['text']
+
+    # Added and removed options change the searchable text of the quiz
+    text_changed |= bool(question_update_list or option_insert_list
+                         or option_delete_list)
+
+    # Delete rows first so removed numbers are free before inserting
+    if option_delete_list:
+        session.execute(
+            delete(QuizOption)
+            .where(QuizOption.option_id.in_(option_delete_list))
+        )
+    if question_update_list:
+        session.execute(update(QuizQuestion), question_update_list)
+    if option_update_list:
+        session.execute(update(QuizOption), option_update_list)
+    if option_insert_list:
+        session.execute(insert(QuizOption), option_insert_list)
 
-    return threshold
+    return text_changed, answers_changed
 
 
-def _delete_rest_of_rows(session: Session, table: DefaultMeta,
-                         foreign_key_name: str, foreign_key_value: int,
-                         index_column_name: str, threshold: int) -> None:
-    """Delete rows with custom index number above an integer threshold."""
+def _compare_selections(user_selection_list: List[int],
+                        answer_list: Sequence[int]) -> List[bool]:
+    """Compare selections with answers in one pass, stopping at the shorter
+    list.
+    """
+    return list(map(operator.eq, user_selection_list, answer_list))
 
-    condition = and_(
-        getattr(table, foreign_key_name) == foreign_key_value,
-        getattr(table, index_column_name) > threshold
-    )
-    # Filter by condition and delete
-    session.query(table).filter(condition).delete()
 
-    # Commit session
-    session.commit()
+def _get_quiz_answers(quiz_id: int) -> List[int]:
+    """Get list of option numbers that are the correct answers of the quiz.
 
+    Answer keys are cached by quiz ID until the quiz is saved or deleted.
+    """
+    quiz_id = int(quiz_id)
+    return list(_get_quiz_answers_bulk([quiz_id])[quiz_id])
 
-def _get_quiz_answers(quiz_id: int) -> List[int]:
-    """Get list of option numbers that are the correct answers of the quiz."""
-    answers = []  # Default return value if error occurs
-    with _get_session(False, False) as session:
-        query = (
-            session.query(QuizOption.option_number)
-            .join(QuizQuestion,
-                  QuizOption.question_id == QuizQuestion.question_id)
-            .join(Quiz, QuizQuestion.quiz_id == Quiz.quiz_id)
-            .filter(
-                Quiz.quiz_id == quiz_id,
-                QuizOption.correct_answer.is_(True)
-            )
-        )
 
-        answers = [result.option_number for result in query.all()]
+def _get_quiz_answers_bulk(quiz_id_list: List[int]
+                           ) -> Dict[int, Sequence[int]]:
+    """Get the correct option numbers of each quiz in question order.
+
+    Cached answer keys are used where possible and the rest are read with a
+    single query and added to the cache.
+    """
+    answer_dict = {}
+    missing_quiz_id_set = set()
+    for quiz_id in set(quiz_id_list):
+        cached_answers = _answer_key_cache.get(quiz_id)
+        if cached_answers is None:
+            missing_quiz_id_set.add(quiz_id)
+        else:
+            answer_dict[quiz_id] = cached_answers
+    if not missing_quiz_id_set:
+        return answer_dict
 
-    return answers
+    # Remember the cache generation before reading from the database
+    generation = _answer_key_cache.generation
+    query_result = None
+    with _get_session(False, False) as session:
+        query_result = session.execute(
+            _QUIZ_ANSWERS_STATEMENT,
+            {'quiz_id_list': sorted(missing_quiz_id_set)}
+        ).all()
+
+    if query_result is None:
+        # Return empty answer keys without caching if error occurs
+        for quiz_id in missing_quiz_id_set:
+            answer_dict[quiz_id] = ()
+        return answer_dict
+
+    # Group answers by quiz, quizzes without answers have an empty key
+    missing_answer_dict = {quiz_id: [] for quiz_id in missing_quiz_id_set}
+    for row in query_result:
+        missing_answer_dict[row.quiz_id].append(row.option_number)
+    for quiz_id, answer_list in missing_answer_dict.items():
+        answers = tuple(answer_list)
+        _answer_key_cache.set(quiz_id, answers, generation)
+        answer_dict[quiz_id] = answers
+    return answer_dict
@@ -0,0 +1,179 @@
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+from typing import Any, Callable, List, Optional
+import atexit
+import logging
+import os
+import time
+from flask import Flask
+import app.metrics as metrics
+
+# Name of the attempt queue in the application extensions and metrics
+ATTEMPT_QUEUE = 'attempts'
+
+
+class WriteBehindQueue:
+    """Bounded queue of writes flushed in batches by a background thread.
+
+    Items are handed to the flush function in one call per batch, so the
+    function can coalesce them into one transaction. The queue is flushed
+    every 'flush_interval' seconds and as soon as 'batch_size' items wait.
+
+    The thread starts on the first put of every process, so a queue created
+    before a server forks its workers gets one thread per worker.
+    """
+
+    def __init__(self, app: Flask, name: str,
+                 flush_function: Callable[[List[Any]], Any],
+                 max_size: int, batch_size: int, flush_interval: float,
+                 put_timeout: float) -> None:
+        """Create write behind queue.
+
+        Parameters:
+            - app (Flask): Flask app whose context the flush runs in.
+            - name (str): Queue name used in the metrics.
+            - flush_function (Callable[[List[Any]], Any]): Function writing
+                a batch of items.
+            - max_size (int): Maximum number of waiting items.
+            - batch_size (int): Maximum number of items written at once.
+            - flush_interval (float): Seconds between flushes of the
+                background thread.
+            - put_timeout (float): Seconds a put waits for space in a full
+                queue.
+        """
+        self._app = app
+        self.name = name
+        self._flush_function = flush_function
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._start_lock = Lock()
+        self._reset()
+        atexit.register(self.stop)
+
+    def _reset(self) -> None:
+        """Create the queue and thread state of the current process."""
+        self._queue = Queue(self.max_size)
+        self._stop_event = Event()
+        self._flush_event = Event()
+        self._thread: Optional[Thread] = None
+        self._pid = os.getpid()
+
+    def put(self, item_list: List[Any]) -> List[Any]:
+        """Add items to the queue.
+
+        A full queue makes the caller wait up to 'put_timeout' seconds for
+        space, which slows producers down to the speed of the writes.
+
+        Returns:
+            List[Any]: Items not queued because the queue stayed full or is
+                stopped, the caller needs to write them itself.
+        """
+        if not self._ensure_started():
+            return list(item_list)
+        for index, item in enumerate(item_list):
+            try:
+                self._queue.put(item, timeout=self.put_timeout)
+            except Full:
+                metrics.WRITE_BEHIND_FULL_TOTAL.inc((self.name,))
+                self._update_depth()
+                return list(item_list[index:])
+        self._update_depth()
+        if self._queue.qsize() >= self.batch_size:
+            self._flush_event.set()
+        return []
+
+    def flush(self) -> int:
+        """Write every waiting item in the calling thread.
+
+        Returns:
+            int: Number of items taken from the queue.
+        """
+        count = 0
+        while True:
+            batch = self._get_batch()
+            if not batch:
+                return count
+            self._write(batch)
+            count += len(batch)
+
+    def stop(self) -> None:
+        """Stop the background thread and write every waiting item."""
+        if self._pid != os.getpid():
+            return
+        self._stop_event.set()
+        self._flush_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def depth(self) -> int:
+        """Get the number of waiting items."""
+        return self._queue.qsize()
+
+    def _ensure_started(self) -> bool:
+        """Start the background thread of the current process if needed.
+
+        Returns:
+            bool: False if the queue is stopped.
+        """
+        if self._pid != os.getpid():
+            # The thread of the parent process does not exist after a fork
+            with self._start_lock:
+                if self._pid != os.getpid():
+                    self._reset()
+        if self._stop_event.is_set():
+            return False
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = Thread(
+                        target=self._run, name=f'write-behind-{self.name}',
+                        daemon=True)
+                    self._thread.start()
+        return True
+
+    def _run(self) -> None:
+        """Flush the queue on every interval or full batch until the queue
+        is stopped.
+        """
+        while not self._stop_event.is_set():
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            self.flush()
+
+    def _get_batch(self) -> List[Any]:
+        """Take up to 'batch_size' waiting items without blocking."""
+        batch = []
+        try:
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except Empty:
+            pass
+        if batch:
+            self._update_depth()
+        return batch
+
+    def _write(self, batch: List[Any]) -> None:
+        """Write a batch in an application context and record the outcome.
+
+        Failed batches are logged and dropped so one bad batch does not block
+        the queue.
+        """
+        start_time = time.perf_counter()
+        try:
+            with self._app.app_context():
+                self._flush_function(batch)
+            outcome = 'written'
+        except Exception as e:
+            logging.critical(f'Error: {str(e)}')
+            outcome = 'failed'
+        metrics.WRITE_BEHIND_FLUSH_DURATION.observe(
+            (self.name,), time.perf_counter() - start_time)
+        metrics.WRITE_BEHIND_ITEMS_TOTAL.inc((self.name, outcome), len(batch))
+
+    def _update_depth(self) -> None:
+        """Record the number of waiting items."""
+        metrics.WRITE_BEHIND_DEPTH.set((self.name,), self._queue.qsize())
@@ -0,0 +1,332 @@
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import create_app, db, Quiz, QuizOption, QuizQuestion  # Noqa: E402
+from app import quiz_snapshot, setup_test_db, sql_functions  # Noqa: E402
+from config import Config  # Noqa: E402
+
+# Database sizes benchmarked by default as quizzes, questions per quiz and
+# options per question
+DEFAULT_SIZES = ['100x10x4', '10000x10x4']
+
+# Version of the result format, changed when fields are renamed or removed
+RESULT_FORMAT_VERSION = 1
+
+
+# ------------------------------
+# Benchmark cases
+# ------------------------------
+
+def _bench_select_full_quiz(context: Dict[str, Any]) -> Callable[[], Any]:
+    """Read a random quiz with its questions and options."""
+    return lambda: sql_functions.select_full_quiz(_random_quiz_id(context))
+
+
+def _bench_save_quiz(context: Dict[str, Any]) -> Callable[[], Any]:
+    """Save a random quiz with a changed name and option."""
+    def save() -> None:
+        quiz_id = _random_quiz_id(context)
+        data = _to_save_data(sql_functions.select_full_quiz_nested(quiz_id))
+        data['quiz_data']['name'] = f'Saved {context["random"].random()}'[:20]
+        option_data = data['quiz_data']['quiz_question_data'][0][
+            'quiz_option_data'][0]
+        option_data['text'] = f'{context["random"].random()}'[:20]
+        sql_functions.save_quiz(data)
+    return save
+
+
+def _bench_get_quiz_list(context: Dict[str, Any]) -> Callable[[], Any]:
+    """List the first quizzes as the quiz list route does."""
+    return lambda: sql_functions.get_quiz_list('50')
+
+
+def _bench_evaluate_quiz(context: Dict[str, Any]) -> Callable[[], Any]:
+    """Grade a random submission with answer keys read from the database."""
+    def evaluate() -> None:
+        sql_functions.clear_answer_key_cache()
+        sql_functions.evaluate_quiz(_random_quiz_id(context),
+                                    context['selections'])
+    return evaluate
+
+
+def _bench_evaluate_quiz_cached(context: Dict[str, Any]
+                                ) -> Callable[[], Any]:
+    """Grade a submission of the same quiz with a cached answer key."""
+    quiz_id = _random_quiz_id(context)
+    return lambda: sql_functions.evaluate_quiz(quiz_id, context['selections'])
+
+
+def _bench_select_full_quiz_legacy(context: Dict[str, Any]
+                                   ) -> Callable[[], Any]:
+    """Read a random quiz with an ORM query built on every call, as the
+    full quiz read did before using a prebuilt statement.
+    """
+    def select() -> None:
+        (
+            db.session.query(
+                Quiz.quiz_id, Quiz.name, Quiz.created_at, Quiz.updated_at,
+                QuizQuestion.question_id, QuizQuestion.question_number,
+                QuizQuestion.text.label('question_text'),
+                QuizOption.option_id, QuizOption.option_number,
+                QuizOption.text.label('option_text'),
+                QuizOption.correct_answer
+            )
+            .join(QuizQuestion, QuizQuestion.quiz_id == Quiz.quiz_id)
+            .join(QuizOption,
+                  QuizOption.question_id == QuizQuestion.question_id)
+            .filter(Quiz.quiz_id == _random_quiz_id(context))
+            .all()
+        )
+    return select
+
+
+def _bench_quiz_answers_legacy(context: Dict[str, Any]) -> Callable[[], Any]:
+    """Read the answer key of a random quiz with an ORM query built on every
+    call, as grading did before using a prebuilt statement.
+    """
+    def select() -> None:
+        (
+            db.session.query(QuizQuestion.quiz_id, QuizOption.option_number)
+            .join(QuizQuestion,
+                  QuizOption.question_id == QuizQuestion.question_id)
+            .join(Quiz, QuizQuestion.quiz_id == Quiz.quiz_id)
+            .filter(
+                Quiz.quiz_id.in_({_random_quiz_id(context)}),
+                QuizOption.correct_answer == True  # noqa: E712
+            )
+            .order_by(QuizQuestion.quiz_id, QuizQuestion.question_number,
+                      QuizOption.option_number)
+            .all()
+        )
+    return select
+
+
+def _bench_get_quiz_snapshot(context: Dict[str, Any]) -> Callable[[], Any]:
+    """Read the stored full quiz response of a random quiz, after rendering
+    the snapshots of every generated quiz.
+    """
+    quiz_id_list = list(range(1, context['quiz_count'] + 1))
+    for start in range(0, len(quiz_id_list), 1000):
+        quiz_snapshot.refresh_snapshots(
+            db.session, quiz_id_list[start:start + 1000])
+    db.session.commit()
+    return lambda: sql_functions.get_quiz_snapshot(
+        _random_quiz_id(context), 'flat')
+
+
+def _bench_fetch_table_data(context: Dict[str, Any]) -> Callable[[], Any]:
+    """Read every row of the quiz table."""
+    return lambda: sql_functions.fetch_table_data(Quiz)
+
+
+BENCHMARKS: Dict[str, Callable[[Dict[str, Any]], Callable[[], Any]]] = {
+    'select_full_quiz': _bench_select_full_quiz,
+    'select_full_quiz_legacy': _bench_select_full_quiz_legacy,
+    'get_quiz_snapshot': _bench_get_quiz_snapshot,
+    'save_quiz': _bench_save_quiz,
+    'get_quiz_list': _bench_get_quiz_list,
+    'evaluate_quiz': _bench_evaluate_quiz,
+    'evaluate_quiz_cached': _bench_evaluate_quiz_cached,
+    'quiz_answers_legacy': _bench_quiz_answers_legacy,
+    'fetch_table_data': _bench_fetch_table_data,
+}
+
+
+# ------------------------------
+# Benchmark methods
+# ------------------------------
+
+def run_size(size: str, repeat: int, seed: int,
+             benchmark_names: List[str]) -> Dict[str, Any]:
+    """Generate a database of the given size and time every benchmark.
+
+    Parameters:
+        - size (str): Database size as quizzes x questions x options.
+        - repeat (int): Number of timed calls of every benchmark.
+        - seed (int): Seed of the generated data and the random quiz IDs.
+        - benchmark_names (List[str]): Names of the benchmarks to run.
+
+    Returns:
+        Dict[str, Any]: Size, generation time and timings by benchmark.
+    """
+    quiz_count, question_count, option_count = _parse_size(size)
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = os.path.join(directory, 'benchmark.db')
+        app = create_app(f'sqlite:///{database_path}', False,
+                         Config.SQLALCHEMY_ENGINE_OPTIONS,
+                         Config.SQLITE_PRAGMAS)
+        with app.app_context():
+            start_time = time.perf_counter()
+            row_counts = setup_test_db.insert_generated_data(
+                db, quiz_count, question_count, option_count, seed)
+            generate_seconds = time.perf_counter() - start_time
+
+            context = {
+                'random': random.Random(seed),
+                'quiz_count': quiz_count,
+                'selections': [1] * question_count
+            }
+            result_dict = {}
+            for name in benchmark_names:
+                function = BENCHMARKS[name](context)
+                function()  # Warm up statement caches and the page cache
+                result_dict[name] = _time_function(function, repeat)
+            db.engine.dispose()
+
+    return {
+        'size': size,
+        'rows': row_counts,
+        'generate_seconds': round(generate_seconds, 3),
+        'benchmarks': result_dict
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]
+                    ) -> List[str]:
+    """Get one line per benchmark with the change of its median time."""
+    baseline_dict = {
+        (size_result['size'], name): timing['median_ms']
+        for size_result in baseline['results']
+        for name, timing in size_result['benchmarks'].items()
+    }
+    line_list = []
+    for size_result in current['results']:
+        for name, timing in size_result['benchmarks'].items():
+            baseline_median = baseline_dict.get((size_result['size'], name))
+            if not baseline_median:
+                continue
+            change = timing['median_ms'] / baseline_median - 1
+            line_list.append(
+                f'{size_result["size"]:>14} {name:<22} '
+                f'{baseline_median:>10.3f} ms -> '
+                f'{timing["median_ms"]:>10.3f} ms ({change:+.1%})')
+    return line_list
+
+
+def _time_function(function: Callable[[], Any], repeat: int
+                   ) -> Dict[str, float]:
+    """Call function repeatedly and summarize the times in milliseconds."""
+    time_list = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        time_list.append((time.perf_counter() - start_time) * 1000)
+    time_list.sort()
+    return {
+        'repeat': repeat,
+        'min_ms': round(time_list[0], 4),
+        'median_ms': round(statistics.median(time_list), 4),
+        'mean_ms': round(statistics.fmean(time_list), 4),
+        'p95_ms': round(time_list[int(0.95 * (repeat - 1))], 4),
+        'max_ms': round(time_list[-1], 4)
+    }
+
+
+def _parse_size(size: str) -> List[int]:
+    """Parse size of the format quizzes x questions x options."""
+    try:
+        count_list = [int(count) for count in size.lower().split('x')]
+    except ValueError:
+        count_list = []
+    if len(count_list) != 3 or min(count_list) < 1:
+        raise argparse.ArgumentTypeError(
+            f'Size "{size}" is not of the format QUIZZESxQUESTIONSxOPTIONS')
+    return count_list
+
+
+def _random_quiz_id(context: Dict[str, Any]) -> int:
+    """Get a random ID of the generated quizzes."""
+    return context['random'].randint(1, context['quiz_count'])
+
+
+def _to_save_data(nested_quiz: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a nested quiz to the 'save_quiz' format."""
+    return {'quiz_data': {
+        'quiz_id': nested_quiz['quiz_id'],
+        'name': nested_quiz['name'],
+        'quiz_question_data': [
+            {
+                'question_number': question['question_number'],
+                'text': question['text'],
+                'quiz_option_data': [
+                    {
+                        'option_number': option['option_number'],
+                        'text': option['text'],
+                        'correct_answer': option['correct_answer']
+                    }
+                    for option in question['quiz_option_data']
+                ]
+            }
+            for question in nested_quiz['quiz_question_data']
+        ]
+    }}
+
+
+def main(argument_list: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Time Quizzer database functions on generated data.')
+    parser.add_argument(
+        '--size', action='append', type=str,
+        help='Database size as QUIZZESxQUESTIONSxOPTIONS, repeat to '
+             f'benchmark several sizes (default: {" ".join(DEFAULT_SIZES)}).')
+    parser.add_argument(
+        '--repeat', type=int, default=200,
+        help='Number of timed calls of every benchmark.')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='Seed of the generated data and random quiz IDs.')
+    parser.add_argument(
+        '--benchmark', action='append', choices=list(BENCHMARKS),
+        help='Benchmark to run, repeat to run several (default: all).')
+    parser.add_argument(
+        '--output', help='Write the JSON results to this file instead of '
+                         'standard output.')
+    parser.add_argument(
+        '--compare', help='JSON results of an earlier run to compare the '
+                          'median times with.')
+    args = parser.parse_args(argument_list)
+
+    size_list = args.size or DEFAULT_SIZES
+    for size in size_list:
+        _parse_size(size)
+    benchmark_names = args.benchmark or list(BENCHMARKS)
+
+    results = {
+        'format_version': RESULT_FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python_version': platform.python_version(),
+        'sqlite_version': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'results': [
+            run_size(size, args.repeat, args.seed, benchmark_names)
+            for size in size_list
+        ]
+    }
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        print('\n'.join(compare_results(baseline, results)), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,70 @@
+import os
+
+
 class Config:
     SQLALCHEMY_DATABASE_URI = 'sqlite:///quizzer.db'
     NEW_ENVIRONMENT = True
+
+    # Production server settings used by 'serve.py', overridden by the
+    # environment variables of the same name
+    SERVER_BIND = os.environ.get('SERVER_BIND', '127.0.0.1:8000')
+    SERVER_WORKERS = int(
+        os.environ.get('SERVER_WORKERS', min(os.cpu_count() or 1, 4)))
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 4))
+    SERVER_TIMEOUT = int(os.environ.get('SERVER_TIMEOUT', 30))
+
+    # Options passed to 'create_engine'
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': 10,
+        'max_overflow': 10,
+        'pool_timeout': 30,
+    }
+
+    # Graded attempts are queued and written in batches by a background
+    # thread of every worker instead of one transaction per submission
+    ATTEMPT_WRITE_BEHIND = {
+        # Submissions wait for space up to 'put_timeout' seconds when the
+        # queue is full and are written during the request after that
+        'max_size': 10000,
+        'batch_size': 500,
+        'flush_interval': 0.5,
+        'put_timeout': 1.0,
+    }
+
+    # Deleting quizzes only hides them, so deleting takes the same time for
+    # any quiz size. Compaction removes their rows later, run every
+    # 'interval' seconds by the master process of 'serve.py' or by
+    # 'python manage.py compact --interval' next to other servers.
+    SOFT_DELETE_QUIZZES = True
+
+    # Settings of the background compaction and 'python manage.py compact'
+    COMPACTION = {
+        # Seconds between background compactions
+        'interval': 3600.0,
+        # Number of soft deleted quizzes removed per transaction
+        'batch_size': 100,
+        # Seconds a quiz stays soft deleted before it is removed, so queued
+        # attempts of the quiz are written before its attempts are removed
+        'min_age': 60.0,
+    }
+
+    # Pragmas executed on every new SQLite connection of the pool
+    SQLITE_PRAGMAS = {
+        # Let compaction return free pages to the file system. Only applies
+        # to new database files, existing files need 'compact --vacuum'.
+        'auto_vacuum': 'INCREMENTAL',
+        # Readers keep reading the last commit while a writer commits
+        'journal_mode': 'WAL',
+        # Only sync the write ahead log at checkpoints, safe with WAL
+        'synchronous': 'NORMAL',
+        # Negative sizes are in KiB, 64 MiB page cache per connection
+        'cache_size': -64000,
+        # Read the database file through 256 MiB of memory mapping
+        'mmap_size': 268435456,
+        # Wait for the write lock in milliseconds instead of failing
+        'busy_timeout': 5000,
+        # Deleting quizzes removes their rows from every table with explicit
+        # set based deletes. Foreign keys stay unenforced so a queued attempt
+        # of a quiz deleted before the queue flushed does not fail its batch.
+        'foreign_keys': 'OFF',
+    }
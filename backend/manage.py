@@ -0,0 +1,158 @@
+from datetime import datetime
+import argparse
+import gzip
+import json
+import sys
+from threading import Event
+from typing import IO
+from flask import Flask
+from app import bulk_functions, compaction, create_app, db, setup_test_db
+from config import Config
+
+
+def _open_input(path: str) -> IO[bytes]:
+    """Open input file, standard input for '-', decompressing '.gz' files."""
+    if path == '-':
+        return sys.stdin.buffer
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def _create_app() -> Flask:
+    """Create app connected to the configured database without resetting it.
+    """
+    return create_app(Config.SQLALCHEMY_DATABASE_URI, False,
+                      Config.SQLALCHEMY_ENGINE_OPTIONS, Config.SQLITE_PRAGMAS)
+
+
+def import_command(args: argparse.Namespace) -> int:
+    """Import quizzes from a JSON lines file and print the import report."""
+    app = _create_app()
+    with app.app_context(), _open_input(args.path) as line_stream:
+        report = bulk_functions.import_quizzes(
+            line_stream, args.start_line, args.batch_size)
+    print(json.dumps(report, indent=4))
+    if not report['completed']:
+        print(f'Resume with: --start-line {report["next_line"]}',
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+def export_command(args: argparse.Namespace) -> int:
+    """Export quizzes to a JSON lines file, gzip compressed for '.gz' files.
+    """
+    app = _create_app()
+    with app.app_context():
+        line_generator = bulk_functions.export_quizzes(
+            args.quiz_id, args.updated_since)
+        if args.path == '-':
+            sys.stdout.writelines(line_generator)
+        elif args.path.endswith('.gz'):
+            with open(args.path, 'wb') as output_file:
+                output_file.writelines(
+                    bulk_functions.gzip_compress_stream(line_generator))
+        else:
+            with open(args.path, 'w') as output_file:
+                output_file.writelines(line_generator)
+    return 0
+
+
+def generate_command(args: argparse.Namespace) -> int:
+    """Add generated quizzes to the database and print the row counts."""
+    app = _create_app()
+    with app.app_context():
+        row_counts = setup_test_db.insert_generated_data(
+            db, args.quizzes, args.questions, args.options, args.seed)
+    print(json.dumps(row_counts, indent=4))
+    return 0
+
+
+def compact_command(args: argparse.Namespace) -> int:
+    """Purge soft deleted quizzes, reclaim free space and print the report,
+    then keep compacting every '--interval' seconds if given.
+    """
+    app = _create_app()
+    with app.app_context():
+        report = compaction.compact_database(
+            args.batch_size, args.min_age, args.max_batches, args.vacuum)
+    print(json.dumps(report, indent=4))
+    if args.interval is not None:
+        compaction.run_periodically(app, args.interval, Event(),
+                                    args.batch_size, args.min_age)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Quizzer management tasks.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser(
+        'import', help='Import quizzes from a JSON lines file.')
+    import_parser.add_argument(
+        'path', help='JSON lines file, optionally gzip compressed, or - for '
+                     'standard input.')
+    import_parser.add_argument(
+        '--start-line', type=int, default=0,
+        help='Number of lines to skip, used to resume a failed import.')
+    import_parser.add_argument(
+        '--batch-size', type=int, default=bulk_functions.IMPORT_BATCH_SIZE,
+        help='Number of quizzes inserted per transaction.')
+    import_parser.set_defaults(function=import_command)
+
+    export_parser = subparsers.add_parser(
+        'export', help='Export quizzes to a JSON lines file.')
+    export_parser.add_argument(
+        'path', help='Output file, gzip compressed if it ends with .gz, or - '
+                     'for standard output.')
+    export_parser.add_argument(
+        '--quiz-id', type=int, action='append',
+        help='Quiz ID to export, repeat to export several quizzes.')
+    export_parser.add_argument(
+        '--updated-since', type=datetime.fromisoformat,
+        help='Only export quizzes updated since this ISO 8601 date.')
+    export_parser.set_defaults(function=export_command)
+
+    generate_parser = subparsers.add_parser(
+        'generate', help='Add generated quizzes for testing at scale.')
+    generate_parser.add_argument(
+        '--quizzes', type=int, default=1000, help='Number of quizzes.')
+    generate_parser.add_argument(
+        '--questions', type=int, default=10,
+        help='Number of questions of every quiz.')
+    generate_parser.add_argument(
+        '--options', type=int, default=4,
+        help='Number of options of every question.')
+    generate_parser.add_argument(
+        '--seed', type=int, default=0,
+        help='Seed of the random names and correct answers.')
+    generate_parser.set_defaults(function=generate_command)
+
+    compact_parser = subparsers.add_parser(
+        'compact', help='Purge soft deleted quizzes and reclaim free space.')
+    compact_parser.add_argument(
+        '--batch-size', type=int, default=Config.COMPACTION['batch_size'],
+        help='Number of quizzes purged per transaction.')
+    compact_parser.add_argument(
+        '--min-age', type=float, default=Config.COMPACTION['min_age'],
+        help='Seconds a quiz stays soft deleted before it is purged.')
+    compact_parser.add_argument(
+        '--max-batches', type=int,
+        help='Stop after this many batches, run again to continue.')
+    compact_parser.add_argument(
+        '--vacuum', action='store_true',
+        help='Rebuild the whole database file, needed once to enable '
+             'incremental vacuum on an existing file.')
+    compact_parser.add_argument(
+        '--interval', type=float,
+        help='Keep running and compact again every this many seconds, for '
+             'servers other than serve.py.')
+    compact_parser.set_defaults(function=compact_command)
+
+    args = parser.parse_args()
+    return args.function(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
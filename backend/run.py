@@ -7,5 +7,7 @@ if __name__ == '__main__':
     database_url = Config.SQLALCHEMY_DATABASE_URI
     toggle_new_database = Config.NEW_ENVIRONMENT
     # Run the Flask backend application
-    app = create_app(database_url, toggle_new_database)
+    app = create_app(database_url, toggle_new_database,
+                     Config.SQLALCHEMY_ENGINE_OPTIONS, Config.SQLITE_PRAGMAS,
+                     Config.ATTEMPT_WRITE_BEHIND, Config.SOFT_DELETE_QUIZZES)
     app.run(debug=True)
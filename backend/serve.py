@@ -0,0 +1,107 @@
+from typing import Any, Dict
+import argparse
+import sys
+from flask import Flask
+from gunicorn.app.base import BaseApplication
+from gunicorn.arbiter import Arbiter
+from gunicorn.workers.base import Worker
+from app import compaction, db, write_behind
+from config import Config
+
+
+class QuizzerApplication(BaseApplication):
+    """Gunicorn application serving a Flask app with pre-forked workers.
+
+    The Flask app is created once in the master process before the workers
+    are forked, so database migrations run once per start.
+    """
+
+    def __init__(self, application: Flask, options: Dict[str, Any]) -> None:
+        """Create gunicorn application.
+
+        Parameters:
+            - application (Flask): Flask app to serve.
+            - options (Dict[str, Any]): Gunicorn settings by name.
+        """
+        self.application = application
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        """Apply the settings to the gunicorn configuration."""
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Flask:
+        """Get the WSGI application to serve."""
+        return self.application
+
+
+def post_fork(server: Arbiter, worker: Worker) -> None:
+    """Give the forked worker its own database connections.
+
+    Connections opened by the master process are shared with every forked
+    worker, so the worker drops them from its pool without closing them and
+    opens new connections on first use.
+    """
+    with worker.app.wsgi().app_context():
+        db.engine.dispose(close=False)
+
+
+def when_ready(server: Arbiter) -> None:
+    """Start compacting the database in the master process, so it runs
+    once per server instead of once per worker.
+    """
+    compaction.start_background_compaction(
+        server.app.wsgi(), **Config.COMPACTION)
+
+
+def worker_exit(server: Arbiter, worker: Worker) -> None:
+    """Write the queued attempts of the worker before it exits."""
+    queue = worker.app.wsgi().extensions.get(write_behind.ATTEMPT_QUEUE)
+    if queue is not None:
+        queue.stop()
+
+
+def get_options(bind: str, workers: int, threads: int, timeout: int
+                ) -> Dict[str, Any]:
+    """Get gunicorn settings serving with the given workers and threads."""
+    return {
+        'bind': bind,
+        'workers': workers,
+        # More than one thread switches gunicorn to the threaded worker
+        'threads': threads,
+        'timeout': timeout,
+        'preload_app': True,
+        'when_ready': when_ready,
+        'post_fork': post_fork,
+        'worker_exit': worker_exit,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Serve Quizzer with multiple worker processes.')
+    parser.add_argument(
+        '--bind', default=Config.SERVER_BIND,
+        help='Address and port to listen on.')
+    parser.add_argument(
+        '--workers', type=int, default=Config.SERVER_WORKERS,
+        help='Number of worker processes.')
+    parser.add_argument(
+        '--threads', type=int, default=Config.SERVER_THREADS,
+        help='Number of request threads per worker process.')
+    parser.add_argument(
+        '--timeout', type=int, default=Config.SERVER_TIMEOUT,
+        help='Seconds before a silent worker is restarted.')
+    args = parser.parse_args()
+
+    # Create the app in the master process only when serving
+    from wsgi import app
+    options = get_options(args.bind, args.workers, args.threads, args.timeout)
+    QuizzerApplication(app, options).run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
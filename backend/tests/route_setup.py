@@ -1,9 +1,12 @@
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Generator, List, Optional, Tuple
 import unittest
 import os
 import sys
 from flask_sqlalchemy.model import DefaultMeta
+from sqlalchemy import event
+from werkzeug.test import TestResponse
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from app import create_app, db, Quiz, QuizOption, QuizQuestion  # Noqa: E402
 
@@ -17,6 +20,38 @@ class RouteTestSetup(unittest.TestCase):
         self._app = create_app(database_url, False)
         self._client = self._app.test_client()
 
+    @contextmanager
+    def _count_queries(self) -> Generator[List[str], None, None]:
+        """Collect the SQL statements executed inside the context."""
+        statement_list = []
+
+        def before_cursor_execute(connection: Any, cursor: Any,
+                                  statement: str, *args: Any) -> None:
+            statement_list.append(statement)
+
+        with self._app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statement_list
+        finally:
+            event.remove(engine, 'before_cursor_execute',
+                         before_cursor_execute)
+
+    def _assert_query_budget(self, budget: int, method: str, route: str,
+                             **kwargs: Any) -> TestResponse:
+        """Send request and assert it executes at most 'budget' statements,
+        including statements executed while streaming the response body.
+        """
+        with self._count_queries() as statement_list:
+            response = self._client.open(route, method=method, **kwargs)
+            response.get_data()
+        self.assertLessEqual(
+            len(statement_list), budget,
+            f'{method} {route} executed {len(statement_list)} statements:\n'
+            + '\n'.join(statement_list))
+        return response
+
     def _insert_sample_data(
         self, Table: DefaultMeta, data: Dict[str, Any]
     ) -> None:
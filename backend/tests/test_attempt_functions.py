@@ -0,0 +1,195 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import (attempt_functions, leaderboard_functions,  # Noqa: E402
+                 sql_functions, Quiz, QuizAttempt, QuizQuestion, QuizOption)
+from tests.route_setup import RouteTestSetup  # Noqa: E402
+
+
+class TestRecordAttempts(RouteTestSetup):
+
+    def setUp(self) -> None:
+        """Setup database with quiz 1 of two questions and quiz 2 of one
+        question, each question with option 1 correct.
+        """
+        super().setUp()
+        for quiz_id in (1, 2):
+            self._insert_sample_data(Quiz, self._get_default_quiz_data(
+                {'quiz_id': quiz_id}))
+        for question_id, quiz_id, question_number in ((1, 1, 1), (2, 1, 2),
+                                                      (3, 2, 1)):
+            self._insert_sample_data(
+                QuizQuestion, self._get_default_question_data({
+                    'question_id': question_id, 'quiz_id': quiz_id,
+                    'question_number': question_number}))
+            self._insert_sample_data(
+                QuizOption, self._get_default_option_data(
+                    {'option_id': question_id, 'question_id': question_id}))
+
+    def test_record_attempts(self) -> None:
+        """Test attempts are saved and added to the counters."""
+        # Arrange
+        attempt_list = [
+            {'quiz_id': 1, 'selections': [2, 1], 'result': [True, False]},
+            {'quiz_id': 1, 'selections': [2, 3], 'result': [True, True]},
+            {'quiz_id': 2, 'selections': [1], 'result': [False]}
+        ]
+
+        # Act
+        with self._app.app_context():
+            recorded = attempt_functions.record_attempts(attempt_list)
+            attempt_list = QuizAttempt.query.all()
+            statistics = attempt_functions.get_quiz_statistics(1)
+
+        # Assert
+        self.assertEqual(recorded, 3)
+        self.assertEqual(
+            [(row.quiz_id, row.result, row.selections)
+             for row in attempt_list],
+            [(1, '10', '2,1'), (1, '11', '2,3'), (2, '0', '1')]
+        )
+        self.assertDictEqual(statistics, {
+            'quiz_id': 1,
+            'attempt_count': 2,
+            'correct_count': 3,
+            'answered_count': 4,
+            'questions': [
+                {'question_number': 1, 'answered_count': 2,
+                 'correct_count': 2, 'correct_rate': 1.0,
+                 'option_picks': {'2': 2}},
+                {'question_number': 2, 'answered_count': 2,
+                 'correct_count': 1, 'correct_rate': 0.5,
+                 'option_picks': {'1': 1, '3': 1}}
+            ]
+        })
+
+    def test_drop_attempts_of_deleted_quizzes(self) -> None:
+        """Test attempts written after their quiz was deleted, hard or soft,
+        are dropped without touching the statistics and leaderboards.
+        """
+        # Arrange
+        with self._app.app_context():
+            sql_functions.purge_quizzes([1])
+            sql_functions.tombstone_quizzes([2])
+
+        # Act
+        with self._app.app_context():
+            recorded = attempt_functions.record_attempts([
+                {'quiz_id': quiz_id, 'selections': [1], 'result': [True],
+                 'player': 'ann'}
+                for quiz_id in (1, 2)
+            ])
+            attempt_count = QuizAttempt.query.count()
+            statistics = attempt_functions.get_quiz_statistics(1)
+            leaderboard = leaderboard_functions.get_player_leaderboard(10)
+
+        # Assert
+        self.assertEqual((recorded, attempt_count), (0, 0))
+        self.assertEqual(statistics['attempt_count'], 0)
+        self.assertEqual(leaderboard['entries'], [])
+
+    def test_question_with_several_answers(self) -> None:
+        """Test a question with two correct options counts once and is
+        only correct if both options were selected.
+        """
+        # Arrange
+        self._insert_sample_data(QuizOption, self._get_default_option_data(
+            {'option_id': 4, 'option_number': 2}))
+
+        # Act
+        with self._app.app_context():
+            attempt_functions.record_attempts([
+                {'quiz_id': 1, 'selections': [1, 2, 1],
+                 'result': [True, True, True]},
+                {'quiz_id': 1, 'selections': [1, 3],
+                 'result': [True, False]}
+            ])
+            statistics = attempt_functions.get_quiz_statistics(1)
+
+        # Assert
+        self.assertEqual(
+            (statistics['correct_count'], statistics['answered_count']),
+            (4, 5))
+        self.assertEqual(
+            [(question['question_number'], question['answered_count'],
+              question['correct_count'], question['option_picks'])
+             for question in statistics['questions']],
+            [(1, 2, 1, {'1': 2, '2': 1, '3': 1}), (2, 1, 1, {'1': 1})])
+
+    def test_statistics_follow_question_number(self) -> None:
+        """Test counters stay with their question when an earlier question
+        is removed and are removed with their question.
+        """
+        # Arrange
+        with self._app.app_context():
+            attempt_functions.record_attempt(1, [1, 2], [True, False])
+        quiz_data = self._get_default_full_quiz_data()
+        question_data = quiz_data['quiz_data']['quiz_question_data'][0]
+        question_data['question_number'] = 2
+
+        # Act
+        with self._app.app_context():
+            sql_functions.save_quiz(quiz_data)
+            attempt_functions.record_attempt(1, [1], [True])
+            statistics = attempt_functions.get_quiz_statistics(1)
+            removed_statistics = attempt_functions.get_question_statistics(
+                1, 1)
+
+        # Assert
+        self.assertEqual(
+            [(question['question_number'], question['answered_count'],
+              question['correct_count'])
+             for question in statistics['questions']],
+            [(2, 2, 1)])
+        self.assertIsNone(removed_statistics)
+
+    def test_record_attempts_increments(self) -> None:
+        """Test attempts recorded separately add up."""
+        # Act
+        with self._app.app_context():
+            for correct in (True, False, False):
+                attempt_functions.record_attempt(1, [1], [correct])
+            statistics = attempt_functions.get_question_statistics(1, 1)
+
+        # Assert
+        self.assertDictEqual(statistics, {
+            'question_number': 1,
+            'answered_count': 3,
+            'correct_count': 1,
+            'correct_rate': 0.3333,
+            'option_picks': {'1': 3}
+        })
+
+    def test_record_attempt_without_answers(self) -> None:
+        """Test attempts of quizzes without answers are not saved and
+        invalid selections are not counted as picks.
+        """
+        # Act
+        with self._app.app_context():
+            empty_recorded = attempt_functions.record_attempt(1, [1], [])
+            recorded = attempt_functions.record_attempt(
+                1, ['1', True], [False, False])
+            statistics = attempt_functions.get_quiz_statistics(1)
+
+        # Assert
+        self.assertEqual(empty_recorded, 0)
+        self.assertEqual(recorded, 1)
+        self.assertEqual(statistics['attempt_count'], 1)
+        self.assertEqual(
+            [question['option_picks'] for question in statistics['questions']],
+            [{}, {}])
+
+    def test_statistics_without_attempts(self) -> None:
+        """Test statistics of a quiz that was never attempted."""
+        # Act
+        with self._app.app_context():
+            statistics = attempt_functions.get_quiz_statistics(1)
+            question_statistics = attempt_functions.get_question_statistics(
+                1, 1)
+
+        # Assert
+        self.assertDictEqual(statistics, {
+            'quiz_id': 1, 'attempt_count': 0, 'correct_count': 0,
+            'answered_count': 0, 'questions': []
+        })
+        self.assertIsNone(question_statistics)
@@ -0,0 +1,244 @@
+from datetime import datetime
+import gzip
+import json
+from typing import Any, Dict, List
+from unittest.mock import patch
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import bulk_functions, sql_functions, Quiz  # Noqa: E402
+from tests.route_setup import RouteTestSetup  # Noqa: E402
+
+
+class TestImportQuizzes(RouteTestSetup):
+    """Test import_quizzes."""
+
+    def _get_line_list(self, count: int) -> List[str]:
+        """Generate JSON lines of new quizzes named by their line number."""
+        line_list = []
+        for number in range(1, count + 1):
+            data = self._get_default_full_quiz_data()
+            data['quiz_data']['name'] = f'Test Quiz {number}'
+            del data['quiz_data']['created_at']
+            del data['quiz_data']['updated_at']
+            line_list.append(json.dumps(data))
+        return line_list
+
+    def _get_quiz_name_list(self) -> List[Dict[str, Any]]:
+        """Get names of all saved quizzes."""
+        with self._app.app_context():
+            quiz_list = sql_functions.get_quiz_list(0)
+        return [quiz['name'] for quiz in quiz_list]
+
+    def test_import_quizzes(self) -> None:
+        """Test importing quizzes over several batches."""
+        # Arrange
+        line_list = self._get_line_list(3)
+        line_list.insert(1, '')  # Blank lines are skipped
+
+        # Act
+        with self._app.app_context():
+            report = bulk_functions.import_quizzes(line_list, batch_size=2)
+            full_quiz = sql_functions.select_full_quiz_nested(3)
+
+        # Assert
+        self.assertEqual(report['imported'], 3)
+        self.assertEqual(report['next_line'], 4)
+        self.assertEqual(report['completed'], True)
+        self.assertIsNone(report['error'])
+        self.assertEqual(
+            self._get_quiz_name_list(),
+            ['Test Quiz 1', 'Test Quiz 2', 'Test Quiz 3']
+        )
+        self.assertEqual(full_quiz['name'], 'Test Quiz 3')
+        self.assertEqual(
+            full_quiz['quiz_question_data'][0]['quiz_option_data'][0]['text'],
+            'Test Option'
+        )
+
+    def test_import_quizzes_invalid_line(self) -> None:
+        """Test import stops at an invalid line and resumes after it is
+        fixed.
+        """
+        # Arrange
+        line_list = self._get_line_list(3)
+        valid_line = line_list[1]
+        line_list[1] = '{"quiz_data": {"name": 1}}'
+
+        # Act
+        with self._app.app_context():
+            report = bulk_functions.import_quizzes(line_list, batch_size=2)
+            line_list[1] = valid_line
+            resumed_report = bulk_functions.import_quizzes(
+                line_list, report['next_line'], batch_size=2)
+
+        # Assert
+        self.assertEqual(report['imported'], 1)
+        self.assertEqual(report['next_line'], 1)
+        self.assertEqual(report['completed'], False)
+        self.assertEqual(
+            report['error'], 'Line 2: Each quiz requires "name" of type str')
+        self.assertEqual(resumed_report['imported'], 2)
+        self.assertEqual(resumed_report['completed'], True)
+        self.assertEqual(
+            self._get_quiz_name_list(),
+            ['Test Quiz 1', 'Test Quiz 2', 'Test Quiz 3']
+        )
+
+    def test_import_quizzes_duplicate_number(self) -> None:
+        """Test a quiz with a repeated question number is rejected."""
+        # Arrange
+        data = self._get_default_full_quiz_data()
+        question_data_list = data['quiz_data']['quiz_question_data']
+        question_data_list.append(question_data_list[0])
+        line_list = [json.dumps(data, default=str)]
+
+        # Act
+        with self._app.app_context():
+            report = bulk_functions.import_quizzes(line_list)
+
+        # Assert
+        self.assertEqual(report['imported'], 0)
+        self.assertEqual(
+            report['error'],
+            'Line 1: Each quiz requires unique "question_number"'
+        )
+
+    def test_import_quizzes_failed_batch(self) -> None:
+        """Test a failed batch is not committed and is resumed from its first
+        line.
+        """
+        # Arrange
+        line_list = self._get_line_list(4)
+        insert_quiz_batch = bulk_functions._insert_quiz_batch
+        side_effect = [None, Exception('test_import_quizzes_failed_batch')]
+
+        def fail_second_batch(quiz_data_list: List[Dict[str, Any]]) -> None:
+            if side_effect.pop(0) is not None:
+                raise Exception('test_import_quizzes_failed_batch')
+            insert_quiz_batch(quiz_data_list)
+
+        # Act
+        with self._app.app_context(), patch(
+                'app.bulk_functions._insert_quiz_batch', fail_second_batch):
+            report = bulk_functions.import_quizzes(line_list, batch_size=2)
+
+        # Assert
+        self.assertEqual(report['imported'], 2)
+        self.assertEqual(report['next_line'], 2)
+        self.assertEqual(report['completed'], False)
+        self.assertEqual(
+            report['error'],
+            'Batch starting at line 3: test_import_quizzes_failed_batch'
+        )
+        self.assertEqual(self._get_quiz_name_list(),
+                         ['Test Quiz 1', 'Test Quiz 2'])
+
+
+class TestExportQuizzes(RouteTestSetup):
+    """Test export_quizzes."""
+
+    def _save_quizzes(self) -> None:
+        """Save a quiz with 2 questions and a quiz without questions."""
+        data = self._get_default_full_quiz_data()
+        data['quiz_data']['quiz_id'] = 0
+        question_data = self._get_default_question_data(
+            {'question_number': 2, 'text': 'Test Question 2'})
+        question_data['quiz_option_data'] = [
+            self._get_default_option_data({'correct_answer': False}),
+            self._get_default_option_data({'option_number': 2})
+        ]
+        data['quiz_data']['quiz_question_data'].append(question_data)
+        with self._app.app_context():
+            sql_functions.save_quiz(data)
+        self._insert_sample_data(Quiz, {
+            'name': 'Empty Quiz', 'updated_at': datetime(2022, 1, 1)})
+
+    def test_export_quizzes(self) -> None:
+        """Test exporting all quizzes in the 'save_quiz' format."""
+        # Arrange
+        self._save_quizzes()
+
+        # Act
+        with self._app.app_context():
+            line_list = list(bulk_functions.export_quizzes())
+
+        # Assert
+        self.assertEqual(len(line_list), 2)
+        self.assertTrue(all(line.endswith('\n') for line in line_list))
+        self.assertDictEqual(
+            json.loads(line_list[0]),
+            {'quiz_data': {
+                'quiz_id': 1,
+                'name': 'Test Quiz',
+                'quiz_question_data': [
+                    {
+                        'question_number': 1,
+                        'text': 'Test Question',
+                        'quiz_option_data': [
+                            {'option_number': 1, 'text': 'Test Option',
+                             'correct_answer': True}
+                        ]
+                    },
+                    {
+                        'question_number': 2,
+                        'text': 'Test Question 2',
+                        'quiz_option_data': [
+                            {'option_number': 1, 'text': 'Test Option',
+                             'correct_answer': False},
+                            {'option_number': 2, 'text': 'Test Option',
+                             'correct_answer': True}
+                        ]
+                    }
+                ]
+            }}
+        )
+        self.assertDictEqual(
+            json.loads(line_list[1]),
+            {'quiz_data': {'quiz_id': 2, 'name': 'Empty Quiz',
+                           'quiz_question_data': []}}
+        )
+
+    def test_export_quizzes_filtered(self) -> None:
+        """Test exporting quizzes filtered by ID and updated date."""
+        # Arrange
+        self._save_quizzes()
+
+        # Act
+        with self._app.app_context():
+            id_line_list = list(bulk_functions.export_quizzes([2]))
+            date_line_list = list(bulk_functions.export_quizzes(
+                updated_since=datetime(2023, 1, 1)))
+
+        # Assert
+        self.assertEqual(len(id_line_list), 1)
+        self.assertEqual(json.loads(id_line_list[0])['quiz_data']['name'],
+                         'Empty Quiz')
+        self.assertEqual(len(date_line_list), 1)
+        self.assertEqual(json.loads(date_line_list[0])['quiz_data']['name'],
+                         'Test Quiz')
+
+    def test_export_import_round_trip(self) -> None:
+        """Test a gzip compressed export can be imported again."""
+        # Arrange
+        self._save_quizzes()
+        with self._app.app_context():
+            compressed = b''.join(bulk_functions.gzip_compress_stream(
+                bulk_functions.export_quizzes()))
+
+        # Act
+        with self._app.app_context():
+            report = bulk_functions.import_quizzes(
+                gzip.decompress(compressed).splitlines())
+            original_quiz = sql_functions.select_full_quiz_nested(1)
+            imported_quiz = sql_functions.select_full_quiz_nested(3)
+
+        # Assert
+        self.assertEqual(report['imported'], 2)
+        self.assertEqual(imported_quiz['name'], original_quiz['name'])
+        self.assertEqual(
+            [[(option['option_number'], option['correct_answer'])
+              for option in question['quiz_option_data']]
+             for question in imported_quiz['quiz_question_data']],
+            [[(1, True)], [(1, False), (2, True)]]
+        )
@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock, patch
+import unittest
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app.cache import LRUCache  # Noqa: E402
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test least recently used cache."""
+
+    def test_get_missing(self) -> None:
+        """Test getting a key that was never stored counts a miss."""
+        # Arrange
+        cache = LRUCache(2)
+
+        # Act
+        value = cache.get(1)
+
+        # Assert
+        self.assertIsNone(value)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_get_stored(self) -> None:
+        """Test getting a stored key counts a hit."""
+        # Arrange
+        cache = LRUCache(2)
+        cache.set(1, (1, 2), cache.generation)
+
+        # Act
+        value = cache.get(1)
+
+        # Assert
+        self.assertEqual(value, (1, 2))
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_evict_least_recently_used(self) -> None:
+        """Test the least recently used key is evicted when full."""
+        # Arrange
+        cache = LRUCache(2)
+        cache.set(1, 'a', cache.generation)
+        cache.set(2, 'b', cache.generation)
+        cache.get(1)  # Key 2 is now the least recently used
+
+        # Act
+        cache.set(3, 'c', cache.generation)
+
+        # Assert
+        self.assertEqual(cache.get(1), 'a')
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(3), 'c')
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.stats()['size'], 2)
+
+    def test_invalidate(self) -> None:
+        """Test an invalidated key is removed."""
+        # Arrange
+        cache = LRUCache(2)
+        cache.set(1, 'a', cache.generation)
+
+        # Act
+        cache.invalidate(1)
+
+        # Assert
+        self.assertIsNone(cache.get(1))
+
+    def test_set_after_invalidate(self) -> None:
+        """Test a value read before an invalidation is not stored."""
+        # Arrange
+        cache = LRUCache(2)
+        generation = cache.generation
+        cache.invalidate(1)
+
+        # Act
+        cache.set(1, 'stale', generation)
+
+        # Assert
+        self.assertIsNone(cache.get(1))
+
+    @patch('app.cache.time.monotonic')
+    def test_expire_after_ttl(self, mock_monotonic: MagicMock) -> None:
+        """Test a value is no longer returned once its time to live passed."""
+        # Arrange
+        cache = LRUCache(2, ttl=5.0)
+        mock_monotonic.return_value = 100.0
+        cache.set(1, 'a', cache.generation)
+
+        # Act
+        mock_monotonic.return_value = 104.0
+        value_before_expiry = cache.get(1)
+        mock_monotonic.return_value = 105.0
+        value_after_expiry = cache.get(1)
+
+        # Assert
+        self.assertEqual(value_before_expiry, 'a')
+        self.assertIsNone(value_after_expiry)
+        self.assertEqual(cache.stats()['size'], 0)
@@ -0,0 +1,111 @@
+import tempfile
+import time
+import unittest
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import (compaction, create_app, db, setup_test_db,  # Noqa: E402
+                 sql_functions, Quiz, QuizQuestion)
+from tests.route_setup import RouteTestSetup  # Noqa: E402
+
+
+class TestCompactDatabase(RouteTestSetup):
+    """Test purging soft deleted quizzes in batches."""
+
+    def setUp(self) -> None:
+        """Setup database with three soft deleted quizzes and a live quiz."""
+        super().setUp()
+        for quiz_id in (1, 2, 3, 4):
+            self._insert_sample_data(Quiz, self._get_default_quiz_data(
+                {'quiz_id': quiz_id}))
+            self._insert_sample_data(
+                QuizQuestion, self._get_default_question_data(
+                    {'question_id': quiz_id, 'quiz_id': quiz_id}))
+        with self._app.app_context():
+            sql_functions.tombstone_quizzes([1, 2, 3])
+
+    def test_purge_in_batches(self) -> None:
+        """Test a limited compaction leaves the rest for the next run."""
+        # Act
+        with self._app.app_context():
+            first_report = compaction.compact_database(2, 0, max_batches=1)
+            second_report = compaction.compact_database(2, 0, max_batches=1)
+            quiz_id_list = [quiz.quiz_id for quiz in Quiz.query.all()]
+            question_list = QuizQuestion.query.all()
+
+        # Assert
+        self.assertEqual(
+            [(report['purged'], report['batches'], report['completed'])
+             for report in (first_report, second_report)],
+            [(2, 1, False), (1, 1, True)])
+        self.assertEqual(quiz_id_list, [4])
+        self.assertEqual([row.question_id for row in question_list], [4])
+
+    def test_keep_recent_deletes(self) -> None:
+        """Test quizzes deleted less than 'min_age' seconds ago are kept."""
+        # Act
+        with self._app.app_context():
+            report = compaction.compact_database(2, 3600)
+            quiz_count = Quiz.query.count()
+
+        # Assert
+        self.assertEqual((report['purged'], report['completed']), (0, True))
+        self.assertEqual(quiz_count, 4)
+
+    def test_background_compaction(self) -> None:
+        """Test the background thread purges soft deleted quizzes until it
+        is stopped.
+        """
+        # Act
+        stop_event = compaction.start_background_compaction(
+            self._app, 0.01, 2, 0)
+        self.addCleanup(stop_event.set)
+        deadline = time.monotonic() + 5
+        with self._app.app_context():
+            while Quiz.query.count() > 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            quiz_id_list = [quiz.quiz_id for quiz in Quiz.query.all()]
+
+        # Assert
+        self.assertEqual(quiz_id_list, [4])
+
+
+class TestCompactDatabaseFile(unittest.TestCase):
+    """Test compaction returns free pages of a database file."""
+
+    def setUp(self) -> None:
+        """Create a database file with incremental vacuum."""
+        self._directory = tempfile.TemporaryDirectory()
+        database_path = os.path.join(self._directory.name, 'quizzer.db')
+        self._app = create_app(
+            f'sqlite:///{database_path}', False,
+            sqlite_pragmas={'auto_vacuum': 'INCREMENTAL',
+                            'journal_mode': 'WAL'})
+
+    def tearDown(self) -> None:
+        """Remove the database file."""
+        with self._app.app_context():
+            db.engine.dispose()
+        self._directory.cleanup()
+
+    def test_reclaim_pages(self) -> None:
+        """Test purged quizzes shrink the file and are reported."""
+        # Arrange
+        with self._app.app_context():
+            setup_test_db.insert_generated_data(db, 50, 20, 4)
+            sql_functions.tombstone_quizzes(list(range(1, 51)))
+
+        # Act
+        with self._app.app_context():
+            report = compaction.compact_database(20, 0)
+
+        # Assert
+        self.assertEqual(report['purged'], 50)
+        self.assertEqual(report['auto_vacuum'], 'incremental')
+        self.assertGreater(report['pages_reclaimed'], 0)
+        self.assertEqual(report['pages_before'] - report['pages_after'],
+                         report['pages_reclaimed'])
+        # Default page size of SQLite
+        self.assertEqual(report['bytes_reclaimed'],
+                         report['pages_reclaimed'] * 4096)
+        self.assertEqual(report['free_pages'], 0)
@@ -0,0 +1,111 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import attempt_functions, leaderboard_functions, Quiz  # Noqa: E402
+from tests.route_setup import RouteTestSetup  # Noqa: E402
+
+
+class TestLeaderboards(RouteTestSetup):
+
+    def setUp(self) -> None:
+        """Setup database with quizzes 1 to 3."""
+        super().setUp()
+        for quiz_id in (1, 2, 3):
+            self._insert_sample_data(Quiz, self._get_default_quiz_data(
+                {'quiz_id': quiz_id}))
+
+    def _record(self, quiz_id: int, player: str, correct_count: int) -> None:
+        """Record an attempt of two questions with the given correct count."""
+        result = [True] * correct_count + [False] * (2 - correct_count)
+        attempt_functions.record_attempt(quiz_id, [1, 1], result, player)
+
+    def test_best_attempt_per_player(self) -> None:
+        """Test only the best attempt of a player is ranked and ties rank the
+        first player reaching the score higher.
+        """
+        # Act
+        with self._app.app_context():
+            self._record(1, 'ann', 1)
+            self._record(1, 'bob', 1)
+            self._record(1, 'ann', 0)
+            self._record(1, 'cat', 2)
+            attempt_functions.record_attempt(1, [1, 1], [True, True])
+            leaderboard = leaderboard_functions.get_quiz_leaderboard(1, 10)
+
+        # Assert
+        self.assertEqual(
+            [(entry['rank'], entry['player'], entry['correct_count'])
+             for entry in leaderboard['entries']],
+            [(1, 'cat', 2), (2, 'ann', 1), (3, 'bob', 1)]
+        )
+        self.assertIsNone(leaderboard['next_cursor'])
+
+    def test_player_leaderboard(self) -> None:
+        """Test the global leaderboard adds up the best attempt of every quiz
+        of a player.
+        """
+        # Act
+        with self._app.app_context():
+            attempt_functions.record_attempts([
+                {'quiz_id': 1, 'selections': [1, 1], 'result': [True, False],
+                 'player': 'ann'},
+                {'quiz_id': 1, 'selections': [1, 1], 'result': [True, True],
+                 'player': 'ann'},
+                {'quiz_id': 2, 'selections': [1, 1], 'result': [True, False],
+                 'player': 'ann'},
+                {'quiz_id': 2, 'selections': [1, 1], 'result': [True, True],
+                 'player': 'bob'}
+            ])
+            self._record(2, 'ann', 2)
+            leaderboard = leaderboard_functions.get_player_leaderboard(10)
+
+        # Assert
+        self.assertEqual(
+            [(entry['rank'], entry['player'], entry['total_correct_count'],
+              entry['quiz_count'])
+             for entry in leaderboard['entries']],
+            [(1, 'ann', 4, 2), (2, 'bob', 2, 1)]
+        )
+
+    def test_leaderboard_pages(self) -> None:
+        """Test following the cursors reads every rank once in order."""
+        # Arrange
+        with self._app.app_context():
+            for index in range(7):
+                self._record(1, f'player{index}', index % 3)
+
+        # Act
+        entry_list = []
+        cursor = None
+        with self._app.app_context():
+            while True:
+                leaderboard = leaderboard_functions.get_quiz_leaderboard(
+                    1, 3, cursor)
+                entry_list.extend(leaderboard['entries'])
+                cursor = leaderboard['next_cursor']
+                if cursor is None:
+                    break
+
+        # Assert
+        self.assertEqual([entry['rank'] for entry in entry_list],
+                         list(range(1, 8)))
+        self.assertEqual(
+            [entry['player'] for entry in entry_list],
+            ['player2', 'player5', 'player1', 'player4', 'player0',
+             'player3', 'player6']
+        )
+
+    def test_cursor_of_other_leaderboard(self) -> None:
+        """Test a cursor only continues the leaderboard it was read from."""
+        # Arrange
+        with self._app.app_context():
+            self._record(1, 'ann', 1)
+            self._record(1, 'bob', 1)
+            cursor = leaderboard_functions.get_quiz_leaderboard(
+                1, 1)['next_cursor']
+
+            # Act and assert
+            with self.assertRaises(ValueError):
+                leaderboard_functions.get_quiz_leaderboard(2, 1, cursor)
+            with self.assertRaises(ValueError):
+                leaderboard_functions.get_player_leaderboard(1, 'invalid')
@@ -0,0 +1,67 @@
+import unittest
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app.metrics import Counter, Histogram  # Noqa: E402
+
+
+class TestCounter(unittest.TestCase):
+    """Test labelled counter."""
+
+    def test_render_counter(self) -> None:
+        """Test counters are rendered per label values."""
+        # Arrange
+        counter = Counter('test_total', 'Test counter.', ('endpoint',))
+
+        # Act
+        counter.inc(('b',))
+        counter.inc(('a"',), 2)
+        line_list = counter.render()
+
+        # Assert
+        self.assertListEqual(line_list, [
+            '# HELP test_total Test counter.',
+            '# TYPE test_total counter',
+            'test_total{endpoint="a\\""} 2',
+            'test_total{endpoint="b"} 1'
+        ])
+
+
+class TestHistogram(unittest.TestCase):
+    """Test fixed bucket histogram."""
+
+    def test_render_histogram(self) -> None:
+        """Test bucket counts are cumulative and include the upper bound."""
+        # Arrange
+        histogram = Histogram('test_seconds', 'Test histogram.',
+                              ('endpoint',), (0.1, 1))
+
+        # Act
+        for value in (0.1, 0.5, 2):
+            histogram.observe(('a',), value)
+        line_list = histogram.render()
+
+        # Assert
+        self.assertListEqual(line_list, [
+            '# HELP test_seconds Test histogram.',
+            '# TYPE test_seconds histogram',
+            'test_seconds_bucket{endpoint="a",le="0.1"} 1',
+            'test_seconds_bucket{endpoint="a",le="1"} 2',
+            'test_seconds_bucket{endpoint="a",le="+Inf"} 3',
+            'test_seconds_sum{endpoint="a"} 2.6',
+            'test_seconds_count{endpoint="a"} 3'
+        ])
+
+    def test_clear_histogram(self) -> None:
+        """Test clearing removes all observations."""
+        # Arrange
+        histogram = Histogram('test_seconds', 'Test histogram.',
+                              ('endpoint',), (1,))
+        histogram.observe(('a',), 0.5)
+
+        # Act
+        histogram.clear()
+
+        # Assert
+        self.assertEqual(histogram.get_count(('a',)), 0)
+        self.assertEqual(len(histogram.render()), 2)
@@ -1,10 +1,15 @@
 from datetime import datetime
+import sqlite3
+import tempfile
 import unittest
 from freezegun import freeze_time
 import os
 import sys
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
-from app import create_app, db, Quiz, QuizOption, QuizQuestion  # Noqa: E402
+from app import (create_app, db, Quiz, QuizAttempt, QuizOption,  # Noqa: E402
+                 QuizQuestion)
 
 
 class TestORM(unittest.TestCase):
@@ -99,3 +104,267 @@ class TestORM(unittest.TestCase):
         self.assertEqual(option_number, 1)
         self.assertEqual(text, 'Watt')
         self.assertEqual(correct_answer, True)
+
+    def test_duplicate_question_number(self) -> None:
+        """Test a question number can only be used once per quiz."""
+        # Arrange
+        quiz_question_data = {
+            'quiz_id': 1,
+            'question_number': 1,
+            'text': 'What is the unit of power?',
+        }
+
+        # Act
+        with self._app.app_context():
+            db.session.add(QuizQuestion(**quiz_question_data))
+            db.session.add(QuizQuestion(**quiz_question_data))
+
+            # Assert
+            with self.assertRaises(IntegrityError):
+                db.session.commit()
+
+    def test_duplicate_option_number(self) -> None:
+        """Test an option number can only be used once per question."""
+        # Arrange
+        quiz_option_data = {
+            'question_id': 1,
+            'option_number': 1,
+            'text': 'Watt',
+            'correct_answer': True
+        }
+
+        # Act
+        with self._app.app_context():
+            db.session.add(QuizOption(**quiz_option_data))
+            db.session.add(QuizOption(**quiz_option_data))
+
+            # Assert
+            with self.assertRaises(IntegrityError):
+                db.session.commit()
+
+
+class TestMigration(unittest.TestCase):
+    """Test upgrading databases created by older versions of the app."""
+
+    def setUp(self) -> None:
+        """Create a database file with the original schema."""
+        self._directory = tempfile.TemporaryDirectory()
+        self._database_path = os.path.join(self._directory.name, 'quizzer.db')
+        connection = sqlite3.connect(self._database_path)
+        connection.executescript("""
+            CREATE TABLE "Quiz" (
+                quiz_id INTEGER NOT NULL, name VARCHAR(20) NOT NULL,
+                created_at DATETIME, updated_at DATETIME,
+                PRIMARY KEY (quiz_id));
+            CREATE TABLE "QuizQuestion" (
+                question_id INTEGER NOT NULL, quiz_id INTEGER NOT NULL,
+                question_number INTEGER NOT NULL, text VARCHAR(100) NOT NULL,
+                PRIMARY KEY (question_id),
+                FOREIGN KEY(quiz_id) REFERENCES "Quiz" (quiz_id));
+            CREATE TABLE "QuizOption" (
+                option_id INTEGER NOT NULL, question_id INTEGER NOT NULL,
+                option_number INTEGER NOT NULL, text VARCHAR(20) NOT NULL,
+                correct_answer BOOLEAN NOT NULL, PRIMARY KEY (option_id),
+                FOREIGN KEY(question_id)
+                    REFERENCES "QuizQuestion" (question_id));
+            INSERT INTO Quiz VALUES (1, 'Math', NULL, NULL);
+            INSERT INTO QuizQuestion VALUES (1, 1, 1, 'Evaluate 1 + 1');
+            INSERT INTO QuizQuestion VALUES (2, 1, 1, 'Duplicate');
+            INSERT INTO QuizOption VALUES (1, 1, 1, '2', 1);
+            INSERT INTO QuizOption VALUES (2, 1, 1, 'Duplicate', 0);
+            INSERT INTO QuizOption VALUES (3, 2, 1, 'Orphaned', 0);
+        """)
+        connection.close()
+
+    def tearDown(self) -> None:
+        """Remove the database file."""
+        self._directory.cleanup()
+
+    def test_upgrade_existing_database(self) -> None:
+        """Test duplicates are removed and the indexes are created."""
+        # Act
+        app = create_app(f'sqlite:///{self._database_path}', False)
+
+        # Assert
+        with app.app_context():
+            question_list = QuizQuestion.query.all()
+            option_list = QuizOption.query.all()
+            inspector = inspect(db.engine)
+            question_indexes = {
+                index['name']: index['unique']
+                for index in inspector.get_indexes('QuizQuestion')
+            }
+            option_indexes = {
+                index['name']: index['unique']
+                for index in inspector.get_indexes('QuizOption')
+            }
+            db.engine.dispose()
+
+        self.assertEqual([row.question_id for row in question_list], [1])
+        self.assertEqual([row.option_id for row in option_list], [1])
+        self.assertEqual(
+            question_indexes,
+            {'ix_quiz_question_quiz_id_question_number': True}
+        )
+        self.assertEqual(
+            option_indexes,
+            {
+                'ix_quiz_option_question_id_option_number': True,
+                'ix_quiz_option_correct_answer': False
+            }
+        )
+
+    def test_add_attempt_player(self) -> None:
+        """Test attempt tables created without players get the column."""
+        # Arrange
+        connection = sqlite3.connect(self._database_path)
+        connection.executescript("""
+            CREATE TABLE "QuizAttempt" (
+                attempt_id INTEGER NOT NULL, quiz_id INTEGER NOT NULL,
+                correct_count INTEGER NOT NULL,
+                answered_count INTEGER NOT NULL, result VARCHAR NOT NULL,
+                selections VARCHAR NOT NULL, created_at DATETIME,
+                PRIMARY KEY (attempt_id),
+                FOREIGN KEY(quiz_id) REFERENCES "Quiz" (quiz_id));
+            INSERT INTO QuizAttempt VALUES (1, 1, 1, 1, '1', '1', NULL);
+            PRAGMA user_version = 3;
+        """)
+        connection.close()
+
+        # Act
+        app = create_app(f'sqlite:///{self._database_path}', False)
+
+        # Assert
+        with app.app_context():
+            attempt_list = QuizAttempt.query.all()
+            db.engine.dispose()
+        self.assertEqual([(row.attempt_id, row.player)
+                          for row in attempt_list], [(1, None)])
+
+    def test_remove_deleted_quiz_rows(self) -> None:
+        """Test rows of quizzes deleted before deleting cascaded are removed
+        and the global leaderboard is rebuilt.
+        """
+        # Arrange
+        app = create_app(f'sqlite:///{self._database_path}', False)
+        with app.app_context():
+            db.engine.dispose()
+        connection = sqlite3.connect(self._database_path)
+        connection.executescript("""
+            INSERT INTO QuizQuestion VALUES (3, 2, 1, 'Deleted');
+            INSERT INTO QuizOption VALUES (4, 3, 1, 'Deleted', 1);
+            INSERT INTO QuizLeaderboard VALUES
+                (1, 'ada', 1, 1, '2022-01-01 00:00:00.000000'),
+                (2, 'ada', 1, 1, '2022-01-02 00:00:00.000000'),
+                (2, 'bob', 1, 1, '2022-01-02 00:00:00.000000');
+            INSERT INTO PlayerLeaderboard VALUES
+                ('ada', 2, 2, '2022-01-02 00:00:00.000000'),
+                ('bob', 1, 1, '2022-01-02 00:00:00.000000');
+            PRAGMA user_version = 4;
+        """)
+        connection.close()
+
+        # Act
+        app = create_app(f'sqlite:///{self._database_path}', False)
+
+        # Assert
+        with app.app_context():
+            question_list = QuizQuestion.query.all()
+            option_list = QuizOption.query.all()
+            player_list = db.session.execute(db.text(
+                'SELECT player, total_correct_count, quiz_count '
+                'FROM PlayerLeaderboard')).all()
+            db.engine.dispose()
+        self.assertEqual([row.question_id for row in question_list], [1])
+        self.assertEqual([row.option_id for row in option_list], [1])
+        self.assertEqual([tuple(row) for row in player_list], [('ada', 1, 1)])
+
+    def test_add_quiz_deleted_at(self) -> None:
+        """Test quiz tables created without soft deletes get the column and
+        its index.
+        """
+        # Act
+        app = create_app(f'sqlite:///{self._database_path}', False)
+
+        # Assert
+        with app.app_context():
+            inspector = inspect(db.engine)
+            column_names = [column['name']
+                            for column in inspector.get_columns('Quiz')]
+            index_names = [index['name']
+                           for index in inspector.get_indexes('Quiz')]
+            quiz_list = Quiz.query.all()
+            db.engine.dispose()
+        self.assertIn('deleted_at', column_names)
+        self.assertIn('ix_quiz_deleted_at', index_names)
+        self.assertEqual([quiz.deleted_at for quiz in quiz_list], [None])
+
+    def test_add_quiz_autoincrement(self) -> None:
+        """Test quiz tables created without AUTOINCREMENT are rebuilt with
+        their rows, so deleted quiz IDs are not reused.
+        """
+        # Act
+        app = create_app(f'sqlite:///{self._database_path}', False)
+
+        # Assert
+        with app.app_context():
+            table_sql = db.session.execute(db.text(
+                "SELECT sql FROM sqlite_master WHERE name = 'Quiz'")).scalar()
+            name_list = [quiz.name for quiz in Quiz.query.all()]
+            index_names = {index['name']
+                           for index in inspect(db.engine).get_indexes('Quiz')}
+            db.session.query(Quiz).delete()
+            db.session.add(Quiz(name='New'))
+            db.session.commit()
+            quiz_id_list = [quiz.quiz_id for quiz in Quiz.query.all()]
+            db.engine.dispose()
+        self.assertIn('AUTOINCREMENT', table_sql)
+        self.assertEqual(name_list, ['Math'])
+        self.assertEqual(index_names,
+                         {'ix_quiz_updated_at_quiz_id', 'ix_quiz_deleted_at'})
+        self.assertEqual(quiz_id_list, [2])
+
+
+class TestSqlitePragmas(unittest.TestCase):
+    """Test engine options and pragmas of the configured database."""
+
+    def setUp(self) -> None:
+        """Create a directory for the database file."""
+        self._directory = tempfile.TemporaryDirectory()
+        self._database_path = os.path.join(self._directory.name, 'quizzer.db')
+
+    def tearDown(self) -> None:
+        """Remove the database file."""
+        self._directory.cleanup()
+
+    def test_pragmas_set_on_every_connection(self) -> None:
+        """Test every pooled connection gets the configured pragmas."""
+        # Arrange
+        sqlite_pragmas = {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 2500,
+            'foreign_keys': 'ON'
+        }
+
+        # Act
+        app = create_app(f'sqlite:///{self._database_path}', False,
+                         {'pool_size': 2}, sqlite_pragmas)
+        with app.app_context():
+            pool_size = db.engine.pool.size()
+            with db.engine.connect() as first_connection, \
+                    db.engine.connect() as second_connection:
+                pragma_list = [
+                    [
+                        connection.exec_driver_sql(
+                            f'PRAGMA {name}').scalar()
+                        for name in sqlite_pragmas
+                    ]
+                    for connection in (first_connection, second_connection)
+                ]
+            db.engine.dispose()
+
+        # Assert
+        self.assertEqual(pool_size, 2)
+        # Synchronous NORMAL is reported as 1
+        self.assertEqual(pragma_list, [['wal', 1, 2500, 1]] * 2)
@@ -0,0 +1,263 @@
+from typing import Any, Dict, Tuple
+import json
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import (create_app, db, setup_test_db, sql_functions,  # Noqa: E402
+                 write_behind)
+from tests.route_setup import RouteTestSetup  # Noqa: E402
+
+# Quiz sizes as questions per quiz and options per question. Every route must
+# stay within its budget for all sizes, which catches queries per row.
+QUIZ_SIZES = ((1, 1), (20, 5))
+
+# Number of quizzes in the database
+QUIZ_COUNT = 3
+
+
+class TestQueryBudgets(RouteTestSetup):
+    """Test every route executes a fixed number of SQL statements regardless
+    of the quiz size.
+    """
+
+    def _setup_quizzes(self, size: Tuple[int, int]) -> None:
+        """Reset the database with generated quizzes of the given size."""
+        self.setUp()
+        with self._app.app_context():
+            setup_test_db.insert_generated_data(db, QUIZ_COUNT, *size)
+
+    def _get_save_data(self, quiz_id: int) -> Dict[str, Any]:
+        """Get saved quiz in the save format with every text changed."""
+        with self._app.app_context():
+            quiz = sql_functions.select_full_quiz_nested(quiz_id)
+        return {'quiz_data': {
+            'quiz_id': quiz_id,
+            'name': 'Changed',
+            'quiz_question_data': [
+                {
+                    'question_number': question['question_number'],
+                    'text': f'{question["text"]} changed',
+                    'quiz_option_data': [
+                        {
+                            'option_number': option['option_number'],
+                            'text': 'Changed',
+                            'correct_answer': option['correct_answer']
+                        }
+                        for option in question['quiz_option_data']
+                    ]
+                }
+                for question in quiz['quiz_question_data']
+            ]
+        }}
+
+    def test_debug_routes_budget(self) -> None:
+        """Test debug routes read each table with one statement."""
+        for size in QUIZ_SIZES:
+            with self.subTest(size=size):
+                # Arrange
+                self._setup_quizzes(size)
+
+                # Act and assert
+                for route in ('/debug-quiz', '/debug-quiz-question',
+                              '/debug-quiz-option'):
+                    self._assert_query_budget(1, 'GET', route)
+                    self._assert_query_budget(
+                        1, 'GET', f'{route}?format=ndjson')
+                self._assert_query_budget(0, 'GET', '/debug-answer-cache')
+                self._assert_query_budget(0, 'GET', '/metrics')
+
+    def test_get_full_quiz_budget(self) -> None:
+        """Test reading a full quiz with a snapshot is one lookup, and without
+        one needs the revision and one read per table at most.
+        """
+        for size in QUIZ_SIZES:
+            with self.subTest(size=size):
+                # Arrange
+                self._setup_quizzes(size)
+                self._client.post('/save-quiz', json=self._get_save_data(1))
+
+                # Act
+                response = self._assert_query_budget(
+                    1, 'GET', '/get-full-quiz/1')
+                self._assert_query_budget(
+                    1, 'GET', '/get-full-quiz/1?format=nested')
+                not_modified_response = self._assert_query_budget(
+                    1, 'GET', '/get-full-quiz/1',
+                    headers={'If-None-Match': response.headers['ETag']})
+                self._assert_query_budget(3, 'GET', '/get-full-quiz/2')
+                self._assert_query_budget(
+                    5, 'GET', '/get-full-quiz/2?format=nested')
+
+                # Assert
+                self.assertEqual(not_modified_response.status_code, 304)
+
+    def test_save_quiz_budget(self) -> None:
+        """Test saving changes to every row uses bulk statements and
+        re-indexes the quiz for search and renders its snapshots once.
+        """
+        for size in QUIZ_SIZES:
+            with self.subTest(size=size):
+                # Arrange
+                self._setup_quizzes(size)
+                data = self._get_save_data(1)
+                new_data = self._get_save_data(2)
+                new_data['quiz_data']['quiz_id'] = 0
+
+                # Act and assert
+                self._assert_query_budget(9, 'POST', '/save-quiz', json=data)
+                self._assert_query_budget(
+                    9, 'POST', '/save-quiz', json=new_data)
+
+    def test_patch_quiz_budget(self) -> None:
+        """Test patching one option writes only that option, re-indexing
+        the quiz for search only when text changed.
+        """
+        for size in QUIZ_SIZES:
+            with self.subTest(size=size):
+                # Arrange
+                self._setup_quizzes(size)
+                answer_data = {'quiz_id': 1, 'operations': [
+                    {'op': 'update_option', 'question_number': 1,
+                     'option_number': 1, 'correct_answer': False}]}
+                text_data = {'quiz_id': 1, 'operations': [
+                    {'op': 'update_question', 'question_number': 1,
+                     'text': 'Fixed'}]}
+
+                # Act and assert
+                self._assert_query_budget(
+                    6, 'POST', '/patch-quiz', json=answer_data)
+                self._assert_query_budget(
+                    8, 'POST', '/patch-quiz', json=text_data)
+
+    def test_delete_quiz_budget(self) -> None:
+        """Test deleting quizzes uses one statement per table no matter how
+        many quizzes are deleted.
+        """
+        for size in QUIZ_SIZES:
+            with self.subTest(size=size):
+                # Arrange
+                self._setup_quizzes(size)
+
+                # Act and assert
+                self._assert_query_budget(
+                    12, 'POST', '/delete-quiz', json={'quiz_id': 1})
+                self._assert_query_budget(
+                    12, 'POST', '/delete-quizzes', json={'quiz_ids': [2, 3]})
+
+    def test_soft_delete_quiz_budget(self) -> None:
+        """Test soft deleting quizzes only writes the quiz rows, search
+        documents, snapshots and leaderboard entries.
+        """
+        for size in QUIZ_SIZES:
+            with self.subTest(size=size):
+                # Arrange
+                self._setup_quizzes(size)
+                self._app.config['SOFT_DELETE_QUIZZES'] = True
+
+                # Act and assert
+                self._assert_query_budget(
+                    6, 'POST', '/delete-quiz', json={'quiz_id': 1})
+                self._assert_query_budget(
+                    6, 'POST', '/delete-quizzes', json={'quiz_ids': [2, 3]})
+
+    def test_quiz_list_budget(self) -> None:
+        """Test listing quizzes uses one statement."""
+        for size in QUIZ_SIZES:
+            with self.subTest(size=size):
+                # Arrange
+                self._setup_quizzes(size)
+
+                # Act and assert
+                self._assert_query_budget(1, 'GET', '/get-quiz')
+                self._assert_query_budget(1, 'GET', '/get-quiz/2')
+                self._assert_query_budget(
+                    1, 'GET', '/get-quiz?fields=question_count,updated_at')
+                self._assert_query_budget(1, 'GET', '/get-quiz-page?limit=2')
+                self._assert_query_budget(
+                    1, 'GET', '/search-quiz?q=a&limit=2')
+
+    def test_evaluate_quiz_budget(self) -> None:
+        """Test grading reads answer keys with one statement and none once
+        they are cached, and records attempts with one statement per table,
+        one to check the quizzes are not deleted, one to match selections to
+        questions and three more to rank players.
+        """
+        for size in QUIZ_SIZES:
+            with self.subTest(size=size):
+                # Arrange
+                self._setup_quizzes(size)
+                selections = [1] * size[0]
+                submission_list = [
+                    {'quiz_id': quiz_id, 'selections': selections}
+                    for quiz_id in range(1, QUIZ_COUNT + 1)
+                ]
+
+                # Act and assert
+                self._assert_query_budget(
+                    7, 'POST', '/evaluate_quiz',
+                    json={'quiz_id': 1, 'selections': selections})
+                self._assert_query_budget(
+                    6, 'POST', '/evaluate_quiz',
+                    json={'quiz_id': 1, 'selections': selections})
+                self._assert_query_budget(
+                    7, 'POST', '/evaluate_quiz_batch',
+                    json={'submissions': submission_list})
+                self._assert_query_budget(
+                    10, 'POST', '/evaluate_quiz',
+                    json={'quiz_id': 1, 'selections': selections,
+                          'player': 'ann'})
+                self._assert_query_budget(
+                    10, 'POST', '/evaluate_quiz_batch',
+                    json={'submissions': [
+                        {**submission, 'player': 'bob'}
+                        for submission in submission_list
+                    ]})
+                self._assert_query_budget(3, 'GET', '/quiz-statistics/1')
+                self._assert_query_budget(
+                    2, 'GET', '/quiz-statistics/1?question=1')
+                response = self._assert_query_budget(
+                    1, 'GET', '/leaderboard/1?limit=1')
+                self._assert_query_budget(
+                    1, 'GET', '/leaderboard/1?limit=1&cursor='
+                    f'{response.get_json()["next_cursor"]}')
+                self._assert_query_budget(1, 'GET', '/leaderboard')
+
+    def test_evaluate_quiz_write_behind_budget(self) -> None:
+        """Test grading with a write behind queue only reads answer keys."""
+        # Arrange
+        self._app = create_app('sqlite:///:memory:', False,
+                               attempt_write_behind={
+                                   'max_size': 100, 'batch_size': 100,
+                                   'flush_interval': 60, 'put_timeout': 0})
+        self._client = self._app.test_client()
+        self.addCleanup(
+            self._app.extensions[write_behind.ATTEMPT_QUEUE].stop)
+        with self._app.app_context():
+            setup_test_db.insert_generated_data(db, QUIZ_COUNT, 20, 5)
+        selections = [1] * 20
+
+        # Act and assert
+        self._assert_query_budget(
+            1, 'POST', '/evaluate_quiz',
+            json={'quiz_id': 1, 'selections': selections})
+        self._assert_query_budget(
+            0, 'POST', '/evaluate_quiz',
+            json={'quiz_id': 1, 'selections': selections})
+
+    def test_import_export_budget(self) -> None:
+        """Test importing a batch and exporting all quizzes use a fixed
+        number of statements.
+        """
+        for size in QUIZ_SIZES:
+            with self.subTest(size=size):
+                # Arrange
+                self._setup_quizzes(size)
+                line = json.dumps(self._get_save_data(1))
+
+                # Act and assert
+                self._assert_query_budget(
+                    7, 'POST', '/import-quizzes',
+                    data='\n'.join([line] * 10))
+                self._assert_query_budget(1, 'GET', '/export-quizzes')
+                self._assert_query_budget(
+                    1, 'GET', '/export-quizzes?compress=gzip')
@@ -1,11 +1,108 @@
 from unittest.mock import patch, MagicMock
+import base64
+import gzip
+import json
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
-from app import Quiz, QuizOption, QuizQuestion  # Noqa: E402
+from app import (create_app, db, Quiz, QuizOption,  # Noqa: E402
+                 QuizQuestion, QuizSnapshot, write_behind)
 from tests.route_setup import RouteTestSetup  # Noqa: E402
 
 
+class TestDebugTableData(RouteTestSetup):
+    """Test debug table routes."""
+
+    def test_debug_quiz_option_ndjson(self) -> None:
+        """Test streaming option rows as newline delimited JSON."""
+        # Arrange
+        option_data = self._get_default_option_data()
+        self._insert_sample_data(QuizOption, option_data)
+        option_data = self._get_default_option_data(
+            {'option_id': 2, 'option_number': 2, 'correct_answer': False})
+        self._insert_sample_data(QuizOption, option_data)
+
+        # Act
+        response = self._client.get('/debug-quiz-option?format=ndjson')
+        line_list = response.get_data(as_text=True).splitlines()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertEqual(len(line_list), 2)
+        self.assertDictEqual(
+            json.loads(line_list[1]),
+            {
+                'option_id': 2,
+                'question_id': 1,
+                'option_number': 2,
+                'text': 'Test Option',
+                'correct_answer': False
+            }
+        )
+
+
+class TestMetrics(RouteTestSetup):
+    """Test get_metrics."""
+
+    def test_metrics_record_requests(self) -> None:
+        """Test requests and their SQL statements are recorded per endpoint.
+        """
+        # Arrange
+        quiz_data = self._get_default_quiz_data()
+        self._insert_sample_data(Quiz, quiz_data)
+        self._client.get('/get-full-quiz/1')
+        self._client.get('/get-full-quiz/1')
+
+        # Act
+        response = self._client.get('/metrics')
+        text = response.get_data(as_text=True)
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/plain')
+        self.assertIn(
+            'quizzer_request_duration_seconds_count'
+            '{endpoint="app.get_full_quiz"} 2', text)
+        self.assertIn(
+            'quizzer_requests_total'
+            '{endpoint="app.get_full_quiz",method="GET",status="200"} 2',
+            text)
+        # Snapshot lookup, revision and quiz read of both requests as the
+        # quiz has no snapshot
+        self.assertIn(
+            'quizzer_sql_statements_total{endpoint="app.get_full_quiz"} 6',
+            text)
+
+    def test_metrics_without_requests(self) -> None:
+        """Test a new application has no recorded requests."""
+        # Act
+        response = self._client.get('/metrics')
+        text = response.get_data(as_text=True)
+
+        # Assert
+        self.assertNotIn('app.get_full_quiz', text)
+        self.assertIn('# TYPE quizzer_requests_total counter', text)
+
+
+class TestDebugAnswerCache(RouteTestSetup):
+    """Test debug_get_answer_cache."""
+
+    def test_answer_cache_stats(self) -> None:
+        """Test the cache counters of a new application."""
+        # Act
+        response = self._client.get('/debug-answer-cache')
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            json_data['answer_key_cache'],
+            {'size': 0, 'maxsize': 1024, 'ttl': 5.0, 'hits': 0,
+             'misses': 0, 'evictions': 0}
+        )
+
+
 class TestGetFullQuiz(RouteTestSetup):
     """Test get_full_quiz."""
 
@@ -68,6 +165,197 @@ class TestGetFullQuiz(RouteTestSetup):
             }
         )
 
+    def test_full_quiz_nested(self) -> None:
+        """Nested full quiz response."""
+        # Arrange
+
+        # Insert existing data
+        quiz_data = self._get_default_quiz_data()
+        self._insert_sample_data(Quiz, quiz_data)
+
+        question_data = self._get_default_question_data()
+        self._insert_sample_data(QuizQuestion, question_data)
+
+        option_data = self._get_default_option_data()
+        self._insert_sample_data(QuizOption, option_data)
+
+        route = f'{self._route}/1?format=nested'
+
+        # Act
+        response = self._client.get(route)
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            json_data['full_quiz'],
+            {
+                'quiz_id': 1,
+                'name': 'Test Quiz',
+                'created_at': 'Thu, 01 Jan 1970 00:00:00 GMT',
+                'updated_at': 'Thu, 01 Jan 1970 00:00:00 GMT',
+                'quiz_question_data': [
+                    {
+                        'question_id': 1,
+                        'question_number': 1,
+                        'text': 'Test Question',
+                        'quiz_option_data': [
+                            {
+                                'option_id': 1,
+                                'option_number': 1,
+                                'text': 'Test Option',
+                                'correct_answer': True
+                            }
+                        ]
+                    }
+                ]
+            }
+        )
+
+    def test_full_quiz_unknown_format(self) -> None:
+        """Test the server response if the format is not supported."""
+        # Arrange
+        route = f'{self._route}/1?format=test'
+
+        # Act
+        response = self._client.get(route)
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(
+            json_data, {'message': 'format needs to be flat or nested'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_full_quiz_revision_headers(self) -> None:
+        """Test the quiz revision is sent as ETag and Last-Modified."""
+        # Arrange
+        quiz_data = self._get_default_quiz_data()
+        self._insert_sample_data(Quiz, quiz_data)
+        route = f'{self._route}/1'
+
+        # Act
+        response = self._client.get(route)
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['ETag'],
+                         '"1-19700101000000000000-flat"')
+        self.assertEqual(response.headers['Last-Modified'],
+                         'Thu, 01 Jan 1970 00:00:00 GMT')
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+
+    @patch('app.sql_functions.select_full_quiz')
+    def test_full_quiz_not_modified(self, mock_request: MagicMock) -> None:
+        """Test conditional requests matching the revision are answered
+        without reading the quiz.
+        """
+        # Arrange
+        quiz_data = self._get_default_quiz_data()
+        self._insert_sample_data(Quiz, quiz_data)
+        route = f'{self._route}/1'
+
+        # Act
+        etag_response = self._client.get(
+            route,
+            headers={'If-None-Match': '"1-19700101000000000000-flat"'}
+        )
+        date_response = self._client.get(
+            route,
+            headers={'If-Modified-Since': 'Thu, 01 Jan 1970 00:00:00 GMT'}
+        )
+
+        # Assert
+        self.assertEqual(etag_response.status_code, 304)
+        self.assertEqual(etag_response.get_data(), b'')
+        self.assertEqual(date_response.status_code, 304)
+        mock_request.assert_not_called()
+
+    def test_full_quiz_modified(self) -> None:
+        """Test a conditional request for an older revision gets the quiz."""
+        # Arrange
+        quiz_data = self._get_default_quiz_data()
+        self._insert_sample_data(Quiz, quiz_data)
+        data = self._get_default_full_quiz_data()
+        data['quiz_data']['name'] = 'Test Quiz 2'
+        self._client.post('/save-quiz', json=data)
+        route = f'{self._route}/1?format=nested'
+
+        # Act
+        response = self._client.get(
+            route,
+            headers={'If-None-Match': '"1-19700101000000000000-nested"'}
+        )
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json_data['full_quiz']['name'], 'Test Quiz 2')
+        self.assertNotEqual(response.headers['ETag'],
+                            '"1-19700101000000000000-nested"')
+
+    def _save_quiz(self, question_count: int) -> None:
+        """Save a new quiz with two options per question through the route.
+        """
+        self._client.post('/save-quiz', json={'quiz_data': {
+            'quiz_id': 0,
+            'name': 'Snapshot',
+            'quiz_question_data': [
+                {
+                    'question_number': question_number,
+                    'text': f'Question {question_number}',
+                    'quiz_option_data': [
+                        {'option_number': 1, 'text': 'Yes',
+                         'correct_answer': True},
+                        {'option_number': 2, 'text': 'No',
+                         'correct_answer': False}
+                    ]
+                }
+                for question_number in range(1, question_count + 1)
+            ]
+        }})
+
+    def test_full_quiz_snapshot(self) -> None:
+        """Test snapshots of a saved quiz match reading the quiz tables."""
+        # Arrange
+        self._save_quiz(2)
+        route_list = [f'{self._route}/1', f'{self._route}/1?format=nested']
+        snapshot_list = [self._client.get(route) for route in route_list]
+        with self._app.app_context():
+            QuizSnapshot.query.delete()
+            db.session.commit()
+
+        # Act
+        response_list = [self._client.get(route) for route in route_list]
+
+        # Assert
+        for snapshot, response in zip(snapshot_list, response_list):
+            self.assertEqual(snapshot.get_json(), response.get_json())
+            self.assertEqual(snapshot.headers['ETag'],
+                             response.headers['ETag'])
+        self.assertEqual(
+            len(snapshot_list[1].get_json()['full_quiz'][
+                'quiz_question_data']), 2)
+
+    def test_full_quiz_snapshot_gzip(self) -> None:
+        """Test large snapshots are sent compressed only to clients accepting
+        gzip.
+        """
+        # Arrange
+        self._save_quiz(20)
+
+        # Act
+        gzip_response = self._client.get(
+            f'{self._route}/1', headers={'Accept-Encoding': 'gzip'})
+        response = self._client.get(f'{self._route}/1')
+
+        # Assert
+        self.assertEqual(gzip_response.headers['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(
+            json.loads(gzip.decompress(gzip_response.get_data())),
+            response.get_json())
+        self.assertEqual(len(response.get_json()['full_quiz']), 40)
+
     @patch('app.sql_functions.select_full_quiz')
     def test_full_quiz_error(self, mock_request: MagicMock) -> None:
         """Test the server response if the response is an error."""
@@ -105,6 +393,23 @@ class TestSaveQuiz(RouteTestSetup):
         self.assertEqual(json_data, {'message': 'Quiz saved successfully'})
         self.assertEqual(response.status_code, 200)
 
+    def test_save_repeated_question_number(self) -> None:
+        """Test saving a quiz with a repeated question number."""
+        # Arrange
+        data = self._get_default_full_quiz_data()
+        data['quiz_data']['quiz_id'] = 0
+        data['quiz_data']['quiz_question_data'].append(
+            self._get_default_question_data({'quiz_option_data': []}))
+
+        # Act
+        response = self._client.post(self._route, json=data)
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(json_data, {
+            'message': 'Each quiz requires unique "question_number"'})
+        self.assertEqual(response.status_code, 200)
+
     def test_update_quiz(self) -> None:
         """Test updating a quiz without change the size."""
         # Arrange
@@ -280,6 +585,70 @@ class TestSaveQuiz(RouteTestSetup):
         self.assertEqual(response.status_code, 200)
 
 
+class TestPatchQuiz(RouteTestSetup):
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self._route = '/patch-quiz'
+
+    def test_patch_quiz(self) -> None:
+        """Test patching the answer of one option and adding the new answer.
+        """
+        # Arrange
+        self._insert_sample_data(Quiz, self._get_default_quiz_data())
+        self._insert_sample_data(QuizQuestion,
+                                 self._get_default_question_data())
+        self._insert_sample_data(QuizOption, self._get_default_option_data())
+
+        # Act
+        response = self._client.post(self._route, json={
+            'quiz_id': 1,
+            'operations': [
+                {'op': 'update_option', 'question_number': 1,
+                 'option_number': 1, 'correct_answer': False},
+                {'op': 'add_option', 'question_number': 1,
+                 'option_number': 2, 'text': 'New', 'correct_answer': True}
+            ]
+        })
+        evaluate_response = self._client.post(
+            '/evaluate_quiz', json={'quiz_id': 1, 'selections': [1]})
+
+        # Assert
+        self.assertEqual(response.get_json(),
+                         {'message': 'Quiz patched successfully'})
+        self.assertEqual(evaluate_response.get_json(), {'result': [False]})
+
+    def test_patch_quiz_not_found(self) -> None:
+        """Test patching a quiz that does not exist."""
+        # Act
+        response = self._client.post(self._route, json={
+            'quiz_id': 1,
+            'operations': [{'op': 'rename_quiz', 'name': 'Patched'}]
+        })
+
+        # Assert
+        self.assertEqual(response.get_json(),
+                         {'message': 'Failed to patch quiz'})
+
+    def test_patch_quiz_invalid_data(self) -> None:
+        """Test patching without operations or with an invalid operation."""
+        # Act
+        response = self._client.post(self._route, json={'quiz_id': 1})
+        bool_response = self._client.post(self._route, json={
+            'quiz_id': True,
+            'operations': [{'op': 'rename_quiz', 'name': 'Patched'}]})
+        operation_response = self._client.post(self._route, json={
+            'quiz_id': 1, 'operations': [{'op': 'rename_quiz'}]})
+
+        # Assert
+        for invalid_response in (response, bool_response):
+            self.assertEqual(invalid_response.get_json(), {
+                'message': 'Data requires keys "quiz_id" and "operations" '
+                           'with a list of operations'})
+        self.assertEqual(operation_response.get_json(),
+                         {'message': 'rename_quiz requires name'})
+
+
 class TestDeleteQuiz(RouteTestSetup):
 
     def __init__(self, methodName: str = "runTest") -> None:
@@ -334,6 +703,47 @@ class TestDeleteQuiz(RouteTestSetup):
         mock_request.assert_called_once_with({})
 
 
+class TestDeleteQuizzes(RouteTestSetup):
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self._route = '/delete-quizzes'
+
+    def test_delete_quizzes(self) -> None:
+        """Test deleting many quizzes returns the number deleted."""
+        # Arrange
+        for quiz_id in (1, 2, 3):
+            self._insert_sample_data(Quiz, self._get_default_quiz_data(
+                {'quiz_id': quiz_id}))
+        post_data = {'quiz_ids': [1, 3, 4]}
+
+        # Act
+        response = self._client.post(self._route, json=post_data)
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(json_data, {'deleted': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._extract_quiz_by_id(1), [])
+        self.assertEqual(len(self._extract_quiz_by_id(2)), 1)
+
+    def test_invalid_quiz_ids(self) -> None:
+        """Test quiz IDs must be a bounded list of integers."""
+        # Arrange
+        data_list = [{}, {'quiz_ids': 1}, {'quiz_ids': ['1']},
+                     {'quiz_ids': list(range(1001))}]
+
+        # Act
+        json_list = [self._client.post(self._route, json=data).get_json()
+                     for data in data_list]
+
+        # Assert
+        self.assertEqual(
+            [json_data['message'] for json_data in json_list],
+            ['Data requires key "quiz_ids" with a list of quiz IDs'] * 3
+            + ['quiz_ids needs to contain at most 1000 quiz IDs'])
+
+
 class TestGetQuizzes(RouteTestSetup):
 
     def __init__(self, methodName: str = "runTest") -> None:
@@ -403,7 +813,182 @@ class TestGetQuizzes(RouteTestSetup):
         # Assert
         self.assertEqual(json_data, {'error': 'An error occurred'})
         self.assertEqual(response.status_code, 500)
-        mock_request.assert_called_once_with('1')
+        mock_request.assert_called_once_with(1, [])
+
+    def test_get_quizzes_all(self) -> None:
+        """Test get quiz list without a limit returns every quiz."""
+        # Arrange
+        for quiz_id in (1, 2):
+            self._insert_sample_data(Quiz, {'name': f'Test Quiz {quiz_id}'})
+
+        # Act
+        response = self._client.get(self._route)
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(len(json_data['quiz_list']), 2)
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_quizzes_fields(self) -> None:
+        """Test get quiz list with optional fields."""
+        # Arrange
+        quiz_data = self._get_default_quiz_data()
+        self._insert_sample_data(Quiz, quiz_data)
+        question_data = self._get_default_question_data()
+        self._insert_sample_data(QuizQuestion, question_data)
+        route = f'{self._route}/1?fields=question_count,updated_at'
+
+        # Act
+        response = self._client.get(route)
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(json_data, {'quiz_list': [{
+            'quiz_id': 1,
+            'name': 'Test Quiz',
+            'updated_at': 'Thu, 01 Jan 1970 00:00:00 GMT',
+            'question_count': 1
+        }]})
+
+    def test_get_quizzes_unknown_field(self) -> None:
+        """Test get quiz list with a field that does not exist."""
+        # Arrange
+        route = f'{self._route}/1?fields=text'
+
+        # Act
+        response = self._client.get(route)
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(json_data, {
+            'message':
+                'fields needs to be in created_at, updated_at, question_count'
+        })
+        self.assertEqual(response.status_code, 200)
+
+
+class TestGetQuizPage(RouteTestSetup):
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self._route = '/get-quiz-page'
+
+    def test_get_quiz_page(self) -> None:
+        """Test getting the first page and following the cursor."""
+        # Arrange
+        self._insert_sample_data(Quiz, {'name': 'Test Quiz'})
+        self._insert_sample_data(Quiz, {'name': 'Test Quiz 2'})
+
+        # Act
+        response = self._client.get(f'{self._route}?limit=1')
+        json_data = response.get_json()
+        next_cursor = json_data['next_cursor']
+        next_response = self._client.get(
+            f'{self._route}?limit=1&cursor={next_cursor}')
+        next_json_data = next_response.get_json()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json_data['quiz_list'], [{'name': 'Test Quiz', 'quiz_id': 1}])
+        self.assertDictEqual(
+            next_json_data,
+            {
+                'quiz_list': [{'name': 'Test Quiz 2', 'quiz_id': 2}],
+                'next_cursor': None
+            }
+        )
+
+    def test_get_quiz_page_wrong_limit(self) -> None:
+        """Test getting a page with a limit outside of the allowed range."""
+        # Act
+        response = self._client.get(f'{self._route}?limit=0')
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(
+            json_data, {'message': 'limit needs to be between 1 and 1000'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_quiz_page_invalid_cursor(self) -> None:
+        """Test getting a page with a cursor that cannot be decoded."""
+        # Act
+        response = self._client.get(f'{self._route}?cursor=test')
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(json_data, {'message': 'cursor is invalid'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_quiz_page_malformed_cursor_values(self) -> None:
+        """Test getting a page with a cursor whose values are not the sort
+        key of its order.
+        """
+        # Arrange
+        cursor_list = [
+            {'order_by': 'quiz_id', 'values': 5},
+            {'order_by': 'quiz_id', 'values': []},
+            {'order_by': 'quiz_id', 'values': ['1']},
+            {'order_by': 'updated_at', 'values': [5, 1]},
+            {'order_by': 'updated_at', 'values': ['2022-01-01', None]}
+        ]
+
+        for cursor_data in cursor_list:
+            with self.subTest(cursor=cursor_data):
+                cursor = base64.urlsafe_b64encode(
+                    json.dumps(cursor_data).encode()).decode()
+
+                # Act
+                response = self._client.get(
+                    f'{self._route}?cursor={cursor}'
+                    f'&order={cursor_data["order_by"]}')
+
+                # Assert
+                self.assertEqual(response.get_json(),
+                                 {'message': 'cursor is invalid'})
+                self.assertEqual(response.status_code, 200)
+
+
+class TestSearchQuiz(RouteTestSetup):
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self._route = '/search-quiz'
+
+    def test_search_quiz(self) -> None:
+        """Test searching a saved quiz by question text."""
+        # Arrange
+        data = self._get_default_full_quiz_data()
+        data['quiz_data']['quiz_id'] = 0
+        self._client.post('/save-quiz', json=data)
+        route = f'{self._route}?q=quest'
+
+        # Act
+        response = self._client.get(route)
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json_data['results']), 1)
+        self.assertEqual(json_data['results'][0]['quiz_id'], 1)
+        self.assertEqual(json_data['results'][0]['snippet'],
+                         'Test [Question]')
+        self.assertIsNone(json_data['next_offset'])
+
+    def test_search_quiz_invalid_parameters(self) -> None:
+        """Test searching without words or with an invalid page."""
+        # Act
+        empty_response = self._client.get(f'{self._route}?q=%22')
+        limit_response = self._client.get(f'{self._route}?q=a&limit=0')
+        offset_response = self._client.get(f'{self._route}?q=a&offset=x')
+
+        # Assert
+        self.assertEqual(empty_response.get_json(),
+                         {'message': 'q needs to contain a word'})
+        self.assertEqual(limit_response.get_json(),
+                         {'message': 'limit needs to be between 1 and 100'})
+        self.assertEqual(offset_response.get_json(),
+                         {'message': 'limit and offset need to be integers'})
 
 
 class TestEvaluateQuiz(RouteTestSetup):
@@ -428,6 +1013,22 @@ class TestEvaluateQuiz(RouteTestSetup):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_evaluate_invalid_quiz_id(self) -> None:
+        """Test response if the quiz ID is not an integer."""
+        for quiz_id in ('abc', 1.9, True):
+            with self.subTest(quiz_id=quiz_id):
+                # Arrange
+                data = {'quiz_id': quiz_id, 'selections': [1]}
+
+                # Act
+                response = self._client.post(self._route, json=data)
+                json_data = response.get_json()
+
+                # Assert
+                self.assertEqual(
+                    json_data, {'message': 'quiz_id needs to be an integer'})
+                self.assertEqual(response.status_code, 200)
+
     @patch('app.sql_functions.evaluate_quiz')
     def test_evaluate_quiz_success(self, mock_request: MagicMock) -> None:
         """Test case where the server successfully evaluates quiz."""
@@ -461,3 +1062,445 @@ class TestEvaluateQuiz(RouteTestSetup):
         self.assertEqual(json_data, {'error': 'An error occurred'})
         self.assertEqual(response.status_code, 500)
         mock_request.assert_called_once_with(1, [])
+
+
+class TestEvaluateQuizBatch(RouteTestSetup):
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self._route = '/evaluate_quiz_batch'
+
+    def test_incorrect_json_input(self) -> None:
+        """Test response if a submission is missing keys."""
+        # Arrange
+        data = {'submissions': [{'quiz_id': 1}]}
+
+        # Act
+        response = self._client.post(self._route, json=data)
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(
+            json_data,
+            {'message': 'Data requires key "submissions" with a list of '
+                        'submissions with keys "quiz_id" and "selections"'}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalid_submission_values(self) -> None:
+        """Test response if a quiz ID is not an integer or the selections
+        are not a list.
+        """
+        for submission in ({'quiz_id': 'x', 'selections': [1]},
+                           {'quiz_id': 1.9, 'selections': [1]},
+                           {'quiz_id': True, 'selections': [1]},
+                           {'quiz_id': 1, 'selections': 5}):
+            with self.subTest(submission=submission):
+                # Act
+                response = self._client.post(
+                    self._route, json={'submissions': [submission]})
+                json_data = response.get_json()
+
+                # Assert
+                self.assertEqual(
+                    json_data,
+                    {'message': 'Data requires key "submissions" with a '
+                                'list of submissions with keys "quiz_id" and '
+                                '"selections"'}
+                )
+                self.assertEqual(response.status_code, 200)
+
+    def test_evaluate_quiz_batch_success(self) -> None:
+        """Test case where the server successfully evaluates submissions."""
+        # Arrange
+        quiz_data = self._get_default_quiz_data()
+        self._insert_sample_data(Quiz, quiz_data)
+
+        question_data = self._get_default_question_data()
+        self._insert_sample_data(QuizQuestion, question_data)
+
+        option_data = self._get_default_option_data()
+        self._insert_sample_data(QuizOption, option_data)
+
+        data = {'submissions': [
+            {'quiz_id': 1, 'selections': [1]},
+            {'quiz_id': 1, 'selections': [2]}
+        ]}
+
+        # Act
+        response = self._client.post(self._route, json=data)
+        json_data = response.get_json()
+
+        # Assert
+        self.assertDictEqual(
+            json_data,
+            {
+                'results': [
+                    {'quiz_id': 1, 'result': [True], 'correct': 1,
+                     'questions': 1},
+                    {'quiz_id': 1, 'result': [False], 'correct': 0,
+                     'questions': 1}
+                ],
+                'total_correct': 1,
+                'total_questions': 2
+            }
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @patch('app.sql_functions.evaluate_quiz_batch')
+    def test_evaluate_quiz_batch_error_response(
+        self, mock_request: MagicMock
+    ) -> None:
+        """Test the server response if the response is an error."""
+        # Arrange
+        mock_request.side_effect = Exception(
+            'test_evaluate_quiz_batch_error_response')
+        data = {'submissions': [{'quiz_id': 1, 'selections': []}]}
+
+        # Act
+        response = self._client.post(self._route, json=data)
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(json_data, {'error': 'An error occurred'})
+        self.assertEqual(response.status_code, 500)
+        mock_request.assert_called_once_with(data['submissions'])
+
+
+class TestQuizStatistics(RouteTestSetup):
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self._route = '/quiz-statistics'
+
+    def _insert_default_quiz(self) -> None:
+        """Insert quiz 1 with one question where option 1 is correct."""
+        self._insert_sample_data(Quiz, self._get_default_quiz_data())
+        self._insert_sample_data(QuizQuestion,
+                                 self._get_default_question_data())
+        self._insert_sample_data(QuizOption, self._get_default_option_data())
+
+    def test_statistics_after_evaluation(self) -> None:
+        """Test graded submissions are recorded in the statistics."""
+        # Arrange
+        self._insert_default_quiz()
+        self._client.post('/evaluate_quiz',
+                          json={'quiz_id': 1, 'selections': [1]})
+        self._client.post('/evaluate_quiz_batch', json={'submissions': [
+            {'quiz_id': 1, 'selections': [2]}
+        ]})
+
+        # Act
+        response = self._client.get(f'{self._route}/1')
+        question_response = self._client.get(f'{self._route}/1?question=1')
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        statistics = response.get_json()['statistics']
+        self.assertEqual(statistics['attempt_count'], 2)
+        self.assertEqual(statistics['correct_count'], 1)
+        self.assertEqual(
+            question_response.get_json()['statistics'],
+            {'question_number': 1, 'answered_count': 2,
+             'correct_count': 1, 'correct_rate': 0.5,
+             'option_picks': {'1': 1, '2': 1}}
+        )
+
+    def test_statistics_after_write_behind(self) -> None:
+        """Test queued submissions are recorded once the queue is flushed."""
+        # Arrange
+        self._app = create_app('sqlite:///:memory:', False,
+                               attempt_write_behind={
+                                   'max_size': 10, 'batch_size': 10,
+                                   'flush_interval': 60, 'put_timeout': 0})
+        self._client = self._app.test_client()
+        queue = self._app.extensions[write_behind.ATTEMPT_QUEUE]
+        self.addCleanup(queue.stop)
+        self._insert_default_quiz()
+        self._client.post('/evaluate_quiz',
+                          json={'quiz_id': 1, 'selections': [1]})
+        self._client.post('/evaluate_quiz_batch', json={'submissions': [
+            {'quiz_id': 1, 'selections': [2]}
+        ]})
+        queued_response = self._client.get(f'{self._route}/1')
+
+        # Act
+        queue.flush()
+        response = self._client.get(f'{self._route}/1')
+
+        # Assert
+        self.assertEqual(
+            queued_response.get_json()['statistics']['attempt_count'], 0)
+        self.assertEqual(
+            response.get_json()['statistics']['attempt_count'], 2)
+
+    def test_write_behind_flush_after_delete(self) -> None:
+        """Test attempts queued before their quiz was deleted are dropped
+        when flushed and the ID of the deleted quiz is not reused.
+        """
+        # Arrange
+        self._app = create_app('sqlite:///:memory:', False,
+                               attempt_write_behind={
+                                   'max_size': 10, 'batch_size': 10,
+                                   'flush_interval': 60, 'put_timeout': 0})
+        self._client = self._app.test_client()
+        queue = self._app.extensions[write_behind.ATTEMPT_QUEUE]
+        self.addCleanup(queue.stop)
+        self._insert_default_quiz()
+        self._client.post('/evaluate_quiz', json={
+            'quiz_id': 1, 'selections': [1], 'player': 'ann'})
+        self._client.post('/delete-quiz', json={'quiz_id': 1})
+
+        # Act
+        queue.flush()
+        self._client.post('/save-quiz', json={'quiz_data': {
+            'quiz_id': 0, 'name': 'New Quiz', 'quiz_question_data': []}})
+        quiz_list = self._client.get('/get-quiz').get_json()['quiz_list']
+        statistics = self._client.get(f'{self._route}/1').get_json()
+        leaderboard = self._client.get('/leaderboard').get_json()
+
+        # Assert
+        self.assertEqual([quiz['quiz_id'] for quiz in quiz_list], [2])
+        self.assertEqual(statistics['statistics']['attempt_count'], 0)
+        self.assertEqual(leaderboard['entries'], [])
+
+    @patch('app.attempt_functions.record_attempts')
+    def test_evaluation_when_recording_fails(
+        self, mock_request: MagicMock
+    ) -> None:
+        """Test grading still responds when recording the attempt fails."""
+        # Arrange
+        self._insert_default_quiz()
+        mock_request.side_effect = Exception('test_recording_fails')
+
+        # Act
+        response = self._client.post('/evaluate_quiz',
+                                     json={'quiz_id': 1, 'selections': [1]})
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {'result': [True]})
+
+    def test_statistics_invalid_question(self) -> None:
+        """Test statistics with a question number that is not a number."""
+        # Act
+        response = self._client.get(f'{self._route}/1?question=x')
+
+        # Assert
+        self.assertEqual(response.get_json(), {
+            'message': 'quiz_id and question need to be integers'})
+
+
+class TestLeaderboard(RouteTestSetup):
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self._route = '/leaderboard'
+
+    def test_leaderboard_after_evaluation(self) -> None:
+        """Test graded submissions of players are ranked."""
+        # Arrange
+        self._insert_sample_data(Quiz, self._get_default_quiz_data())
+        self._insert_sample_data(QuizQuestion,
+                                 self._get_default_question_data())
+        self._insert_sample_data(QuizOption, self._get_default_option_data())
+        self._client.post('/evaluate_quiz', json={
+            'quiz_id': 1, 'selections': [2], 'player': 'ann'})
+        self._client.post('/evaluate_quiz_batch', json={'submissions': [
+            {'quiz_id': 1, 'selections': [1], 'player': 'bob'},
+            {'quiz_id': 1, 'selections': [1]}
+        ]})
+
+        # Act
+        response = self._client.get(f'{self._route}/1?limit=1')
+        next_response = self._client.get(
+            f'{self._route}/1?limit=1'
+            f'&cursor={response.get_json()["next_cursor"]}')
+        player_response = self._client.get(self._route)
+
+        # Assert
+        self.assertEqual(
+            [(entry['rank'], entry['player'], entry['correct_count'])
+             for entry in response.get_json()['entries']],
+            [(1, 'bob', 1)])
+        self.assertEqual(
+            [(entry['rank'], entry['player'], entry['correct_count'])
+             for entry in next_response.get_json()['entries']],
+            [(2, 'ann', 0)])
+        self.assertIsNone(next_response.get_json()['next_cursor'])
+        self.assertEqual(
+            [entry['player']
+             for entry in player_response.get_json()['entries']],
+            ['bob', 'ann'])
+
+    def test_leaderboard_after_soft_delete(self) -> None:
+        """Test scores and statistics of a soft deleted quiz are hidden and
+        leave the totals of its players.
+        """
+        # Arrange
+        self._app.config['SOFT_DELETE_QUIZZES'] = True
+        for quiz_id in (1, 2):
+            self._insert_sample_data(Quiz, self._get_default_quiz_data(
+                {'quiz_id': quiz_id}))
+            self._insert_sample_data(
+                QuizQuestion, self._get_default_question_data(
+                    {'question_id': quiz_id, 'quiz_id': quiz_id}))
+            self._insert_sample_data(QuizOption, self._get_default_option_data(
+                {'option_id': quiz_id, 'question_id': quiz_id}))
+            self._client.post('/evaluate_quiz', json={
+                'quiz_id': quiz_id, 'selections': [1], 'player': 'ann'})
+        self._client.post('/delete-quiz', json={'quiz_id': 1})
+
+        # Act
+        quiz_response = self._client.get(f'{self._route}/1')
+        player_response = self._client.get(self._route)
+        statistics_response = self._client.get('/quiz-statistics/1')
+        question_response = self._client.get('/quiz-statistics/1?question=1')
+
+        # Assert
+        self.assertEqual(quiz_response.get_json()['entries'], [])
+        self.assertEqual(
+            [(entry['player'], entry['total_correct_count'],
+              entry['quiz_count'])
+             for entry in player_response.get_json()['entries']],
+            [('ann', 1, 1)])
+        statistics = statistics_response.get_json()['statistics']
+        self.assertEqual(
+            (statistics['attempt_count'], statistics['questions']), (0, []))
+        self.assertEqual(question_response.get_json(), {'statistics': None})
+
+    def test_evaluate_invalid_player(self) -> None:
+        """Test submitting a player that is not a name."""
+        # Act
+        response = self._client.post('/evaluate_quiz', json={
+            'quiz_id': 1, 'selections': [1], 'player': 1})
+
+        # Assert
+        self.assertEqual(response.get_json(), {
+            'message': 'player needs to be a name of at most 50 characters'})
+
+    def test_leaderboard_invalid_arguments(self) -> None:
+        """Test leaderboard pages with invalid limits and cursors."""
+        # Act
+        limit_response = self._client.get(f'{self._route}?limit=0')
+        cursor_response = self._client.get(f'{self._route}/1?cursor=x')
+
+        # Assert
+        self.assertEqual(limit_response.get_json(), {
+            'message': 'limit needs to be between 1 and 100'})
+        self.assertEqual(cursor_response.get_json(), {
+            'message': 'cursor is invalid'})
+
+
+class TestImportQuizzes(RouteTestSetup):
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self._route = '/import-quizzes'
+
+    def test_import_quizzes(self) -> None:
+        """Test importing a gzip compressed JSON lines body."""
+        # Arrange
+        data = self._get_default_full_quiz_data()
+        line = json.dumps(data, default=str)
+        body = gzip.compress(f'{line}\n{line}\n'.encode())
+
+        # Act
+        response = self._client.post(
+            self._route, data=body,
+            headers={'Content-Encoding': 'gzip'},
+            content_type='application/x-ndjson'
+        )
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json_data['imported'], 2)
+        self.assertEqual(json_data['next_line'], 2)
+        self.assertEqual(json_data['completed'], True)
+
+    def test_import_quizzes_wrong_start_line(self) -> None:
+        """Test importing with a start line that is not an integer."""
+        # Act
+        response = self._client.post(f'{self._route}?start_line=test',
+                                     data=b'')
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(
+            json_data, {'message': 'start_line needs to be an integer'})
+        self.assertEqual(response.status_code, 200)
+
+
+class TestExportQuizzes(RouteTestSetup):
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self._route = '/export-quizzes'
+
+    def test_export_quizzes_gzip(self) -> None:
+        """Test downloading a gzip compressed export of selected quizzes."""
+        # Arrange
+        self._insert_sample_data(Quiz, {'name': 'Test Quiz'})
+        self._insert_sample_data(Quiz, {'name': 'Test Quiz 2'})
+
+        # Act
+        response = self._client.get(
+            f'{self._route}?quiz_id=2&compress=gzip')
+        line_list = gzip.decompress(response.get_data()).splitlines()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/gzip')
+        self.assertEqual(
+            [json.loads(line) for line in line_list],
+            [{'quiz_data': {'quiz_id': 2, 'name': 'Test Quiz 2',
+                            'quiz_question_data': []}}]
+        )
+
+    @patch('app.bulk_functions.export_quizzes')
+    def test_export_quizzes_error_while_streaming(
+        self, mock_request: MagicMock
+    ) -> None:
+        """Test an error while streaming is logged and aborts the transfer
+        instead of ending the export like a complete file.
+        """
+        # Arrange
+        def line_generator(*args):
+            yield '{"quiz_data": {"quiz_id": 1}}\n'
+            raise Exception('test_stream_error')
+
+        mock_request.side_effect = line_generator
+
+        for query in ('', '?compress=gzip'):
+            with self.subTest(query=query):
+                # Act
+                with self.assertLogs(level='CRITICAL') as log:
+                    response = self._client.get(f'{self._route}{query}')
+                    chunk_list = []
+                    with self.assertRaisesRegex(Exception,
+                                                'test_stream_error'):
+                        for chunk in response.response:
+                            chunk_list.append(chunk)
+
+                # Assert
+                self.assertEqual(log.output,
+                                 ['CRITICAL:root:Error: test_stream_error'])
+                if query:
+                    # The gzip trailer is never written
+                    with self.assertRaises(EOFError):
+                        gzip.decompress(b''.join(chunk_list))
+                else:
+                    self.assertEqual(b''.join(chunk_list),
+                                     b'{"quiz_data": {"quiz_id": 1}}\n')
+
+    def test_export_quizzes_wrong_quiz_id(self) -> None:
+        """Test exporting with a quiz id that is not an integer."""
+        # Act
+        response = self._client.get(f'{self._route}?quiz_id=test')
+        json_data = response.get_json()
+
+        # Assert
+        self.assertEqual(
+            json_data, {'message': 'quiz_id needs to be an integer'})
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,76 @@
+from unittest.mock import MagicMock, patch
+import unittest
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import create_app, write_behind  # Noqa: E402
+from serve import (QuizzerApplication, get_options, post_fork,  # Noqa: E402
+                   when_ready, worker_exit)
+from config import Config  # Noqa: E402
+
+
+class TestServe(unittest.TestCase):
+    """Test production server configuration."""
+
+    def setUp(self) -> None:
+        """Setup mock database."""
+        database_url = 'sqlite:///:memory:'
+        self._app = create_app(database_url, False)
+
+    def test_application_settings(self) -> None:
+        """Test workers, threads and preloading are passed to gunicorn."""
+        # Arrange
+        options = get_options('127.0.0.1:8001', 3, 2, 60)
+
+        # Act
+        application = QuizzerApplication(self._app, options)
+
+        # Assert
+        self.assertEqual(application.cfg.workers, 3)
+        self.assertEqual(application.cfg.threads, 2)
+        self.assertTrue(application.cfg.preload_app)
+        self.assertEqual(application.cfg.worker_class_str, 'gthread')
+        self.assertIs(application.load(), self._app)
+
+    @patch('serve.db')
+    def test_post_fork_disposes_pool(self, mock_db: MagicMock) -> None:
+        """Test a forked worker drops the connections of the master."""
+        # Arrange
+        worker = MagicMock()
+        worker.app.wsgi.return_value = self._app
+
+        # Act
+        post_fork(MagicMock(), worker)
+
+        # Assert
+        mock_db.engine.dispose.assert_called_once_with(close=False)
+
+    @patch('serve.compaction')
+    def test_when_ready_starts_compaction(
+        self, mock_compaction: MagicMock
+    ) -> None:
+        """Test the master process starts the background compaction."""
+        # Arrange
+        server = MagicMock()
+        server.app.wsgi.return_value = self._app
+
+        # Act
+        when_ready(server)
+
+        # Assert
+        mock_compaction.start_background_compaction.assert_called_once_with(
+            self._app, **Config.COMPACTION)
+
+    def test_worker_exit_flushes_attempts(self) -> None:
+        """Test an exiting worker stops its attempt queue."""
+        # Arrange
+        queue = MagicMock()
+        self._app.extensions[write_behind.ATTEMPT_QUEUE] = queue
+        worker = MagicMock()
+        worker.app.wsgi.return_value = self._app
+
+        # Act
+        worker_exit(MagicMock(), worker)
+
+        # Assert
+        queue.stop.assert_called_once_with()
@@ -0,0 +1,76 @@
+from typing import Any, List, Tuple
+import unittest
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import create_app, db, Quiz, QuizOption, QuizQuestion  # Noqa: E402
+from app import setup_test_db  # Noqa: E402
+
+
+class TestInsertGeneratedData(unittest.TestCase):
+    """Test generating quizzes for benchmarks."""
+
+    def setUp(self) -> None:
+        """Setup mock database."""
+        database_url = 'sqlite:///:memory:'
+        self._app = create_app(database_url, False)
+
+    def _generate(self, seed: int) -> List[Tuple[Any, ...]]:
+        """Generate quizzes in a new database and get their rows."""
+        app = create_app('sqlite:///:memory:', False)
+        with app.app_context():
+            setup_test_db.insert_generated_data(db, 3, 2, 3, seed,
+                                                batch_size=2)
+            return [
+                (row.question_id, row.option_number, row.text,
+                 row.correct_answer)
+                for row in QuizOption.query.order_by(QuizOption.option_id)
+            ]
+
+    def test_generate_row_counts(self) -> None:
+        """Test the number of rows and the correct answer of every question.
+        """
+        # Act
+        with self._app.app_context():
+            row_counts = setup_test_db.insert_generated_data(
+                db, 5, 3, 4, batch_size=2)
+            quiz_count = Quiz.query.count()
+            question_count = QuizQuestion.query.count()
+            option_count = QuizOption.query.count()
+            correct_count = QuizOption.query.filter_by(
+                correct_answer=True).count()
+
+        # Assert
+        self.assertDictEqual(
+            row_counts, {'quizzes': 5, 'questions': 15, 'options': 60})
+        self.assertEqual(quiz_count, 5)
+        self.assertEqual(question_count, 15)
+        self.assertEqual(option_count, 60)
+        self.assertEqual(correct_count, 15)
+
+    def test_generate_after_existing_quizzes(self) -> None:
+        """Test generated IDs follow the quizzes already saved."""
+        # Arrange
+        with self._app.app_context():
+            setup_test_db.insert_sample_data(db)
+
+        # Act
+        with self._app.app_context():
+            setup_test_db.insert_generated_data(db, 2, 1, 2)
+            question_list = QuizQuestion.query.filter(
+                QuizQuestion.quiz_id > 2).all()
+
+        # Assert
+        self.assertEqual([row.quiz_id for row in question_list], [3, 4])
+        self.assertEqual([row.question_id for row in question_list], [5, 6])
+
+    def test_generate_deterministic(self) -> None:
+        """Test the same seed generates the same quizzes."""
+        # Act
+        first_option_list = self._generate(1)
+        second_option_list = self._generate(1)
+        other_option_list = self._generate(2)
+
+        # Assert
+        self.assertEqual(first_option_list, second_option_list)
+        self.assertNotEqual(first_option_list, other_option_list)
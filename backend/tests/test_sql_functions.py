@@ -1,11 +1,43 @@
 from datetime import datetime
+from typing import Any, Dict
+from unittest.mock import patch
+from freezegun import freeze_time
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
-from app import sql_functions, Quiz, QuizOption, QuizQuestion  # Noqa: E402
+from app import (attempt_functions, leaderboard_functions,  # Noqa: E402
+                 sql_functions, Quiz, QuizAttempt, QuizOption, QuizQuestion)
 from tests.route_setup import RouteTestSetup  # Noqa: E402
 
 
+class TestStreamTableData(RouteTestSetup):
+
+    def test_stream_table_data_in_batches(self) -> None:
+        """Test table rows are yielded in batches of the batch size."""
+        # Arrange
+        for number in [1, 2, 3]:
+            quiz_data = self._get_default_quiz_data(
+                {'quiz_id': number, 'name': f'Test Quiz {number}'})
+            self._insert_sample_data(Quiz, quiz_data)
+
+        # Act
+        with self._app.app_context():
+            batch_list = list(sql_functions.stream_table_data(Quiz, 2))
+
+        # Assert
+        self.assertEqual([len(batch) for batch in batch_list], [2, 1])
+        self.assertDictEqual(
+            batch_list[1][0],
+            {
+                'quiz_id': 3,
+                'name': 'Test Quiz 3',
+                'created_at': datetime.utcfromtimestamp(0),
+                'updated_at': datetime.utcfromtimestamp(0),
+                'deleted_at': None
+            }
+        )
+
+
 class TestGetFullQuiz(RouteTestSetup):
     """Test get_full_quiz."""
 
@@ -63,6 +95,86 @@ class TestGetFullQuiz(RouteTestSetup):
             }
         )
 
+    def test_full_quiz_nested_not_found(self) -> None:
+        """Nested full quiz where the quiz does not exist."""
+        # Arrange
+        quiz_id = 1
+
+        # Act
+        with self._app.app_context():
+            result = sql_functions.select_full_quiz_nested(quiz_id)
+
+        # Assert
+        self.assertIsNone(result)
+
+    def test_full_quiz_nested(self) -> None:
+        """Nested full quiz with questions and options in number order."""
+        # Arrange
+
+        # Insert existing data with questions and options out of order
+        quiz_data = self._get_default_quiz_data()
+        self._insert_sample_data(Quiz, quiz_data)
+
+        question_data = self._get_default_question_data(
+            {'question_id': 1, 'question_number': 2})
+        self._insert_sample_data(QuizQuestion, question_data)
+
+        question_data = self._get_default_question_data(
+            {'question_id': 2, 'question_number': 1})
+        self._insert_sample_data(QuizQuestion, question_data)
+
+        option_data = self._get_default_option_data(
+            {'option_id': 1, 'option_number': 2})
+        self._insert_sample_data(QuizOption, option_data)
+
+        option_data = self._get_default_option_data(
+            {'option_id': 2, 'option_number': 1, 'correct_answer': False})
+        self._insert_sample_data(QuizOption, option_data)
+
+        quiz_id = 1
+
+        # Act
+        with self._app.app_context():
+            result = sql_functions.select_full_quiz_nested(quiz_id)
+
+        # Assert
+        self.assertDictEqual(
+            result,
+            {
+                'quiz_id': 1,
+                'name': 'Test Quiz',
+                'created_at': datetime.utcfromtimestamp(0),
+                'updated_at': datetime.utcfromtimestamp(0),
+                'quiz_question_data': [
+                    {
+                        'question_id': 2,
+                        'question_number': 1,
+                        'text': 'Test Question',
+                        'quiz_option_data': []
+                    },
+                    {
+                        'question_id': 1,
+                        'question_number': 2,
+                        'text': 'Test Question',
+                        'quiz_option_data': [
+                            {
+                                'option_id': 2,
+                                'option_number': 1,
+                                'text': 'Test Option',
+                                'correct_answer': False
+                            },
+                            {
+                                'option_id': 1,
+                                'option_number': 2,
+                                'text': 'Test Option',
+                                'correct_answer': True
+                            }
+                        ]
+                    }
+                ]
+            }
+        )
+
 
 class TestSaveQuiz(RouteTestSetup):
 
@@ -256,6 +368,141 @@ class TestSaveQuiz(RouteTestSetup):
         self.assertEqual(len(quiz_question_list), 1)
         self.assertEqual(len(quiz_option_list), 1)
 
+    def test_modify_quiz_removed_middle_question(self) -> None:
+        """Test saving a quiz after removing a question that is not the last
+        question.
+        """
+        # Arrange
+
+        # Insert existing data with 3 questions with 1 option each
+        quiz_data = self._get_default_quiz_data()
+        self._insert_sample_data(Quiz, quiz_data)
+        for number in [1, 2, 3]:
+            question_data = self._get_default_question_data(
+                {'question_id': number, 'question_number': number})
+            self._insert_sample_data(QuizQuestion, question_data)
+            option_data = self._get_default_option_data(
+                {'option_id': number, 'question_id': number})
+            self._insert_sample_data(QuizOption, option_data)
+
+        # Set up updated data without question 2
+        data_updated = self._get_default_full_quiz_data()
+        question_data = self._get_default_question_data({'question_number': 3})
+        question_data['quiz_option_data'] = [self._get_default_option_data()]
+        data_updated['quiz_data']['quiz_question_data'].append(question_data)
+
+        # Act
+        with self._app.app_context():
+            result = sql_functions.save_quiz(data_updated)
+
+        # Assert
+        self.assertEqual(result, True)
+
+        # Extract rows from SQL database
+        _, quiz_question_list, quiz_option_list = \
+            self._extract_full_quiz_by_id(1)
+
+        self.assertCountEqual(
+            [question.question_number for question in quiz_question_list],
+            [1, 3]
+        )
+        self.assertCountEqual(
+            [option.question_id for option in quiz_option_list], [1, 3])
+
+    def test_update_correct_answer(self) -> None:
+        """Test saving a quiz after changing the correct answer."""
+        # Arrange
+
+        # Insert existing data
+        quiz_data = self._get_default_quiz_data()
+        self._insert_sample_data(Quiz, quiz_data)
+
+        question_data = self._get_default_question_data()
+        self._insert_sample_data(QuizQuestion, question_data)
+
+        option_data = self._get_default_option_data()
+        self._insert_sample_data(QuizOption, option_data)
+
+        # Set up updated data
+        data_updated = self._get_default_full_quiz_data()
+        data_updated['quiz_data']['quiz_question_data'][0][
+            'quiz_option_data'][0]['correct_answer'] = False
+
+        # Act
+        with self._app.app_context():
+            result = sql_functions.save_quiz(data_updated)
+
+        # Assert
+        self.assertEqual(result, True)
+        quiz_option_list = self._extract_option_by_quiz_id(1)
+        self.assertEqual(quiz_option_list[0].correct_answer, False)
+
+    def test_failed_save_rolls_back(self) -> None:
+        """Test a save failing part way through does not change the quiz."""
+        # Arrange
+
+        # Insert existing data
+        quiz_data = self._get_default_quiz_data()
+        self._insert_sample_data(Quiz, quiz_data)
+
+        question_data = self._get_default_question_data()
+        self._insert_sample_data(QuizQuestion, question_data)
+
+        option_data = self._get_default_option_data()
+        self._insert_sample_data(QuizOption, option_data)
+
+        # Set up updated data with a second question, indexing the written
+        # rows fails after all of them were written
+        data_updated = self._get_default_full_quiz_data()
+        data_updated['quiz_data']['name'] = 'Test Quiz 2'
+        data_updated['quiz_data']['quiz_question_data'][0][
+            'text'] = 'Test Question 2'
+        question_data = self._get_default_question_data({'question_number': 2})
+        question_data['quiz_option_data'] = []
+        data_updated['quiz_data']['quiz_question_data'].append(question_data)
+
+        # Act
+        with self._app.app_context():
+            with patch('app.search_index.index_quizzes',
+                       side_effect=Exception('test_failed_save')):
+                with self.assertRaises(Exception):
+                    sql_functions.save_quiz(data_updated)
+
+        # Assert
+        quiz_list, quiz_question_list, quiz_option_list = \
+            self._extract_full_quiz_by_id(1)
+
+        self.assertEqual(quiz_list[0].name, 'Test Quiz')
+        self.assertEqual(len(quiz_question_list), 1)
+        self.assertEqual(quiz_question_list[0].text, 'Test Question')
+        self.assertEqual(len(quiz_option_list), 1)
+
+    def test_save_repeated_numbers(self) -> None:
+        """Test repeated question or option numbers are rejected before
+        anything is written.
+        """
+        # Arrange
+        question_data = self._get_default_full_quiz_data()
+        question_data['quiz_data']['quiz_id'] = 0
+        question_data['quiz_data']['quiz_question_data'].append(
+            self._get_default_question_data({'quiz_option_data': []}))
+        option_data = self._get_default_full_quiz_data()
+        option_data['quiz_data']['quiz_id'] = 0
+        option_data['quiz_data']['quiz_question_data'][0][
+            'quiz_option_data'].append(self._get_default_option_data())
+
+        # Act
+        with self._app.app_context():
+            with self.assertRaisesRegex(ValueError,
+                                        'unique "question_number"'):
+                sql_functions.save_quiz(question_data)
+            with self.assertRaisesRegex(ValueError, 'unique "option_number"'):
+                sql_functions.save_quiz(option_data)
+            quiz_count = Quiz.query.count()
+
+        # Assert
+        self.assertEqual(quiz_count, 0)
+
     def test_incorrect_data_format(self) -> None:
         """Test server response if the data is in the incorrect format."""
         # Arrange
@@ -285,6 +532,192 @@ class TestSaveQuiz(RouteTestSetup):
         self.assertEqual(result, False)
 
 
+class TestQuizRevision(RouteTestSetup):
+
+    def _save_default_quiz(self) -> None:
+        """Save the default quiz as quiz 1 with the epoch as updated date."""
+        quiz_data = self._get_default_quiz_data()
+        self._insert_sample_data(Quiz, quiz_data)
+
+        question_data = self._get_default_question_data()
+        self._insert_sample_data(QuizQuestion, question_data)
+
+        option_data = self._get_default_option_data()
+        self._insert_sample_data(QuizOption, option_data)
+
+    def _get_revision(self) -> datetime:
+        """Get revision of quiz 1."""
+        with self._app.app_context():
+            return sql_functions.get_quiz_revision(1)
+
+    def test_quiz_revision_not_found(self) -> None:
+        """Test the revision of a quiz that does not exist."""
+        # Act
+        revision = self._get_revision()
+
+        # Assert
+        self.assertIsNone(revision)
+
+    @freeze_time('2022-01-01 12:00:00')
+    def test_option_change_updates_revision(self) -> None:
+        """Test changing only an option moves the quiz to a new revision."""
+        # Arrange
+        self._save_default_quiz()
+        data = self._get_default_full_quiz_data()
+        data['quiz_data']['quiz_question_data'][0][
+            'quiz_option_data'][0]['text'] = 'Test Option 2'
+
+        # Act
+        with self._app.app_context():
+            sql_functions.save_quiz(data)
+        revision = self._get_revision()
+
+        # Assert
+        self.assertEqual(revision, datetime(2022, 1, 1, 12, 0, 0))
+
+    def test_unchanged_save_keeps_revision(self) -> None:
+        """Test saving a quiz without changes keeps its revision."""
+        # Arrange
+        self._save_default_quiz()
+        data = self._get_default_full_quiz_data()
+
+        # Act
+        with self._app.app_context():
+            sql_functions.save_quiz(data)
+        revision = self._get_revision()
+
+        # Assert
+        self.assertEqual(revision, datetime.utcfromtimestamp(0))
+
+    @freeze_time('2022-01-01 12:00:00')
+    def test_changes_at_same_time_get_new_revisions(self) -> None:
+        """Test every change gets a later revision even if the clock has not
+        moved.
+        """
+        # Arrange
+        self._save_default_quiz()
+        data = self._get_default_full_quiz_data()
+
+        # Act
+        with self._app.app_context():
+            data['quiz_data']['name'] = 'Test Quiz 2'
+            sql_functions.save_quiz(data)
+            data['quiz_data']['name'] = 'Test Quiz 3'
+            sql_functions.save_quiz(data)
+        revision = self._get_revision()
+
+        # Assert
+        self.assertEqual(revision, datetime(2022, 1, 1, 12, 0, 0, 1))
+
+
+class TestPatchQuiz(RouteTestSetup):
+
+    def _save_default_quiz(self) -> None:
+        """Save the default quiz as quiz 1 with a second question."""
+        self._insert_sample_data(Quiz, self._get_default_quiz_data())
+        self._insert_sample_data(QuizQuestion,
+                                 self._get_default_question_data())
+        self._insert_sample_data(QuizOption, self._get_default_option_data())
+        self._insert_sample_data(QuizQuestion, self._get_default_question_data(
+            {'question_id': 2, 'question_number': 2, 'text': 'Second'}))
+
+    def _patch(self, operation_list: Any) -> bool:
+        """Patch quiz 1 with the operations."""
+        with self._app.app_context():
+            return sql_functions.patch_quiz(1, operation_list)
+
+    def test_patch_quiz(self) -> None:
+        """Test operations change only the targeted rows in order."""
+        # Arrange
+        self._save_default_quiz()
+
+        # Act
+        result = self._patch([
+            {'op': 'rename_quiz', 'name': 'Patched'},
+            {'op': 'update_question', 'question_number': 1, 'text': 'Fixed'},
+            {'op': 'update_option', 'question_number': 1,
+             'option_number': 1, 'correct_answer': False},
+            {'op': 'add_option', 'question_number': 1, 'option_number': 2,
+             'text': 'New', 'correct_answer': True},
+            {'op': 'add_option', 'question_number': 2, 'option_number': 1,
+             'text': 'Removed', 'correct_answer': False},
+            {'op': 'remove_option', 'question_number': 2,
+             'option_number': 1}
+        ])
+        with self._app.app_context():
+            quiz = sql_functions.select_full_quiz_nested(1)
+            answer_list = sql_functions.evaluate_quiz(1, [2])
+
+        # Assert
+        self.assertTrue(result)
+        self.assertEqual(quiz['name'], 'Patched')
+        self.assertGreater(quiz['updated_at'], datetime.utcfromtimestamp(0))
+        self.assertEqual(
+            [(question['text'],
+              [(option['option_number'], option['text'],
+                option['correct_answer'])
+               for option in question['quiz_option_data']])
+             for question in quiz['quiz_question_data']],
+            [('Fixed', [(1, 'Test Option', False), (2, 'New', True)]),
+             ('Second', [])]
+        )
+        self.assertEqual(answer_list, [True])
+
+    def test_patch_quiz_without_changes(self) -> None:
+        """Test operations that change nothing keep the revision."""
+        # Arrange
+        self._save_default_quiz()
+
+        # Act
+        result = self._patch([
+            {'op': 'update_option', 'question_number': 1,
+             'option_number': 1, 'text': 'Test Option'}
+        ])
+        with self._app.app_context():
+            revision = sql_functions.get_quiz_revision(1)
+
+        # Assert
+        self.assertTrue(result)
+        self.assertEqual(revision, datetime.utcfromtimestamp(0))
+
+    def test_patch_quiz_not_found(self) -> None:
+        """Test patching a quiz that does not exist."""
+        # Act
+        result = self._patch([{'op': 'rename_quiz', 'name': 'Patched'}])
+
+        # Assert
+        self.assertFalse(result)
+
+    def test_patch_quiz_invalid_operations(self) -> None:
+        """Test invalid operations raise errors and change nothing."""
+        # Arrange
+        self._save_default_quiz()
+        operation_list_list = [
+            [{'op': 'move_question'}],
+            [{'op': 'update_question', 'question_number': 1}],
+            [{'op': 'update_option', 'question_number': 1,
+              'option_number': 1}],
+            [{'op': 'update_question', 'question_number': '1',
+              'text': 'Fixed'}],
+            [{'op': 'rename_quiz', 'name': 'Patched'},
+             {'op': 'update_question', 'question_number': 3,
+              'text': 'Missing'}],
+            [{'op': 'add_option', 'question_number': 1, 'option_number': 1,
+              'text': 'Duplicate', 'correct_answer': False}],
+            [{'op': 'remove_option', 'question_number': 2,
+              'option_number': 1}]
+        ]
+
+        for operation_list in operation_list_list:
+            with self.subTest(operation_list=operation_list):
+                # Act and assert
+                with self.assertRaises(ValueError):
+                    self._patch(operation_list)
+        with self._app.app_context():
+            self.assertEqual(
+                sql_functions.select_full_quiz_nested(1)['name'], 'Test Quiz')
+
+
 class TestDeleteQuiz(RouteTestSetup):
 
     def __init__(self, methodName: str = "runTest") -> None:
@@ -334,6 +767,109 @@ class TestDeleteQuiz(RouteTestSetup):
         # Assert
         self.assertEqual(context.exception.__class__, KeyError)
 
+    def test_delete_only_quiz_id(self) -> None:
+        """Test deleting a quiz keeps the other quizzes."""
+        # Arrange
+        self._insert_sample_data(Quiz, self._get_default_quiz_data())
+        self._insert_sample_data(Quiz, self._get_default_quiz_data(
+            {'quiz_id': 2}))
+
+        # Act
+        with self._app.app_context():
+            result = sql_functions.delete_quiz({'quiz_id': 1})
+
+        # Assert
+        self.assertEqual(result, True)
+        self.assertEqual(self._extract_quiz_by_id(1), [])
+        self.assertEqual(len(self._extract_quiz_by_id(2)), 1)
+
+    def test_delete_quizzes_cascade(self) -> None:
+        """Test deleting quizzes removes the rows of every table belonging to
+        them and subtracts their leaderboard entries.
+        """
+        # Arrange
+        for quiz_id in (1, 2, 3):
+            self._insert_sample_data(Quiz, self._get_default_quiz_data(
+                {'quiz_id': quiz_id}))
+            self._insert_sample_data(
+                QuizQuestion, self._get_default_question_data(
+                    {'question_id': quiz_id, 'quiz_id': quiz_id}))
+            self._insert_sample_data(
+                QuizOption, self._get_default_option_data(
+                    {'option_id': quiz_id, 'question_id': quiz_id}))
+        with self._app.app_context():
+            attempt_functions.record_attempts([
+                {'quiz_id': quiz_id, 'selections': [1], 'result': [True],
+                 'player': 'ada'}
+                for quiz_id in (1, 2, 3)
+            ])
+
+        # Act
+        with self._app.app_context():
+            deleted = sql_functions.delete_quizzes([1, 3, 3, 4])
+            attempt_list = QuizAttempt.query.all()
+            statistics = attempt_functions.get_quiz_statistics(1)
+            quiz_board = leaderboard_functions.get_quiz_leaderboard(1, 10)
+            player_board = leaderboard_functions.get_player_leaderboard(10)
+
+        # Assert
+        self.assertEqual(deleted, 2)
+        for quiz_id in (1, 3):
+            self.assertEqual(self._extract_full_quiz_by_id(quiz_id),
+                             ([], [], []))
+        self.assertEqual(len(self._extract_option_by_quiz_id(2)), 1)
+        self.assertEqual([row.quiz_id for row in attempt_list], [2])
+        self.assertEqual(statistics['attempt_count'], 0)
+        self.assertEqual(quiz_board['entries'], [])
+        self.assertEqual(
+            [(entry['player'], entry['total_correct_count'],
+              entry['quiz_count']) for entry in player_board['entries']],
+            [('ada', 1, 1)])
+
+
+class TestSoftDeleteQuiz(RouteTestSetup):
+
+    def setUp(self) -> None:
+        """Setup app soft deleting quizzes with a saved quiz 1."""
+        super().setUp()
+        self._app.config['SOFT_DELETE_QUIZZES'] = True
+        quiz_data = self._get_default_full_quiz_data()
+        quiz_data['quiz_data']['quiz_id'] = 0
+        with self._app.app_context():
+            sql_functions.save_quiz(quiz_data)
+
+    def test_soft_delete_hides_quiz(self) -> None:
+        """Test a soft deleted quiz keeps its rows but is hidden from every
+        read and cannot be changed.
+        """
+        # Act
+        with self._app.app_context():
+            deleted = sql_functions.delete_quizzes([1])
+            deleted_again = sql_functions.delete_quiz({'quiz_id': 1})
+            read_list = [
+                sql_functions.select_full_quiz(1),
+                sql_functions.select_full_quiz_nested(1),
+                sql_functions.get_quiz_revision(1),
+                sql_functions.get_quiz_snapshot(1, 'flat'),
+                sql_functions.get_quiz_list(0),
+                sql_functions.get_quiz_page(10)['quiz_list'],
+                sql_functions.search_quizzes('Test', 10)['results'],
+                sql_functions.evaluate_quiz(1, [1])
+            ]
+            patched = sql_functions.patch_quiz(
+                1, [{'op': 'rename_quiz', 'name': 'Patched'}])
+            quiz_data = self._get_default_full_quiz_data()
+            saved = sql_functions.save_quiz(quiz_data)
+
+        # Assert
+        self.assertEqual((deleted, deleted_again), (1, False))
+        self.assertEqual(read_list, [[], None, None, None, [], [], [], []])
+        self.assertEqual((patched, saved), (False, False))
+        quiz_list, question_list, option_list = \
+            self._extract_full_quiz_by_id(1)
+        self.assertIsNotNone(quiz_list[0].deleted_at)
+        self.assertEqual((len(question_list), len(option_list)), (1, 1))
+
 
 class TestGetQuizList(RouteTestSetup):
 
@@ -366,6 +902,229 @@ class TestGetQuizList(RouteTestSetup):
         # Assert
         self.assertEqual(quiz_list, [{'name': 'Test Quiz', 'quiz_id': 1}])
 
+    def test_get_quizzes_question_count(self) -> None:
+        """Test get quiz list with the number of questions of every quiz."""
+        # Arrange
+        for quiz_id in (1, 2):
+            quiz_data = self._get_default_quiz_data({'quiz_id': quiz_id})
+            self._insert_sample_data(Quiz, quiz_data)
+        for question_id in (1, 2):
+            question_data = self._get_default_question_data({
+                'question_id': question_id,
+                'question_number': question_id
+            })
+            self._insert_sample_data(QuizQuestion, question_data)
+
+        # Act
+        with self._app.app_context():
+            quiz_list = sql_functions.get_quiz_list(
+                0, ['question_count', 'created_at'])
+
+        # Assert
+        self.assertEqual(quiz_list, [
+            {'quiz_id': 1, 'name': 'Test Quiz', 'question_count': 2,
+             'created_at': datetime.utcfromtimestamp(0)},
+            {'quiz_id': 2, 'name': 'Test Quiz', 'question_count': 0,
+             'created_at': datetime.utcfromtimestamp(0)}
+        ])
+
+    def test_get_quizzes_unknown_field(self) -> None:
+        """Test get quiz list with a field that does not exist."""
+        # Act and assert
+        with self._app.app_context():
+            with self.assertRaises(ValueError):
+                sql_functions.get_quiz_list(0, ['text'])
+
+
+class TestGetQuizPage(RouteTestSetup):
+
+    def _insert_quizzes(self) -> None:
+        """Insert 3 quizzes where quiz 2 is the most recently updated."""
+        for quiz_id, day in [(1, 1), (2, 3), (3, 2)]:
+            quiz_data = self._get_default_quiz_data({
+                'quiz_id': quiz_id,
+                'name': f'Test Quiz {quiz_id}',
+                'updated_at': datetime(2022, 1, day)
+            })
+            self._insert_sample_data(Quiz, quiz_data)
+
+    def test_get_quiz_page_by_quiz_id(self) -> None:
+        """Test paging through quizzes in quiz ID order."""
+        # Arrange
+        self._insert_quizzes()
+
+        # Act
+        with self._app.app_context():
+            first_page = sql_functions.get_quiz_page(2)
+            second_page = sql_functions.get_quiz_page(
+                2, first_page['next_cursor'])
+
+        # Assert
+        self.assertEqual(
+            [quiz['quiz_id'] for quiz in first_page['quiz_list']], [1, 2])
+        self.assertIsNotNone(first_page['next_cursor'])
+        self.assertEqual(
+            second_page['quiz_list'], [{'quiz_id': 3, 'name': 'Test Quiz 3'}])
+        self.assertIsNone(second_page['next_cursor'])
+
+    def test_get_quiz_page_by_updated_at(self) -> None:
+        """Test paging through quizzes with the latest updated first."""
+        # Arrange
+        self._insert_quizzes()
+
+        # Act
+        with self._app.app_context():
+            first_page = sql_functions.get_quiz_page(2, None, 'updated_at')
+            second_page = sql_functions.get_quiz_page(
+                2, first_page['next_cursor'], 'updated_at')
+
+        # Assert
+        self.assertEqual(
+            [quiz['quiz_id'] for quiz in first_page['quiz_list']], [2, 3])
+        self.assertEqual(
+            [quiz['quiz_id'] for quiz in second_page['quiz_list']], [1])
+        self.assertIsNone(second_page['next_cursor'])
+
+    def test_get_quiz_page_invalid_cursor(self) -> None:
+        """Test a cursor that was not returned by a previous page."""
+        # Arrange
+        self._insert_quizzes()
+        with self._app.app_context():
+            cursor = sql_functions.get_quiz_page(1)['next_cursor']
+
+        # Act
+        with self._app.app_context():
+            # Expect an exception for a cursor of a different order
+            with self.assertRaises(ValueError):
+                sql_functions.get_quiz_page(1, cursor, 'updated_at')
+            # Expect an exception for a cursor that cannot be decoded
+            with self.assertRaises(ValueError):
+                sql_functions.get_quiz_page(1, 'test')
+
+
+class TestSearchQuizzes(RouteTestSetup):
+
+    def _save_new_quiz(self, name: str, question_text: str,
+                       option_text: str) -> None:
+        """Save a new quiz with one question and one option."""
+        data = {'quiz_data': {
+            'quiz_id': 0,
+            'name': name,
+            'quiz_question_data': [{
+                'question_number': 1,
+                'text': question_text,
+                'quiz_option_data': [{
+                    'option_number': 1,
+                    'text': option_text,
+                    'correct_answer': True
+                }]
+            }]
+        }}
+        with self._app.app_context():
+            sql_functions.save_quiz(data)
+
+    def _search(self, query: str, limit: int = 10, offset: int = 0
+                ) -> Dict[str, Any]:
+        """Search quizzes."""
+        with self._app.app_context():
+            return sql_functions.search_quizzes(query, limit, offset)
+
+    def test_search_ranking(self) -> None:
+        """Test a match in the quiz name ranks above a match in an option.
+        """
+        # Arrange
+        self._save_new_quiz('Cells', 'What makes energy?', 'Photosynthesis')
+        self._save_new_quiz('Photosynthesis', 'What makes sugar?', 'Light')
+        self._save_new_quiz('Physics', 'Unit of power?', 'Watt')
+
+        # Act
+        search_result = self._search('photo')
+
+        # Assert
+        self.assertEqual(
+            [row['quiz_id'] for row in search_result['results']], [2, 1])
+        self.assertEqual(search_result['results'][0]['name'],
+                         'Photosynthesis')
+        self.assertIsNone(search_result['next_offset'])
+
+    def test_search_all_words(self) -> None:
+        """Test every word of the query must match."""
+        # Arrange
+        self._save_new_quiz('Physics', 'Unit of power?', 'Watt')
+        self._save_new_quiz('Physics', 'Unit of force?', 'Newton')
+
+        # Act
+        search_result = self._search('physics "newton')
+
+        # Assert
+        self.assertEqual(
+            [row['quiz_id'] for row in search_result['results']], [2])
+        self.assertEqual(search_result['results'][0]['snippet'], '[Physics]')
+
+    def test_search_pages(self) -> None:
+        """Test following the next offset returns the remaining results."""
+        # Arrange
+        for _ in range(3):
+            self._save_new_quiz('Math', 'Evaluate 1 + 1', '2')
+
+        # Act
+        first_page = self._search('math', limit=2)
+        second_page = self._search('math', 2, first_page['next_offset'])
+
+        # Assert
+        self.assertEqual(len(first_page['results']), 2)
+        self.assertEqual(first_page['next_offset'], 2)
+        self.assertEqual(len(second_page['results']), 1)
+        self.assertIsNone(second_page['next_offset'])
+
+    def test_search_new_quiz_without_questions(self) -> None:
+        """Test a new quiz saved without questions is found by its name."""
+        # Arrange
+        data = {'quiz_data': {
+            'quiz_id': 0,
+            'name': 'Geography',
+            'quiz_question_data': []
+        }}
+        with self._app.app_context():
+            sql_functions.save_quiz(data)
+
+        # Act
+        search_result = self._search('geography')
+
+        # Assert
+        self.assertEqual(
+            [row['quiz_id'] for row in search_result['results']], [1])
+
+    def test_search_after_save_and_delete(self) -> None:
+        """Test saving and deleting a quiz updates the search index."""
+        # Arrange
+        self._save_new_quiz('Biology', 'What is a cell?', 'Unit of life')
+        data = {'quiz_data': {
+            'quiz_id': 1,
+            'name': 'Chemistry',
+            'quiz_question_data': []
+        }}
+
+        # Act
+        with self._app.app_context():
+            sql_functions.save_quiz(data)
+        saved_result = self._search('chemistry')
+        old_result = self._search('cell')
+        with self._app.app_context():
+            sql_functions.delete_quiz({'quiz_id': 1})
+        deleted_result = self._search('chemistry')
+
+        # Assert
+        self.assertEqual(len(saved_result['results']), 1)
+        self.assertEqual(old_result['results'], [])
+        self.assertEqual(deleted_result['results'], [])
+
+    def test_search_without_words(self) -> None:
+        """Test a query without words raises an error."""
+        # Act and assert
+        with self.assertRaises(ValueError):
+            self._search(' "* ')
+
 
 class TestEvaluateQuiz(RouteTestSetup):
 
@@ -421,12 +1180,12 @@ class TestEvaluateQuiz(RouteTestSetup):
         self._insert_sample_data(QuizOption, option_data)
 
         option_data = self._get_default_option_data(
-            {'option_number': 1, 'correct_answer': False})
+            {'question_id': 2, 'option_number': 1, 'correct_answer': False})
         del option_data['option_id']
         self._insert_sample_data(QuizOption, option_data)
 
         option_data = self._get_default_option_data(
-            {'option_number': 2, 'correct_answer': True})
+            {'question_id': 2, 'option_number': 2, 'correct_answer': True})
         del option_data['option_id']
         self._insert_sample_data(QuizOption, option_data)
 
@@ -438,3 +1197,76 @@ class TestEvaluateQuiz(RouteTestSetup):
 
         # Assert
         self.assertEqual(evaluation, [True, False])
+
+    def test_evaluate_quiz_cached_until_saved(self) -> None:
+        """Test the answer key is cached and invalidated by saving the quiz.
+        """
+        # Arrange
+        data = self._get_default_full_quiz_data()
+        data['quiz_data']['quiz_id'] = 0
+        with self._app.app_context():
+            sql_functions.save_quiz(data)
+
+        # Act
+        with self._app.app_context():
+            first_evaluation = sql_functions.evaluate_quiz(1, [1])
+            second_evaluation = sql_functions.evaluate_quiz(1, [1])
+            cache_stats = sql_functions.get_answer_key_cache_stats()
+
+            # Change the correct answer
+            data['quiz_data']['quiz_id'] = 1
+            data['quiz_data']['quiz_question_data'][0][
+                'quiz_option_data'][0]['correct_answer'] = False
+            sql_functions.save_quiz(data)
+            saved_evaluation = sql_functions.evaluate_quiz(1, [1])
+
+        # Assert
+        self.assertEqual(first_evaluation, [True])
+        self.assertEqual(second_evaluation, [True])
+        self.assertEqual(cache_stats['hits'], 1)
+        self.assertEqual(cache_stats['misses'], 1)
+        self.assertEqual(saved_evaluation, [])
+
+    def test_evaluate_quiz_batch(self) -> None:
+        """Test evaluating submissions of several quizzes at once."""
+        # Arrange
+
+        # Save 2 quizzes where quiz 1 has answer 1 and quiz 2 has answers 1
+        # and 1
+        data = self._get_default_full_quiz_data()
+        data['quiz_data']['quiz_id'] = 0
+        with self._app.app_context():
+            sql_functions.save_quiz(data)
+            question_data = self._get_default_question_data(
+                {'question_number': 2})
+            question_data['quiz_option_data'] = [
+                self._get_default_option_data()]
+            data['quiz_data']['quiz_question_data'].append(question_data)
+            sql_functions.save_quiz(data)
+
+        submission_list = [
+            {'quiz_id': 1, 'selections': [1]},
+            {'quiz_id': 2, 'selections': [1, 2]},
+            {'quiz_id': 3, 'selections': [1]}  # Quiz 3 does not exist
+        ]
+
+        # Act
+        with self._app.app_context():
+            result = sql_functions.evaluate_quiz_batch(submission_list)
+
+        # Assert
+        self.assertDictEqual(
+            result,
+            {
+                'results': [
+                    {'quiz_id': 1, 'result': [True], 'correct': 1,
+                     'questions': 1},
+                    {'quiz_id': 2, 'result': [True, False], 'correct': 1,
+                     'questions': 2},
+                    {'quiz_id': 3, 'result': [], 'correct': 0,
+                     'questions': 0}
+                ],
+                'total_correct': 2,
+                'total_questions': 3
+            }
+        )
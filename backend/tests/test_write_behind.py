@@ -0,0 +1,124 @@
+from threading import Event
+from typing import Any, List
+import unittest
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from flask import Flask  # Noqa: E402
+from app import metrics  # Noqa: E402
+from app.write_behind import WriteBehindQueue  # Noqa: E402
+
+
+class TestWriteBehindQueue(unittest.TestCase):
+    """Test bounded queue writing items in batches in the background."""
+
+    def setUp(self) -> None:
+        """Setup queue collecting the written batches."""
+        metrics.clear_metrics()
+        self._batch_list: List[List[Any]] = []
+        self._written = Event()
+
+    def _write_batch(self, batch: List[Any]) -> None:
+        """Collect a written batch."""
+        self._batch_list.append(batch)
+        self._written.set()
+
+    def _get_queue(self, **kwargs: Any) -> WriteBehindQueue:
+        """Get queue with settings that only flush on demand by default."""
+        settings = {'max_size': 10, 'batch_size': 4, 'flush_interval': 60,
+                    'put_timeout': 0.01}
+        settings.update(kwargs)
+        queue = WriteBehindQueue(Flask(__name__), 'test', self._write_batch,
+                                 **settings)
+        self.addCleanup(queue.stop)
+        return queue
+
+    def test_flush_in_batches(self) -> None:
+        """Test flushing writes waiting items in batches of at most
+        'batch_size' items.
+        """
+        # Arrange
+        queue = self._get_queue()
+        queue.put(list(range(6)))
+
+        # Act
+        count = queue.flush()
+
+        # Assert
+        self.assertEqual(count, 6)
+        self.assertEqual(self._batch_list, [[0, 1, 2, 3], [4, 5]])
+        self.assertEqual(queue.depth(), 0)
+        self.assertEqual(
+            metrics.WRITE_BEHIND_ITEMS_TOTAL.get(('test', 'written')), 6)
+        self.assertEqual(
+            metrics.WRITE_BEHIND_FLUSH_DURATION.get_count(('test',)), 2)
+
+    def test_flush_on_interval(self) -> None:
+        """Test the background thread writes a batch once the interval
+        passed.
+        """
+        # Arrange
+        queue = self._get_queue(flush_interval=0.01)
+
+        # Act
+        queue.put([1, 2])
+
+        # Assert
+        self.assertTrue(self._written.wait(5))
+        self.assertEqual(self._batch_list, [[1, 2]])
+
+    def test_full_queue(self) -> None:
+        """Test items that do not fit in a full queue are given back."""
+        # Arrange
+        release = Event()
+
+        def write_batch(batch: List[Any]) -> None:
+            self._write_batch(batch)
+            release.wait(5)
+        queue = WriteBehindQueue(Flask(__name__), 'test', write_batch, 1, 1,
+                                 0.01, 0.01)
+        self.addCleanup(queue.stop)
+        self.addCleanup(release.set)
+        queue.put([1])
+        self.assertTrue(self._written.wait(5))
+        queue.put([2])
+
+        # Act
+        rejected_list = queue.put([3, 4])
+
+        # Assert
+        self.assertEqual(rejected_list, [3, 4])
+        self.assertEqual(metrics.WRITE_BEHIND_FULL_TOTAL.get(('test',)), 1)
+        self.assertEqual(metrics.WRITE_BEHIND_DEPTH.get(('test',)), 1)
+
+    def test_stop_writes_waiting_items(self) -> None:
+        """Test stopping writes every waiting item and rejects new items."""
+        # Arrange
+        queue = self._get_queue()
+        queue.put([1, 2])
+
+        # Act
+        queue.stop()
+        rejected_list = queue.put([3])
+
+        # Assert
+        self.assertEqual(self._batch_list, [[1, 2]])
+        self.assertEqual(rejected_list, [3])
+
+    def test_failed_batch(self) -> None:
+        """Test a failing write is counted and does not stop the queue."""
+        # Arrange
+        def write_batch(batch: List[Any]) -> None:
+            raise Exception('test_failed_batch')
+        queue = WriteBehindQueue(Flask(__name__), 'test', write_batch, 10, 4,
+                                 60, 0.01)
+        self.addCleanup(queue.stop)
+        queue.put([1])
+
+        # Act
+        queue.flush()
+
+        # Assert
+        self.assertEqual(
+            metrics.WRITE_BEHIND_ITEMS_TOTAL.get(('test', 'failed')), 1)
+        self.assertEqual(queue.put([2]), [])
@@ -0,0 +1,8 @@
+from app import create_app
+from config import Config
+
+# WSGI application for production servers. Unlike 'run.py' the database is
+# never reset, only created and upgraded when needed.
+app = create_app(Config.SQLALCHEMY_DATABASE_URI, False,
+                 Config.SQLALCHEMY_ENGINE_OPTIONS, Config.SQLITE_PRAGMAS,
+                 Config.ATTEMPT_WRITE_BEHIND, Config.SOFT_DELETE_QUIZZES)